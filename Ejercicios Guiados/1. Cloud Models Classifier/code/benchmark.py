@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Benchmark del Clasificador de Servicios en la Nube
+Compara el motor de búsqueda de una sola pasada contra la búsqueda original
+(una búsqueda por palabra clave) y verifica que ambos producen los mismos scores.
+Con --startup mide además el arranque con y sin modelo compilado, con --engines
+el rendimiento por lotes de los motores de puntuación python y numpy, con
+--normalization la etapa de plegado de mayúsculas y diacríticos sobre textos largos
+y con --fuzzy el costo de tolerar errores de tipeo frente a la coincidencia exacta
+"""
+
+import argparse
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import unicodedata
+from typing import Callable, Dict, List, Tuple
+
+from cloud_models_classifier import DEFAULT_KEYWORDS, KEYWORD_ENGINES, CloudServiceClassifier, CompiledKeywordModel
+from fuzzy import (COMMON_WORDS, MAX_FUZZY_DISTANCE, MAX_LENGTH_DIFFERENCE, TOKEN_PATTERN, FuzzyKeywordIndex,
+                   allowed_distance, edit_distance, is_plausible_typo)
+from normalization import fold_text
+from numpy_engine import NUMPY_AVAILABLE
+
+CLASSIFIER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cloud_models_classifier.py')
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Vocabulario de relleno para simular tickets de soporte largos
+FILLER_WORDS = (
+    "el la de que y en los del se las por un para con no una su al lo como mas pero "
+    "sus ya o este si porque esta entre cuando muy sin sobre también hasta hay donde "
+    "desde todo nos durante todos uno otros ese eso ante ellos esto antes algunos yo "
+    "otro otras tanto esa estos mucho nada muchos cual poco algo cliente sistema "
+    "proceso empresa gestión necesito quiero ticket problema error programa crédito "
+    "the and of to in is for on with as it that customer issue request please thanks"
+).split()
+
+# Palabras con mayúsculas y acentos, como llegan en tickets reales en español
+ACCENTED_WORDS = (
+    "aplicación cómputo móvil efímero frío función compilación colaboración comunicación "
+    "límite máquina gestión también está búsqueda año señal Plataforma Servidor Despliegue "
+    "Aplicación MÓVIL Función Cómputo"
+).split()
+
+DEFAULT_SIZES = [1_000, 100_000, 10_000_000]
+
+# Objetivo de tiempo para cargar un modelo compilado (incluye compilar su expresión regular)
+MODEL_LOAD_TARGET_MS = 5.0
+
+# Proporción de palabras de 5 o más letras a las que --fuzzy les introduce un error de tipeo
+TYPO_RATE = 0.3
+
+# Palabras comunes bien escritas parecidas a alguna palabra clave: --fuzzy no debería corregir ninguna
+NEAR_KEYWORD_WORDS = (
+    "servir servido servida sirviendo conservador observador fisco risco dicho distancia "
+    "estancia constancia computa compito contener contenedor farewell locker rocker docket "
+    "desarrolla desarrollar despega despegue registra registrar registrado monitores prueba "
+    "resting texting nesting tasting jogging lodging employment elaboracion complicacion "
+    "correr correa corre gmail noble mover officer backed respaldar invento funciona "
+    "funcionar functions disparada disparar efimera lambada bigger tigger softer plataformas "
+    "aplicar aplicado evitar eventual moviles infraestructural built"
+).split()
+
+
+def legacy_classify_text(classifier: CloudServiceClassifier, text: str) -> Tuple[str, float, Dict[str, float]]:
+    """
+    Implementación original de classify_text (una búsqueda por palabra clave), usada como referencia
+
+    Recibe el texto con la misma normalización que el clasificador para comparar solo la búsqueda
+    """
+    if not text or not text.strip():
+        return "No clasificable", 0.0, {}
+
+    text_lower = fold_text(text)
+
+    scores = {}
+    for service_type, keywords in classifier.keywords.items():
+        score = 0
+        for keyword, weight in keywords.items():
+            if keyword in text_lower:
+                score += weight
+            pattern = r'\b' + re.escape(keyword) + r'\b'
+            if re.search(pattern, text_lower):
+                score += weight * 0.5
+
+        scores[service_type] = score
+
+    if not scores or max(scores.values()) == 0:
+        return "No clasificable", 0.0, scores
+
+    best_type = max(scores, key=scores.get)
+    best_score = scores[best_type]
+
+    total_possible = sum(max(weights.values()) for weights in classifier.keywords.values())
+    confidence = min(best_score / total_possible, 1.0)
+
+    return best_type, confidence, scores
+
+
+def generate_text(classifier: CloudServiceClassifier, size: int, keyword_density: float, seed: int = 42,
+                  filler_words: List[str] = FILLER_WORDS) -> str:
+    """Genera un texto sintético de `size` caracteres con la densidad de palabras clave indicada"""
+    rng = random.Random(seed)
+    keywords = sorted({kw for kws in classifier.keywords.values() for kw in kws})
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(keywords) if rng.random() < keyword_density else rng.choice(filler_words)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)[:size]
+
+
+def time_call(function: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    """Ejecuta la función `repeat` veces y retorna el mejor tiempo y el último resultado"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def format_size(size: int) -> str:
+    """Formatea un tamaño en bytes de forma legible"""
+    if size >= 1_000_000:
+        return f"{size / 1_000_000:g} MB"
+    if size >= 1_000:
+        return f"{size / 1_000:g} KB"
+    return f"{size} B"
+
+
+def run_benchmark(sizes: List[int], keyword_density: float, repeat: int) -> bool:
+    """Ejecuta el benchmark y retorna True si todos los resultados coinciden"""
+    classifier = CloudServiceClassifier()
+
+    texts = [(f"ejemplo_{name}.txt", open(os.path.join(EXAMPLES_DIR, f"ejemplo_{name}.txt"), encoding='utf-8').read())
+             for name in ('iaas', 'paas')]
+    texts += [(format_size(size), generate_text(classifier, size, keyword_density)) for size in sizes]
+
+    print(f"{'ENTRADA':<18}{'ORIGINAL':>14}{'UNA PASADA':>14}{'ACELERACIÓN':>14}  RESULTADO")
+    print('=' * 72)
+
+    all_equal = True
+    for name, text in texts:
+        # Las entradas grandes solo se miden una vez: la búsqueda original tarda segundos
+        runs = repeat if len(text) < 1_000_000 else 1
+        legacy_time, legacy_result = time_call(lambda: legacy_classify_text(classifier, text), runs)
+        new_time, new_result = time_call(lambda: classifier.classify_text(text), runs)
+
+        equal = legacy_result == new_result
+        all_equal = all_equal and equal
+        print(f"{name:<18}{legacy_time * 1000:>12.2f}ms{new_time * 1000:>12.2f}ms"
+              f"{legacy_time / new_time:>13.1f}x  {'idéntico' if equal else 'DIFERENTE'}")
+
+    return all_equal
+
+
+def median_time(function: Callable[[], object], repeat: int) -> float:
+    """Mediana del tiempo de `repeat` ejecuciones, en milisegundos"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run_startup_benchmark(repeat: int) -> bool:
+    """Mide el arranque con y sin modelo compilado; retorna True si se cumple el objetivo de carga"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = os.path.join(temp_dir, 'modelo.bin')
+        CompiledKeywordModel(DEFAULT_KEYWORDS).save(model_path)
+
+        def compile_model():
+            re.purge()  # Sin la caché de `re`, como en un proceso recién iniciado
+            CompiledKeywordModel(DEFAULT_KEYWORDS)
+
+        def load_model():
+            re.purge()
+            CompiledKeywordModel.load(model_path)
+
+        def run_cli(*extra_args: str):
+            subprocess.run([sys.executable, CLASSIFIER_SCRIPT, '--text', 'servidores virtuales', *extra_args],
+                           check=True, stdout=subprocess.DEVNULL)
+
+        compile_ms = median_time(compile_model, repeat)
+        load_ms = median_time(load_model, repeat)
+        cli_ms = median_time(run_cli, repeat)
+        cli_model_ms = median_time(lambda: run_cli('--model', model_path), repeat)
+        model_size = os.path.getsize(model_path)
+
+    print(f"\n{'ARRANQUE (mediana)':<34}{'TIEMPO':>12}")
+    print('=' * 46)
+    print(f"{'Compilar diccionario':<34}{compile_ms:>10.2f}ms")
+    print(f"{f'Cargar modelo ({model_size} bytes)':<34}{load_ms:>10.2f}ms")
+    print(f"{'CLI --text':<34}{cli_ms:>10.2f}ms")
+    print(f"{'CLI --text --model':<34}{cli_model_ms:>10.2f}ms")
+
+    within_target = load_ms <= MODEL_LOAD_TARGET_MS
+    print(f"\nObjetivo de carga del modelo: <= {MODEL_LOAD_TARGET_MS:g} ms "
+          f"({'cumplido' if within_target else 'NO cumplido'})")
+    return within_target
+
+
+def run_engine_benchmark(documents: int, repeat: int) -> bool:
+    """Compara documentos/segundo de cada motor sobre un lote de tickets cortos"""
+    reference = CloudServiceClassifier()
+    corpus = [generate_text(reference, 300, 0.05, seed=seed) for seed in range(documents)]
+    expected = None
+
+    print(f"\n{'MOTOR':<18}{'DOCUMENTOS/S':>16}  RESULTADO")
+    print('=' * 46)
+
+    all_equal = True
+    for engine in KEYWORD_ENGINES:
+        if engine == 'numpy' and not NUMPY_AVAILABLE:
+            print(f"{engine:<18}{'-':>16}  omitido (NumPy no está instalado)")
+            continue
+        classifier = CloudServiceClassifier(engine=engine)
+        elapsed, results = time_call(lambda: classifier.classify_batch(corpus, workers=1), repeat)
+        expected = expected if expected is not None else results
+        equal = results == expected
+        all_equal = all_equal and equal
+        print(f"{engine:<18}{documents / elapsed:>16,.0f}  {'idéntico' if equal else 'DIFERENTE'}")
+
+    return all_equal
+
+
+def unicodedata_fold(text: str) -> str:
+    """Plegado carácter por carácter con unicodedata, como el preproceso externo que reemplaza fold_text"""
+    return ''.join(char for char in unicodedata.normalize('NFD', text.lower()) if not unicodedata.combining(char))
+
+
+def run_normalization_benchmark(sizes: List[int], repeat: int) -> bool:
+    """Compara fold_text con str.lower y con el plegado vía unicodedata; retorna True si coincide con este"""
+    reference = CloudServiceClassifier()
+    filler_words = FILLER_WORDS + ACCENTED_WORDS
+
+    print(f"\n{'NORMALIZACIÓN':<28}{'STR.LOWER':>12}{'UNICODEDATA':>14}{'FOLD_TEXT':>12}  RESULTADO")
+    print('=' * 78)
+
+    all_equal = True
+    for size in sizes:
+        text = generate_text(reference, size, 0.0005, filler_words=filler_words)
+        variants = [
+            ('ascii', text.encode('ascii', 'ignore').decode('ascii')),
+            ('latin-1', text),
+            # Comillas tipográficas: fuerzan el camino para caracteres fuera de Latin-1
+            ('comillas', text.replace(' máquina ', ' “máquina” '))
+        ]
+        for name, variant in variants:
+            runs = repeat if size < 1_000_000 else 1
+            lower_time, _ = time_call(lambda: variant.lower(), runs)
+            unicodedata_time, expected = time_call(lambda: unicodedata_fold(variant), runs)
+            fold_time, result = time_call(lambda: fold_text(variant), runs)
+
+            equal = result == expected
+            all_equal = all_equal and equal
+            label = f"{format_size(size)} {name}"
+            print(f"{label:<28}{lower_time * 1000:>10.2f}ms{unicodedata_time * 1000:>12.2f}ms"
+                  f"{fold_time * 1000:>10.2f}ms  {'idéntico' if equal else 'DIFERENTE'}")
+
+    return all_equal
+
+
+def misspell(text: str, rng: random.Random, rate: float = TYPO_RATE) -> str:
+    """Introduce un error de tipeo (borrado, inserción, sustitución o transposición) en algunas palabras"""
+    words = text.split(' ')
+    for index, word in enumerate(words):
+        if len(word) < 5 or rng.random() >= rate:
+            continue
+        position = rng.randrange(len(word) - 1)
+        char = rng.choice('aeiounrst')
+        words[index] = rng.choice([
+            word[:position] + word[position + 1:],
+            word[:position] + char + word[position:],
+            word[:position] + char + word[position + 1:],
+            word[:position] + word[position + 1] + word[position] + word[position + 2:]
+        ])
+    return ' '.join(words)
+
+
+def brute_force_correct(keywords: List[str], token: str, max_distance: int):
+    """Corrección de referencia: compara la palabra con cada palabra clave, sin índice"""
+    if token in keywords or token in COMMON_WORDS:
+        return None
+    best, best_distance = None, max_distance + 1
+    for keyword in sorted(keywords):
+        limit = allowed_distance(keyword, max_distance)
+        if (not limit or keyword in token or abs(len(token) - len(keyword)) > MAX_LENGTH_DIFFERENCE
+                or not is_plausible_typo(token, keyword)):
+            continue
+        distance = edit_distance(token, keyword, limit)
+        if distance <= limit and distance < best_distance:
+            best, best_distance = keyword, distance
+    return best
+
+
+def run_fuzzy_benchmark(documents: int, repeat: int) -> bool:
+    """
+    Compara documentos/segundo con y sin --fuzzy sobre tickets con errores de tipeo,
+    mide los falsos positivos sobre texto sin errores y verifica que el índice de borrados
+    corrige igual que comparar contra cada palabra clave
+    """
+    reference = CloudServiceClassifier()
+    rng = random.Random(7)
+    clean = [generate_text(reference, 300, 0.05, seed=seed) for seed in range(documents)]
+    corpus = [misspell(text, rng) for text in clean]
+    expected = reference.classify_batch(clean, workers=1)
+
+    print(f"\n{'COINCIDENCIA':<18}{'1ª PASADA':>14}{'ESTABLE':>14}{'COSTO':>9}{'= SIN ERRORES':>15}")
+    print('=' * 70)
+
+    exact_rate = None
+    all_equal = True
+    for distance in range(MAX_FUZZY_DISTANCE + 1):
+        model = CompiledKeywordModel(DEFAULT_KEYWORDS, distance)
+        classifier = CloudServiceClassifier(model)
+        # La primera pasada llena la memoria de correcciones; las siguientes ya la encuentran
+        cold, results = time_call(lambda: classifier.classify_batch(corpus, workers=1), 1)
+        warm, _ = time_call(lambda: classifier.classify_batch(corpus, workers=1), repeat)
+        exact_rate = exact_rate or documents / warm
+        recovered = sum(1 for result, clean_result in zip(results, expected) if result[0] == clean_result[0])
+        label = f"fuzzy {distance}" if distance else 'exacta'
+        print(f"{label:<18}{documents / cold:>14,.0f}{documents / warm:>14,.0f}"
+              f"{exact_rate / (documents / warm):>8.2f}x{recovered / documents:>15.1%}")
+
+        if distance:
+            # Falsos positivos: en texto sin errores nada debería corregirse ni cambiar de tipo
+            changed = sum(1 for (service_type, _, _), clean_result
+                          in zip(classifier.classify_batch(clean, workers=1), expected)
+                          if service_type != clean_result[0])
+            corrected_words = {word: model.matcher.fuzzy.correct(word) for word in NEAR_KEYWORD_WORDS}
+            false_positives = sorted(f"{word}->{keyword}" for word, keyword in corrected_words.items() if keyword)
+            print(f"  texto sin errores: {changed / documents:.2%} de documentos cambian de tipo; "
+                  f"{len(false_positives)} de {len(NEAR_KEYWORD_WORDS)} palabras comunes parecidas se corrigen"
+                  + (f" ({', '.join(false_positives[:8])}{', ...' if len(false_positives) > 8 else ''})"
+                     if false_positives else ''))
+
+            # Cada palabra distinta del corpus se corrige igual con el índice y sin él
+            tokens = sorted({token for text in corpus for token in TOKEN_PATTERN.findall(fold_text(text))})
+            keywords = sorted(model.matcher.keywords)
+            # Índice recién creado y una sola pasada: sin correcciones recordadas, cada palabra es una consulta real
+            index = FuzzyKeywordIndex(keywords, distance)
+            index_time, corrected = time_call(lambda: [index.correct(token) for token in tokens], 1)
+            brute_time, brute = time_call(lambda: [brute_force_correct(keywords, token, distance) for token in tokens], 1)
+            equal = corrected == brute
+            all_equal = all_equal and equal
+            print(f"  {len(tokens):,} palabras: índice {len(tokens) / index_time:,.0f}/s, "
+                  f"contra cada palabra clave {len(tokens) / brute_time:,.0f}/s  "
+                  f"{'idéntico' if equal else 'DIFERENTE'}")
+
+    return all_equal
+
+
+def main():
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(
+        description='Benchmark del Clasificador de Servicios en la Nube'
+    )
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=DEFAULT_SIZES,
+        help='Tamaños de texto sintético en caracteres (por defecto: 1 KB, 100 KB y 10 MB)'
+    )
+    parser.add_argument(
+        '--density',
+        type=float,
+        default=0.0005,
+        help='Proporción de palabras clave en el texto sintético (por defecto: 0.0005)'
+    )
+    parser.add_argument(
+        '--startup',
+        action='store_true',
+        help='Medir también el arranque con y sin modelo compilado'
+    )
+    parser.add_argument(
+        '--engines',
+        action='store_true',
+        help='Comparar también el rendimiento por lotes de los motores python y numpy'
+    )
+    parser.add_argument(
+        '--normalization',
+        action='store_true',
+        help='Medir también la normalización (mayúsculas y diacríticos) sobre textos largos'
+    )
+    parser.add_argument(
+        '--fuzzy',
+        action='store_true',
+        help='Medir también el costo de tolerar errores de tipeo (--fuzzy) frente a la coincidencia exacta'
+    )
+    parser.add_argument(
+        '--documents',
+        type=int,
+        default=20_000,
+        help='Documentos del lote usado con --engines y --fuzzy (por defecto: 20000)'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=5,
+        help='Repeticiones por medición; se reporta el mejor tiempo (por defecto: 5)'
+    )
+
+    args = parser.parse_args()
+
+    if not run_benchmark(args.sizes, args.density, args.repeat):
+        print("\nError: el motor de una sola pasada produjo resultados distintos a la búsqueda original.")
+        sys.exit(1)
+
+    if args.startup and not run_startup_benchmark(args.repeat):
+        sys.exit(1)
+
+    if args.engines and not run_engine_benchmark(args.documents, args.repeat):
+        print("\nError: los motores de puntuación produjeron resultados distintos.")
+        sys.exit(1)
+
+    if args.normalization and not run_normalization_benchmark(args.sizes, args.repeat):
+        print("\nError: fold_text produjo un texto distinto al plegado con unicodedata.")
+        sys.exit(1)
+
+    if args.fuzzy and not run_fuzzy_benchmark(args.documents, args.repeat):
+        print("\nError: el índice de borrados corrigió distinto que la comparación contra cada palabra clave.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmark y regresión del Clasificador de Servicios en la Nube
+Mide documentos/segundo, latencia p50/p99 y memoria pico por motor sobre corpus
+sintéticos (cortos, medianos y muy largos; español e inglés) y el corpus dorado,
+y falla si alguna clasificación del corpus dorado cambia respecto a la salida guardada
+o si alguna de las comprobaciones de comportamiento del CLI deja de cumplirse
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from benchmark import CLASSIFIER_SCRIPT, FILLER_WORDS, NEAR_KEYWORD_WORDS, generate_text
+from cloud_models_classifier import DEFAULT_KEYWORDS, KEYWORD_ENGINES, CloudServiceClassifier, CompiledKeywordModel
+from numpy_engine import NUMPY_AVAILABLE
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_CORPUS = os.path.join(CODE_DIR, 'golden_corpus.jsonl')
+GOLDEN_OUTPUTS = os.path.join(CODE_DIR, 'golden_outputs.json')
+
+FILLER_WORDS_EN = (
+    "the and of to in is for on with as it that this be are was we you they have "
+    "not but from at by or an our can will please customer issue request ticket "
+    "thanks team need want help error problem account support service company"
+).split()
+
+# (nombre, documentos, caracteres por documento, idioma)
+SYNTHETIC_CORPORA = [
+    ('cortos_es', 2000, 200, 'es'),
+    ('cortos_en', 2000, 200, 'en'),
+    ('medianos_es', 200, 5_000, 'es'),
+    ('medianos_en', 200, 5_000, 'en'),
+    ('muy_largos_es', 3, 1_000_000, 'es'),
+]
+
+
+def load_golden_corpus() -> List[Tuple[str, str]]:
+    """Lee el corpus dorado: registros con texto en línea o referencia a un archivo de ejemplo"""
+    documents = []
+    with open(GOLDEN_CORPUS, 'r', encoding='utf-8') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if 'archivo' in record:
+                with open(os.path.join(CODE_DIR, record['archivo']), 'r', encoding='utf-8') as example:
+                    text = example.read().strip()
+            else:
+                text = record['texto']
+            documents.append((record['id'], text))
+    return documents
+
+
+def build_synthetic_corpora(classifier: CloudServiceClassifier, scale: float) -> Dict[str, List[str]]:
+    """Genera los corpus sintéticos de forma determinista"""
+    corpora = {}
+    for name, documents, size, language in SYNTHETIC_CORPORA:
+        filler = FILLER_WORDS if language == 'es' else FILLER_WORDS_EN
+        count = max(1, int(documents * scale))
+        corpora[name] = [generate_text(classifier, size, 0.02, seed=seed, filler_words=filler)
+                         for seed in range(count)]
+    return corpora
+
+
+def golden_record(classifier: CloudServiceClassifier, text: str) -> Dict:
+    """Salida observable de un documento: clasificación y palabras clave encontradas"""
+    analysis = classifier.get_detailed_analysis(text)
+    return {
+        'tipo_servicio': analysis['tipo_servicio'],
+        'confianza': analysis['confianza'],
+        'scores': analysis['scores_completos'],
+        'palabras_clave': {service: [keyword for keyword, _ in keywords]
+                           for service, keywords in analysis['palabras_clave_encontradas'].items()}
+    }
+
+
+def check_golden(engines: List[str], update: bool) -> Dict:
+    """Compara cada motor contra las salidas doradas (o las regenera con update=True)"""
+    documents = load_golden_corpus()
+    reference = CloudServiceClassifier()
+    current = {doc_id: golden_record(reference, text) for doc_id, text in documents}
+
+    if update:
+        with open(GOLDEN_OUTPUTS, 'w', encoding='utf-8') as file:
+            json.dump(current, file, ensure_ascii=False, indent=2)
+            file.write('\n')
+        return {'documentos': len(documents), 'fallos': [], 'actualizado': True}
+
+    with open(GOLDEN_OUTPUTS, 'r', encoding='utf-8') as file:
+        expected = json.load(file)
+
+    failures = []
+    for doc_id, record in current.items():
+        if expected.get(doc_id) != record:
+            failures.append({'id': doc_id, 'motor': 'analisis', 'esperado': expected.get(doc_id), 'obtenido': record})
+
+    # Cada motor debe reproducir tipo, confianza y scores del análisis detallado
+    texts = [text for _, text in documents]
+    for engine in engines:
+        results = CloudServiceClassifier(engine=engine).classify_batch(texts, workers=1)
+        for (doc_id, _), (service_type, confidence, scores) in zip(documents, results):
+            golden = expected.get(doc_id, {})
+            obtained = {'tipo_servicio': service_type, 'confianza': confidence, 'scores': scores}
+            if {key: golden.get(key) for key in obtained} != obtained:
+                failures.append({'id': doc_id, 'motor': engine, 'esperado': golden, 'obtenido': obtained})
+
+    missing = sorted(set(expected) - set(current))
+    for doc_id in missing:
+        failures.append({'id': doc_id, 'motor': 'analisis', 'esperado': expected[doc_id], 'obtenido': None})
+
+    return {'documentos': len(documents), 'fallos': failures, 'actualizado': False}
+
+
+def run_cli(*args: str) -> subprocess.CompletedProcess:
+    """Ejecuta el CLI real en un proceso nuevo"""
+    return subprocess.run([sys.executable, CLASSIFIER_SCRIPT, *args], capture_output=True, text=True)
+
+
+def check_verbose_cache():
+    """--verbose consulta la caché: la segunda ejecución sobre el mismo archivo es un acierto"""
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, 'cache.db')
+        args = ('--text', 'Necesito servidores virtuales', '--cache', cache_path, '--verbose')
+        first, second = run_cli(*args), run_cli(*args)
+    assert '0 aciertos en disco, 1 fallos' in first.stderr, first.stderr
+    assert '1 aciertos en disco, 0 fallos' in second.stderr, second.stderr
+
+
+def check_fuzzy_common_words():
+    """--fuzzy no convierte palabras comunes en palabras clave ('servir' no es 'servidor')"""
+    for fuzzy_args in (('--fuzzy',), ('--fuzzy', '2')):
+        result = run_cli('--text', 'quiero servir comida', *fuzzy_args)
+        assert 'TIPO DE SERVICIO: No clasificable' in result.stdout, f"{' '.join(fuzzy_args)}: {result.stdout}"
+
+
+def check_fuzzy_near_keyword_words():
+    """--fuzzy 1 no corrige palabras reales parecidas a una palabra clave ('correr', 'built', 'registra', 'prueba')"""
+    fuzzy = CompiledKeywordModel(DEFAULT_KEYWORDS, 1).matcher.fuzzy
+    corrected = [f"{word}->{fuzzy.correct(word)}" for word in NEAR_KEYWORD_WORDS if fuzzy.correct(word)]
+    assert not corrected, ', '.join(corrected)
+
+
+def check_demo_program_name():
+    """Los pasos en proceso de demo.py muestran el nombre real del CLI en --help y --version"""
+    from demo import run_in_process
+    classifier = CloudServiceClassifier()
+    help_text, _ = run_in_process(['--help'], classifier)
+    version_text, _ = run_in_process(['--version'], classifier)
+    assert help_text.startswith('usage: cloud_models_classifier.py'), help_text[:80]
+    assert 'cloud_models_classifier.py --text' in help_text, 'ejemplos de uso sin el nombre del CLI'
+    assert version_text.startswith('cloud_models_classifier.py '), version_text
+
+
+def check_invalid_keyword_weights():
+    """Los diccionarios con pesos negativos, NaN o infinitos se rechazan nombrando la palabra clave"""
+    from keyword_dictionary import parse_keywords
+    cases = [
+        ('negativo', b'{"IaaS": {"servidor": 3, "disco": -2}}', 'dict.json', 'disco'),
+        ('NaN', b'{"IaaS": {"servidor": NaN}}', 'dict.json', 'servidor'),
+        ('infinito', b'{"PaaS": {"runtime": Infinity}}', 'dict.json', 'runtime'),
+        ('infinito YAML', b'FaaS:\n  lambda: -.inf\n', 'dict.yaml', 'lambda'),
+    ]
+    for name, data, path, keyword in cases:
+        try:
+            parse_keywords(data, path)
+        except ValueError as e:
+            assert f"'{keyword}'" in str(e), f"{name}: el error no nombra '{keyword}': {e}"
+        else:
+            raise AssertionError(f"{name}: se aceptó el diccionario")
+    assert parse_keywords(b'{"IaaS": {"servidor": 0, "disco": 2.5}}', 'dict.json')
+
+
+def check_engines_fractional_weights():
+    """--engine numpy produce el mismo JSONL que --engine python con pesos fraccionarios y pesos 0"""
+    if not NUMPY_AVAILABLE:
+        return
+    keywords = {
+        'IaaS': {'servidor': 2.5, 'disco': 0.1, 'red': 0},
+        'PaaS': {'api': 1.5, 'despliegue': 0.3, 'runtime': 2},
+        'SaaS': {'correo': 0.7, 'suscripcion': 1},
+    }
+    texts = [
+        'servidores api', 'Necesito un servidor y una api', 'disco red', 'red',
+        'despliegue del runtime con api', 'correo por suscripcion', 'discos apis correos', '',
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        keywords_path = os.path.join(directory, 'pesos.json')
+        batch_path = os.path.join(directory, 'lote.txt')
+        with open(keywords_path, 'w', encoding='utf-8') as f:
+            json.dump(keywords, f)
+        with open(batch_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(texts) + '\n')
+        outputs = {
+            engine: run_cli('--batch', batch_path, '--keywords', keywords_path, '--engine', engine, '--format', 'jsonl')
+            for engine in ('python', 'numpy')
+        }
+    for engine, result in outputs.items():
+        assert result.returncode == 0 and result.stdout, f"{engine}: {result.stderr}"
+    assert outputs['python'].stdout == outputs['numpy'].stdout, \
+        f"python:\n{outputs['python'].stdout}\nnumpy:\n{outputs['numpy'].stdout}"
+
+
+# (nombre, función que levanta AssertionError si el comportamiento cambió)
+BEHAVIOR_CHECKS = [
+    ('verbose_usa_cache', check_verbose_cache),
+    ('fuzzy_sin_palabras_comunes', check_fuzzy_common_words),
+    ('fuzzy_palabras_cercanas', check_fuzzy_near_keyword_words),
+    ('demo_nombre_del_cli', check_demo_program_name),
+    ('pesos_invalidos', check_invalid_keyword_weights),
+    ('motores_pesos_fraccionarios', check_engines_fractional_weights),
+]
+
+
+def check_behavior() -> Dict:
+    """Ejecuta las comprobaciones de comportamiento que el corpus dorado no cubre"""
+    failures = []
+    for name, check in BEHAVIOR_CHECKS:
+        try:
+            check()
+        except AssertionError as e:
+            failures.append({'nombre': name, 'detalle': str(e).strip()})
+    return {'comprobaciones': len(BEHAVIOR_CHECKS), 'fallos': failures}
+
+
+def measure(function, texts: List[str], latency_samples: int) -> Dict[str, float]:
+    """Mide rendimiento, latencia por documento y memoria pico de una función de lote"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    function(texts)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    step = max(1, len(texts) // latency_samples)
+    latencies = []
+    for text in texts[::step]:
+        doc_start = time.perf_counter()
+        function([text])
+        latencies.append((time.perf_counter() - doc_start) * 1000)
+    latencies.sort()
+
+    return {
+        'documentos_por_segundo': round(len(texts) / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies), 4),
+        'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 4),
+        'memoria_pico_kb': round(peak / 1024, 1)
+    }
+
+
+def run_suite(engines: List[str], scale: float, latency_samples: int) -> List[Dict]:
+    """Ejecuta las mediciones por motor y corpus"""
+    reference = CloudServiceClassifier()
+    corpora = build_synthetic_corpora(reference, scale)
+    corpora['dorado'] = [text for _, text in load_golden_corpus()]
+
+    results = []
+    for engine in engines:
+        classifier = CloudServiceClassifier(engine=engine)
+        functions = {engine: lambda texts: classifier.classify_batch(texts, workers=1)}
+        if engine == 'python':
+            # El análisis detallado (modo --verbose) también se mide para detectar regresiones
+            functions['analisis_detallado'] = lambda texts: [classifier.get_detailed_analysis(text) for text in texts]
+        for label, function in functions.items():
+            for corpus_name, texts in corpora.items():
+                metrics = measure(function, texts, latency_samples)
+                results.append({'motor': label, 'corpus': corpus_name, 'documentos': len(texts), **metrics})
+    return results
+
+
+def print_results(results: List[Dict], golden: Dict, checks: Dict):
+    """Imprime una tabla legible con las mediciones, el resultado del corpus dorado y las comprobaciones"""
+    if results:
+        print(f"{'MOTOR':<20}{'CORPUS':<15}{'DOCS':>6}{'DOCS/S':>12}{'P50 MS':>10}{'P99 MS':>10}{'PICO KB':>11}")
+        print('=' * 84)
+        for row in results:
+            print(f"{row['motor']:<20}{row['corpus']:<15}{row['documentos']:>6}{row['documentos_por_segundo']:>12,.0f}"
+                  f"{row['p50_ms']:>10.3f}{row['p99_ms']:>10.3f}{row['memoria_pico_kb']:>11,.1f}")
+        print()
+
+    if golden['actualizado']:
+        print(f"CORPUS DORADO: salidas regeneradas para {golden['documentos']} documentos")
+    elif golden['fallos']:
+        print(f"CORPUS DORADO: {len(golden['fallos'])} diferencias")
+        for failure in golden['fallos']:
+            print(f"  [{failure['motor']}] {failure['id']}: esperado {failure['esperado']}, obtenido {failure['obtenido']}")
+    else:
+        print(f"CORPUS DORADO: {golden['documentos']} documentos sin cambios")
+
+    if checks['fallos']:
+        print(f"COMPROBACIONES: {len(checks['fallos'])} de {checks['comprobaciones']} fallaron")
+        for failure in checks['fallos']:
+            print(f"  {failure['nombre']}: {failure['detalle']}")
+    else:
+        print(f"COMPROBACIONES: {checks['comprobaciones']} sin fallos")
+
+
+def main():
+    """Función principal de la suite"""
+    parser = argparse.ArgumentParser(
+        description='Suite de benchmark y regresión del Clasificador de Servicios en la Nube',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  %(prog)s
+  %(prog)s --json resultados.json
+  %(prog)s --scale 0.1 --golden-only
+  %(prog)s --update-golden
+        """
+    )
+    parser.add_argument(
+        '--json',
+        type=str,
+        metavar='PATH',
+        help="Guardar resultados en JSON para seguimiento histórico ('-' para stdout)"
+    )
+    parser.add_argument(
+        '--scale',
+        type=float,
+        default=1.0,
+        help='Factor sobre el número de documentos de cada corpus sintético (por defecto: 1.0)'
+    )
+    parser.add_argument(
+        '--latency-samples',
+        type=int,
+        default=200,
+        help='Documentos por corpus usados para medir latencia (por defecto: 200)'
+    )
+    parser.add_argument(
+        '--golden-only',
+        action='store_true',
+        help='Solo verificar el corpus dorado y las comprobaciones, sin medir rendimiento'
+    )
+    parser.add_argument(
+        '--update-golden',
+        action='store_true',
+        help='Regenerar las salidas doradas con el comportamiento actual'
+    )
+
+    args = parser.parse_args()
+
+    engines = [engine for engine in KEYWORD_ENGINES if engine != 'numpy' or NUMPY_AVAILABLE]
+    golden = check_golden(engines, args.update_golden)
+    checks = check_behavior()
+    results = [] if args.golden_only else run_suite(engines, args.scale, args.latency_samples)
+
+    report = {
+        'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'motores': engines,
+        'resultados': results,
+        'dorado': golden,
+        'comprobaciones': checks
+    }
+
+    if args.json == '-':
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print_results(results, golden, checks)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+
+    if golden['fallos'] or checks['fallos']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,141 +6,347 @@ Clasifica texto según si corresponde a IaaS, PaaS, SaaS o FaaS usando reglas b
 
 import re
 import argparse
+import io
+import json
+import marshal
 import sys
 import os
-from typing import Dict, List, Tuple
+import time
+from collections import Counter
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
-class CloudServiceClassifier:
+from corpus_report import REPORT_FORMATS, CorpusReport
+from fuzzy import DEFAULT_FUZZY_DISTANCE, FUZZY_VERSION, MAX_FUZZY_DISTANCE, FuzzyKeywordIndex
+from normalization import NORMALIZATION_VERSION, fold_text
+from result_cache import DEFAULT_MEMORY_SIZE, ClassificationCache, keywords_fingerprint
+from run_stats import RunStats, measure
+from segments import (DEFAULT_STRIDE_WORDS, DEFAULT_WINDOW_WORDS, SEGMENT_MODES, SegmentScorer,
+                      paragraph_bounds, window_bounds)
+from writers import OUTPUT_FORMATS, create_writer
+
+# Textos por tarea enviada a cada proceso en modo lote
+DEFAULT_CHUNK_SIZE = 256
+
+# Motores de puntuación disponibles: los de palabras clave y el modelo lineal entrenado
+KEYWORD_ENGINES = ('python', 'numpy')
+ENGINES = KEYWORD_ENGINES + ('linear',)
+
+# Funciones listadas en el reporte de --profile
+PROFILE_TOP_FUNCTIONS = 20
+
+# Caracteres de cada segmento mostrados por --segments
+SEGMENT_SNIPPET_LENGTH = 60
+
+# Encabezado y versión del formato binario de los modelos compilados
+MODEL_MAGIC = b'CMCM'
+MODEL_FORMAT_VERSION = 3
+
+# Definir palabras clave para cada tipo de servicio
+DEFAULT_KEYWORDS = {
+    'IaaS': {
+        'infraestructura': 3,
+        'servidor': 3,
+        'vm': 2,
+        'virtual machine': 2,
+        'storage': 2,
+        'red': 2,
+        'network': 2,
+        'computo': 2,
+        'cpu': 2,
+        'ram': 2,
+        'disco': 2,
+        'hardware': 3,
+        'bare metal': 3,
+        'instancia': 2,
+        'container': 2,
+        'docker': 2,
+        'kubernetes': 2,
+        'load balancer': 2,
+        'firewall': 2,
+        'vpc': 2,
+        'subnet': 2
+    },
+    'PaaS': {
+        'plataforma': 3,
+        'desarrollo': 3,
+        'aplicacion': 2,
+        'deployment': 2,
+        'despliegue': 2,
+        'runtime': 2,
+        'middleware': 2,
+        'database': 2,
+        'base de datos': 2,
+        'api': 2,
+        'framework': 2,
+        'build': 2,
+        'compilacion': 2,
+        'testing': 2,
+        'pruebas': 2,
+        'monitoring': 2,
+        'monitoreo': 2,
+        'logging': 2,
+        'registro': 2,
+        'cicd': 2,
+        'ci/cd': 2,
+        'pipeline': 2
+    },
+    'SaaS': {
+        'software': 3,
+        'aplicacion': 3,
+        'usuario final': 3,
+        'end user': 3,
+        'web': 2,
+        'mobile': 2,
+        'movil': 2,
+        'crm': 2,
+        'erp': 2,
+        'office': 2,
+        'productividad': 2,
+        'colaboracion': 2,
+        'comunicacion': 2,
+        'email': 2,
+        'correo': 2,
+        'chat': 2,
+        'video conferencia': 2,
+        'almacenamiento': 2,
+        'backup': 2,
+        'respaldo': 2,
+        'analytics': 2,
+        'reportes': 2
+    },
+    'FaaS': {
+        'function': 3,
+        'funcion': 3,
+        'serverless': 3,
+        'sin servidor': 3,
+        'evento': 2,
+        'event': 2,
+        'trigger': 2,
+        'disparador': 2,
+        'lambda': 2,
+        'azure functions': 2,
+        'google cloud functions': 2,
+        'microservicio': 2,
+        'microservice': 2,
+        'stateless': 2,
+        'sin estado': 2,
+        'ephemeral': 2,
+        'efimero': 2,
+        'cold start': 2,
+        'arranque frio': 2,
+        'timeout': 2,
+        'tiempo limite': 2
+    }
+}
+
+
+def _is_word_char(char: str) -> bool:
+    """Replica la definición de carácter de palabra que usa \\b en `re` (Unicode)"""
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatcher:
     """
-    Clasificador que determina el tipo de servicio en la nube basado en palabras clave y patrones
+    Autómata de coincidencia de múltiples palabras clave en una sola pasada
+
+    Las palabras clave se organizan en un trie (la misma estructura de la que parte
+    Aho-Corasick) y el trie se compila una sola vez a una expresión regular factorizada
+    por prefijos. El motor de `re`, escrito en C, recorre el texto una única vez y
+    reporta cada posición donde inicia alguna palabra clave, incluidas las coincidencias
+    traslapadas ('servidor' dentro de 'sin servidor', 'ram' dentro de 'programa').
+    Con `fuzzy_distance`, un índice de borrados agrega las palabras clave escritas con
+    errores de tipeo (ver fuzzy.FuzzyKeywordIndex).
     """
-    
-    def __init__(self):
-        # Definir palabras clave para cada tipo de servicio
-        self.keywords = {
-            'IaaS': {
-                'infraestructura': 3,
-                'servidor': 3,
-                'vm': 2,
-                'virtual machine': 2,
-                'storage': 2,
-                'red': 2,
-                'network': 2,
-                'computo': 2,
-                'cpu': 2,
-                'ram': 2,
-                'disco': 2,
-                'hardware': 3,
-                'bare metal': 3,
-                'instancia': 2,
-                'container': 2,
-                'docker': 2,
-                'kubernetes': 2,
-                'load balancer': 2,
-                'firewall': 2,
-                'vpc': 2,
-                'subnet': 2
-            },
-            'PaaS': {
-                'plataforma': 3,
-                'desarrollo': 3,
-                'aplicacion': 2,
-                'deployment': 2,
-                'despliegue': 2,
-                'runtime': 2,
-                'middleware': 2,
-                'database': 2,
-                'base de datos': 2,
-                'api': 2,
-                'framework': 2,
-                'build': 2,
-                'compilacion': 2,
-                'testing': 2,
-                'pruebas': 2,
-                'monitoring': 2,
-                'monitoreo': 2,
-                'logging': 2,
-                'registro': 2,
-                'cicd': 2,
-                'ci/cd': 2,
-                'pipeline': 2
-            },
-            'SaaS': {
-                'software': 3,
-                'aplicacion': 3,
-                'usuario final': 3,
-                'end user': 3,
-                'web': 2,
-                'mobile': 2,
-                'movil': 2,
-                'crm': 2,
-                'erp': 2,
-                'office': 2,
-                'productividad': 2,
-                'colaboracion': 2,
-                'comunicacion': 2,
-                'email': 2,
-                'correo': 2,
-                'chat': 2,
-                'video conferencia': 2,
-                'almacenamiento': 2,
-                'backup': 2,
-                'respaldo': 2,
-                'analytics': 2,
-                'reportes': 2
-            },
-            'FaaS': {
-                'function': 3,
-                'funcion': 3,
-                'serverless': 3,
-                'sin servidor': 3,
-                'evento': 2,
-                'event': 2,
-                'trigger': 2,
-                'disparador': 2,
-                'lambda': 2,
-                'azure functions': 2,
-                'google cloud functions': 2,
-                'microservicio': 2,
-                'microservice': 2,
-                'stateless': 2,
-                'sin estado': 2,
-                'ephemeral': 2,
-                'efimero': 2,
-                'cold start': 2,
-                'arranque frio': 2,
-                'timeout': 2,
-                'tiempo limite': 2
-            }
+
+    def __init__(self, keywords: Iterable[str], fuzzy_distance: int = 0):
+        self.keywords = tuple(sorted({keyword for keyword in keywords if keyword}))
+
+        # El lookahead permite reportar una coincidencia en cada posición del texto;
+        # el trie es codicioso, así que en cada posición se obtiene la más larga
+        trie_pattern = self._build_trie_pattern(self.keywords)
+        self._pattern = re.compile(f'(?=({trie_pattern}))') if self.keywords else None
+
+        # Palabras clave que son prefijo de cada palabra clave (p. ej. 'event' de 'evento'):
+        # si la más larga coincide en una posición, todas sus prefijas también
+        self._prefixes = {
+            keyword: tuple(other for other in self.keywords if keyword.startswith(other))
+            for keyword in self.keywords
         }
-    
-    def classify_text(self, text: str) -> Tuple[str, float, Dict[str, float]]:
+        self._edges = {
+            keyword: (_is_word_char(keyword[0]), _is_word_char(keyword[-1]))
+            for keyword in self.keywords
+        }
+        self.fuzzy = FuzzyKeywordIndex(self.keywords, fuzzy_distance) if fuzzy_distance else None
+
+    @property
+    def fuzzy_distance(self) -> int:
+        """Errores de tipeo tolerados (0 = solo coincidencias exactas)"""
+        return self.fuzzy.max_distance if self.fuzzy is not None else 0
+
+    def to_state(self) -> Dict:
+        """Estado precalculado del autómata, serializable con marshal"""
+        return {
+            'keywords': self.keywords,
+            'pattern': self._pattern.pattern if self._pattern is not None else None,
+            'prefixes': self._prefixes,
+            'edges': self._edges,
+            'fuzzy': self.fuzzy.to_state() if self.fuzzy is not None else None
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'KeywordMatcher':
+        """Reconstruye el autómata sin volver a armar el trie ni la tabla de prefijos"""
+        matcher = cls.__new__(cls)
+        matcher.keywords = tuple(state['keywords'])
+        matcher._pattern = re.compile(state['pattern']) if state['pattern'] is not None else None
+        matcher._prefixes = state['prefixes']
+        matcher._edges = state['edges']
+        matcher.fuzzy = FuzzyKeywordIndex.from_state(state['fuzzy']) if state['fuzzy'] is not None else None
+        return matcher
+
+    @staticmethod
+    def _build_trie_pattern(keywords: Iterable[str]) -> str:
+        """Construye el trie de palabras clave y lo serializa como expresión regular"""
+        trie: Dict[str, Dict] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def to_pattern(node: Dict[str, Dict]) -> str:
+            branches = [re.escape(char) + to_pattern(child)
+                        for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            if '' in node:
+                # El nodo también termina una palabra clave: la continuación es opcional
+                pattern = '(?:' + pattern + ')?'
+            return pattern
+
+        return to_pattern(trie)
+
+    def find(self, text_lower: str) -> Dict[str, bool]:
         """
-        Clasifica el texto de entrada y retorna el tipo de servicio más probable
+        Busca todas las palabras clave en una sola pasada sobre el texto
+
+        Args:
+            text_lower (str): Texto ya normalizado con fold_text
+
+        Returns:
+            Dict[str, bool]: Para cada palabra clave presente, si aparece al menos una vez
+            como palabra completa (equivalente a buscar r'\\b' + palabra + r'\\b'); las que
+            solo aparecen con errores de tipeo (con `fuzzy_distance`) nunca cuentan como completas
+        """
+        hits: Dict[str, bool] = {}
+        if self._pattern is None:
+            return hits
+
+        text_length = len(text_lower)
+        pending = len(self.keywords)
+        for match in self._pattern.finditer(text_lower):
+            start = match.start()
+            for keyword in self._prefixes[match.group(1)]:
+                if hits.get(keyword):
+                    continue
+                bounded = self._is_bounded(text_lower, text_length, start, keyword)
+                hits[keyword] = bounded
+                if bounded:
+                    pending -= 1
+            if not pending:
+                # Todas las palabras clave ya aparecieron completas: el resto no cambia nada
+                break
+        if self.fuzzy is not None and pending:
+            self.fuzzy.find(text_lower, hits)
+        return hits
+
+    def find_spans(self, text_lower: str) -> Dict[str, List[Tuple[int, int, bool]]]:
+        """
+        Busca todas las apariciones de cada palabra clave en una sola pasada sobre el texto
+
+        A diferencia de find, recorre el texto completo para reportar cada posición. Con
+        `fuzzy_distance` también reporta las palabras escritas con errores de tipeo.
+
+        Args:
+            text_lower (str): Texto ya normalizado con fold_text
+
+        Returns:
+            Dict[str, List[Tuple[int, int, bool]]]: Para cada palabra clave presente, sus
+            apariciones como (inicio, fin, es_palabra_completa) en orden de aparición
+        """
+        spans: Dict[str, List[Tuple[int, int, bool]]] = {}
+        if self._pattern is None:
+            return spans
+
+        text_length = len(text_lower)
+        for match in self._pattern.finditer(text_lower):
+            start = match.start()
+            for keyword in self._prefixes[match.group(1)]:
+                bounded = self._is_bounded(text_lower, text_length, start, keyword)
+                spans.setdefault(keyword, []).append((start, start + len(keyword), bounded))
+        if self.fuzzy is not None:
+            self.fuzzy.find_spans(text_lower, spans)
+        return spans
+
+    def _is_bounded(self, text_lower: str, text_length: int, start: int, keyword: str) -> bool:
+        """Indica si la aparición de `keyword` en `start` cumple r'\\b' en ambos extremos"""
+        end = start + len(keyword)
+        starts_word, ends_word = self._edges[keyword]
+        before = _is_word_char(text_lower[start - 1]) if start > 0 else False
+        after = _is_word_char(text_lower[end]) if end < text_length else False
+        return before != starts_word and ends_word != after
+
+
+class CompiledKeywordModel:
+    """
+    Modelo de palabras clave compilado: diccionario de pesos, autómata de búsqueda y
+    denominador de confianza precalculados, listo para guardarse en un archivo binario
+    """
+
+    def __init__(self, keywords: Dict[str, Dict[str, float]], fuzzy_distance: int = 0):
+        """
+        Args:
+            keywords (Dict[str, Dict[str, float]]): Palabras clave y pesos de cada tipo de servicio
+            fuzzy_distance (int): Errores de tipeo tolerados en las palabras clave (0, 1 o 2)
+        """
+        # Las palabras clave se pliegan igual que los textos; si dos quedan iguales, vale el mayor peso
+        self.keywords = {}
+        for service_type, weights in keywords.items():
+            folded: Dict[str, float] = {}
+            for keyword, weight in weights.items():
+                keyword = fold_text(keyword)
+                folded[keyword] = max(weight, folded.get(keyword, weight))
+            self.keywords[service_type] = folded
+        self.matcher = KeywordMatcher(
+            (keyword for weights in self.keywords.values() for keyword in weights), fuzzy_distance
+        )
+        # Denominador de la confianza: suma del peso máximo de cada tipo de servicio
+        self.total_possible = sum(max(weights.values()) for weights in self.keywords.values() if weights)
+        self.fingerprint = keywords_fingerprint(self.keywords, NORMALIZATION_VERSION, fuzzy_distance, FUZZY_VERSION)
+
+    def score(self, hits: Dict[str, bool]) -> Tuple[str, float, Dict[str, float]]:
+        """
+        Aplica las reglas de puntuación a las coincidencias de un texto
         
         Args:
-            text (str): Texto a clasificar
+            hits (Dict[str, bool]): Palabras clave presentes y si aparecen como palabra completa
             
         Returns:
             Tuple[str, float, Dict[str, float]]: (tipo_servicio, confianza, scores_todos)
         """
-        if not text or not text.strip():
-            return "No clasificable", 0.0, {}
-        
-        # Normalizar texto
-        text_lower = text.lower()
-        
         # Calcular scores para cada tipo de servicio
         scores = {}
         for service_type, keywords in self.keywords.items():
             score = 0
             for keyword, weight in keywords.items():
-                # Buscar coincidencias exactas y parciales
-                if keyword in text_lower:
-                    score += weight
-                # Buscar coincidencias con regex para palabras completas
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                if re.search(pattern, text_lower):
+                bounded = hits.get(keyword)
+                if bounded is None:
+                    continue
+                # Coincidencia exacta o parcial
+                score += weight
+                if bounded:
                     score += weight * 0.5  # Bonus por coincidencia exacta de palabra
             
             scores[service_type] = score
@@ -152,11 +358,390 @@ class CloudServiceClassifier:
         best_type = max(scores, key=scores.get)
         best_score = scores[best_type]
         
-        # Calcular confianza (normalizada)
-        total_possible = sum(max(weights.values()) for weights in self.keywords.values())
-        confidence = min(best_score / total_possible, 1.0)
+        # Calcular confianza (normalizada con el denominador precalculado)
+        confidence = min(best_score / self.total_possible, 1.0)
         
         return best_type, confidence, scores
+
+    def to_bytes(self) -> bytes:
+        """Serializa el modelo en formato binario compacto"""
+        state = {
+            'version': MODEL_FORMAT_VERSION,
+            'normalization': NORMALIZATION_VERSION,
+            'keywords': self.keywords,
+            'matcher': self.matcher.to_state(),
+            'total_possible': self.total_possible,
+            'fingerprint': self.fingerprint
+        }
+        return MODEL_MAGIC + marshal.dumps(state)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'CompiledKeywordModel':
+        """Reconstruye un modelo serializado con to_bytes"""
+        if data[:len(MODEL_MAGIC)] != MODEL_MAGIC:
+            raise ValueError("El archivo no es un modelo compilado del clasificador")
+        try:
+            state = marshal.loads(data[len(MODEL_MAGIC):])
+        except (EOFError, ValueError, TypeError) as e:
+            raise ValueError(f"Modelo compilado dañado: {e}") from e
+        if not isinstance(state, dict) or state.get('version') != MODEL_FORMAT_VERSION:
+            raise ValueError("Versión de modelo compilado no soportada; vuelve a generarlo con --save-model")
+        if state.get('normalization') != NORMALIZATION_VERSION:
+            raise ValueError("El modelo se compiló con otra normalización de textos; vuelve a generarlo con --save-model")
+
+        model = cls.__new__(cls)
+        model.keywords = state['keywords']
+        model.matcher = KeywordMatcher.from_state(state['matcher'])
+        model.total_possible = state['total_possible']
+        model.fingerprint = state['fingerprint']
+        return model
+
+    def save(self, path: str):
+        """Guarda el modelo compilado en un archivo"""
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledKeywordModel':
+        """Carga un modelo compilado desde un archivo"""
+        with open(path, 'rb') as file:
+            return cls.from_bytes(file.read())
+
+
+class MatchResult:
+    """
+    Coincidencias de una pasada de búsqueda sobre un texto: cada palabra clave presente
+    con sus posiciones, su indicador de palabra completa y sus pesos por tipo de servicio
+    
+    Las posiciones se refieren al texto normalizado, que coincide carácter a carácter
+    con el original salvo cuando este trae marcas diacríticas combinables (forma NFD).
+    """
+
+    def __init__(self, model: CompiledKeywordModel, text: str, spans: Dict[str, List[Tuple[int, int, bool]]]):
+        self.model = model
+        self.text = text
+        self.spans = spans
+
+    @property
+    def hits(self) -> Dict[str, bool]:
+        """Palabras clave presentes y si aparecen al menos una vez como palabra completa"""
+        return {keyword: any(bounded for _, _, bounded in occurrences)
+                for keyword, occurrences in self.spans.items()}
+
+    def classify(self) -> Tuple[str, float, Dict[str, float]]:
+        """Clasificación del texto; mismo resultado que classify_text"""
+        if not self.text or not self.text.strip():
+            return "No clasificable", 0.0, {}
+        return self.model.score(self.hits)
+
+    def found_keywords(self) -> Dict[str, List[Tuple[str, float]]]:
+        """Palabras clave encontradas por tipo de servicio, como (palabra, peso)"""
+        return {
+            service_type: [(keyword, weight) for keyword, weight in keywords.items() if keyword in self.spans]
+            for service_type, keywords in self.model.keywords.items()
+        }
+
+    def positions(self) -> Dict[str, List[Tuple[int, int]]]:
+        """Posiciones (inicio, fin) de cada palabra clave, para resaltar sin volver a buscar"""
+        return {keyword: [(start, end) for start, end, _ in occurrences]
+                for keyword, occurrences in self.spans.items()}
+
+
+class CloudServiceClassifier:
+    """
+    Clasificador que determina el tipo de servicio en la nube basado en palabras clave y patrones
+    """
+    
+    def __init__(self, model: Optional[CompiledKeywordModel] = None, engine: str = 'python', linear_model=None):
+        """
+        Args:
+            model (Optional[CompiledKeywordModel]): Modelo compilado a usar; por defecto
+                se compila DEFAULT_KEYWORDS una sola vez para todas las clasificaciones
+            engine (str): Motor de puntuación: 'python' o 'numpy' (solo en classify_batch)
+                con las palabras clave, o 'linear' con el modelo lineal para todo
+            linear_model (Optional[LinearModel]): Modelo lineal entrenado, requerido por 'linear'
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Motor de puntuación no soportado: {engine}")
+        if engine == 'linear' and linear_model is None:
+            raise ValueError("El motor 'linear' requiere un modelo lineal entrenado (ver el subcomando train)")
+        self.model = model if model is not None else CompiledKeywordModel(DEFAULT_KEYWORDS)
+        self.engine = engine
+        self.linear_model = linear_model
+        self._vectorized_scorer = None
+        
+        # Caché de resultados opcional (ver enable_cache)
+        self.cache: Optional[ClassificationCache] = None
+        
+        # Estadísticas de ejecución opcionales (--stats); sin ellas no se mide nada
+        self.stats: Optional[RunStats] = None
+    
+    @property
+    def keywords(self) -> Dict[str, Dict[str, float]]:
+        """Palabras clave y pesos de cada tipo de servicio del modelo vigente"""
+        return self.model.keywords
+    
+    @property
+    def service_types(self) -> List[str]:
+        """Tipos de servicio que puede retornar el motor configurado"""
+        if self.engine == 'linear':
+            return list(self.linear_model.classes)
+        return list(self.model.keywords)
+    
+    @property
+    def keywords_fingerprint(self) -> str:
+        """Huella del diccionario de palabras clave del modelo vigente"""
+        return self.model.fingerprint
+    
+    def set_model(self, model: CompiledKeywordModel):
+        """
+        Reemplaza el modelo de forma atómica
+        
+        Cada clasificación toma el modelo vigente al empezar, así que las que están en
+        curso terminan con el anterior y nunca mezclan dos diccionarios.
+        
+        Args:
+            model (CompiledKeywordModel): Modelo nuevo, ya compilado
+        """
+        self.model = model
+        if self.cache is not None:
+            self.cache.set_fingerprint(model.fingerprint)
+    
+    def set_keywords(self, keywords: Dict[str, Dict[str, float]]):
+        """Compila un diccionario de palabras clave y lo pone en uso (ver set_model)"""
+        # La compilación ocurre antes del reemplazo: nadie espera por ella; se conserva la tolerancia a errores
+        self.set_model(CompiledKeywordModel(keywords, self.model.matcher.fuzzy_distance))
+    
+    def enable_cache(self, path: Optional[str] = None, memory_size: int = DEFAULT_MEMORY_SIZE):
+        """
+        Activa la caché de resultados
+        
+        Args:
+            path (Optional[str]): Archivo SQLite para conservar resultados entre ejecuciones
+            memory_size (int): Entradas máximas del nivel LRU en memoria
+        """
+        self.close_cache()
+        self.cache = ClassificationCache(self.keywords_fingerprint, path, memory_size)
+    
+    def close_cache(self):
+        """Guarda y cierra la caché de resultados, si está activa"""
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+    
+    def classify_text(self, text: str, with_keywords: bool = False) -> Tuple[str, float, Dict[str, float]]:
+        """
+        Clasifica el texto de entrada y retorna el tipo de servicio más probable
+        
+        Args:
+            text (str): Texto a clasificar
+            with_keywords (bool): Agregar al resultado las palabras clave encontradas
+                (ordenadas); estos resultados no pasan por la caché
+            
+        Returns:
+            Tuple[str, float, Dict[str, float]]: (tipo_servicio, confianza, scores_todos),
+            más la lista de palabras clave si se pidió with_keywords
+        """
+        stats = self.stats
+        if stats is not None:
+            stats.count_documents()
+        if self.engine == 'linear':
+            return self._classify_linear(text, with_keywords)
+        if not text or not text.strip():
+            return ("No clasificable", 0.0, {}, []) if with_keywords else ("No clasificable", 0.0, {})
+        
+        # Normalizar texto (minúsculas y sin diacríticos); con --stats se mide cada etapa
+        if stats is None:
+            text_lower, score = fold_text(text), self._score_text
+        else:
+            text_lower, score = self._fold_text_with_stats(text), self._score_text_with_stats
+        model = self.model
+        
+        if self.cache is None or with_keywords:
+            return score(text_lower, model, with_keywords)
+        
+        cache_key = self.cache.make_key(text_lower, model.fingerprint)
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            cached = score(text_lower, model)
+            self.cache.put(cache_key, cached)
+        
+        # Copiar los scores para que el llamador no pueda alterar la entrada en caché
+        service_type, confidence, scores = cached
+        return service_type, confidence, dict(scores)
+    
+    @staticmethod
+    def _score_text(text_lower: str, model: CompiledKeywordModel,
+                    with_keywords: bool = False) -> Tuple[str, float, Dict[str, float]]:
+        """Calcula la clasificación de un texto ya normalizado con el modelo dado (sin pasar por la caché)"""
+        # Buscar todas las palabras clave en una sola pasada
+        hits = model.matcher.find(text_lower)
+        if with_keywords:
+            return (*model.score(hits), sorted(hits))
+        return model.score(hits)
+    
+    def _classify_linear(self, text: str, with_keywords: bool = False) -> Tuple[str, float, Dict[str, float]]:
+        """Clasifica con el modelo lineal, sin caché; no hay palabras clave que reportar"""
+        if self.stats is None:
+            result = self.linear_model.classify(text)
+        else:
+            with self.stats.stage('puntuacion'):
+                result = self.linear_model.classify(text)
+        return (*result, []) if with_keywords else result
+    
+    def _fold_text_with_stats(self, text: str) -> str:
+        """fold_text sumando su tiempo a la etapa de normalización"""
+        start = time.perf_counter()
+        text_lower = fold_text(text)
+        self.stats.add('normalizacion', time.perf_counter() - start)
+        return text_lower
+    
+    def _score_text_with_stats(self, text_lower: str, model: CompiledKeywordModel,
+                               with_keywords: bool = False) -> Tuple[str, float, Dict[str, float]]:
+        """_score_text midiendo búsqueda y puntuación por separado y contando las palabras clave presentes"""
+        stats = self.stats
+        start = time.perf_counter()
+        hits = model.matcher.find(text_lower)
+        matched_at = time.perf_counter()
+        result = model.score(hits)
+        stats.add('busqueda', matched_at - start)
+        stats.add('puntuacion', time.perf_counter() - matched_at)
+        stats.add_hits(hits)
+        if with_keywords:
+            return (*result, sorted(hits))
+        return result
+    
+    def match_text(self, text: str) -> MatchResult:
+        """
+        Busca todas las apariciones de las palabras clave en una sola pasada
+        
+        Args:
+            text (str): Texto a analizar
+            
+        Returns:
+            MatchResult: Coincidencias reutilizables para puntuar, explicar y resaltar
+        """
+        text_lower = fold_text(text) if self.stats is None else self._fold_text_with_stats(text)
+        return self._match_folded(text, text_lower)
+    
+    def _match_folded(self, text: str, text_lower: str) -> MatchResult:
+        """match_text sobre un texto ya normalizado con fold_text"""
+        model = self.model
+        if self.stats is None:
+            return MatchResult(model, text, model.matcher.find_spans(text_lower))
+        
+        start = time.perf_counter()
+        spans = model.matcher.find_spans(text_lower)
+        self.stats.add('busqueda', time.perf_counter() - start)
+        self.stats.add_hits(spans)
+        return MatchResult(model, text, spans)
+    
+    def classify_batch(self, texts: Iterable[str], workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                       with_keywords: bool = False) -> List[Tuple[str, float, Dict[str, float]]]:
+        """
+        Clasifica un lote de textos repartiéndolos entre varios procesos
+        
+        Cada proceso puntúa sus bloques con el motor configurado en `engine`.
+        
+        Args:
+            texts (Iterable[str]): Textos a clasificar
+            workers (Optional[int]): Número de procesos (por defecto, uno por CPU)
+            chunk_size (int): Textos enviados a un proceso en cada tarea
+            with_keywords (bool): Agregar a cada resultado las palabras clave encontradas
+                (ver classify_text); el lote se clasifica sin pasar por la caché
+            
+        Returns:
+            List[Tuple[str, float, Dict[str, float]]]: Resultados de classify_text en el
+            mismo orden que los textos de entrada
+        """
+        texts = list(texts)
+        workers = workers or os.cpu_count() or 1
+        if self.stats is not None:
+            self.stats.count_documents(len(texts))
+        # Todo el lote se clasifica con el mismo modelo aunque se recargue a mitad de camino
+        model = self.model
+        
+        # La caché guarda resultados del modelo de palabras clave (ver result_cache)
+        if self.cache is None or with_keywords or self.engine == 'linear':
+            return self._classify_uncached(texts, workers, chunk_size, model, with_keywords)
+        
+        # Con caché, solo viaja a los procesos una copia de cada texto que no esté guardado
+        results: List[Optional[Tuple[str, float, Dict[str, float]]]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        fold = fold_text if self.stats is None else self._fold_text_with_stats
+        for index, text in enumerate(texts):
+            if not text or not text.strip():
+                results[index] = ("No clasificable", 0.0, {})
+                continue
+            cache_key = self.cache.make_key(fold(text), model.fingerprint)
+            if cache_key in missing:
+                missing[cache_key].append(index)
+                continue
+            cached = self.cache.get(cache_key)
+            if cached is None:
+                missing[cache_key] = [index]
+            else:
+                results[index] = (cached[0], cached[1], dict(cached[2]))
+        
+        pending = list(missing.items())
+        computed = self._classify_uncached([texts[indexes[0]] for _, indexes in pending], workers, chunk_size, model)
+        for (cache_key, indexes), (service_type, confidence, scores) in zip(pending, computed):
+            self.cache.put(cache_key, (service_type, confidence, dict(scores)))
+            for index in indexes:
+                results[index] = (service_type, confidence, dict(scores))
+        return results
+    
+    def _classify_uncached(self, texts: List[str], workers: int, chunk_size: int, model: CompiledKeywordModel,
+                           with_keywords: bool = False) -> List[Tuple[str, float, Dict[str, float]]]:
+        """Reparte los textos entre un pool de procesos conservando el orden de entrada"""
+        # Con un solo proceso (o pocos textos) no vale la pena pagar el arranque del pool
+        if workers == 1 or len(texts) <= chunk_size:
+            return self._classify_chunk(texts, model, with_keywords)
+        
+        # Importación diferida: multiprocessing encarece el arranque de cada invocación del CLI
+        from concurrent.futures import ProcessPoolExecutor
+        from shared_model import SharedModel
+        
+        # Los modelos se publican una vez en un archivo mapeado en memoria; cada proceso recibe solo su ubicación
+        with SharedModel(model, self.linear_model) as shared, \
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                    initargs=(shared.worker_classifier(self), shared.handle)) as executor:
+            # map conserva el orden de entrada aunque los bloques terminen desordenados
+            chunks = (texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size))
+            results: List[Tuple[str, float, Dict[str, float]]] = []
+            classify_chunk = partial(_classify_chunk_in_worker, with_keywords=with_keywords)
+            for chunk_results, chunk_stats in executor.map(classify_chunk, chunks):
+                results.extend(chunk_results)
+                if chunk_stats is not None:
+                    self.stats.merge(chunk_stats)
+            return results
+    
+    def _classify_chunk(self, texts: List[str], model: Optional[CompiledKeywordModel] = None,
+                        with_keywords: bool = False) -> List[Tuple[str, float, Dict[str, float]]]:
+        """Clasifica un bloque de textos en este proceso con el motor configurado (sin caché)"""
+        model = model or self.model
+        if self.engine == 'linear':
+            return [self._classify_linear(text, with_keywords) for text in texts]
+        if self.engine == 'numpy':
+            return self._get_vectorized_scorer(model).classify(texts, self.stats, with_keywords)
+        if self.stats is None:
+            fold, score = fold_text, self._score_text
+        else:
+            fold, score = self._fold_text_with_stats, self._score_text_with_stats
+        if with_keywords:
+            return [score(fold(text), model, True) if text and text.strip() else ("No clasificable", 0.0, {}, [])
+                    for text in texts]
+        return [score(fold(text), model) if text and text.strip() else ("No clasificable", 0.0, {})
+                for text in texts]
+    
+    def _get_vectorized_scorer(self, model: CompiledKeywordModel):
+        """Construye (una vez por modelo) el motor de puntuación NumPy"""
+        scorer = self._vectorized_scorer
+        if scorer is None or scorer.model is not model:
+            # Importación diferida: NumPy es una dependencia opcional
+            from numpy_engine import VectorizedScorer
+            scorer = self._vectorized_scorer = VectorizedScorer(model)
+        return scorer
     
     def get_detailed_analysis(self, text: str) -> Dict:
         """
@@ -168,20 +753,47 @@ class CloudServiceClassifier:
         Returns:
             Dict: Análisis detallado con clasificación y explicación
         """
-        service_type, confidence, scores = self.classify_text(text)
-        
-        # Encontrar palabras clave encontradas
-        found_keywords = {}
-        text_lower = text.lower()
+        if self.engine == 'linear':
+            # El modelo lineal no localiza palabras clave: solo hay clase y probabilidades
+            service_type, confidence, scores = self.classify_text(text)
+            if service_type == "No clasificable":
+                explanation = "El texto está vacío; no hay nada que clasificar."
+            else:
+                explanation = (f"El modelo lineal clasificó el texto como {service_type} "
+                               f"con una probabilidad del {confidence:.1%}.")
+            return {
+                'texto_original': text,
+                'tipo_servicio': service_type,
+                'confianza': confidence,
+                'scores_completos': scores,
+                'palabras_clave_encontradas': {},
+                'posiciones_palabras_clave': {},
+                'explicacion': explanation
+            }
         
-        for service_type_name, keywords in self.keywords.items():
-            found_keywords[service_type_name] = []
-            for keyword, weight in keywords.items():
-                if keyword in text_lower:
-                    found_keywords[service_type_name].append((keyword, weight))
+        if self.stats is not None:
+            self.stats.count_documents()
         
-        # Generar explicación
-        explanation = self._generate_explanation(service_type, found_keywords, confidence)
+        # Una sola pasada alimenta scores, confianza, palabras clave y explicación
+        text_lower = fold_text(text) if self.stats is None else self._fold_text_with_stats(text)
+        match = self._match_folded(text, text_lower)
+        with measure(self.stats, 'puntuacion'):
+            if self.cache is None or not text.strip():
+                service_type, confidence, scores = match.classify()
+            else:
+                # La clasificación pasa por la caché con la misma clave que classify_text;
+                # solo las palabras clave y sus posiciones se calculan siempre
+                cache_key = self.cache.make_key(text_lower, self.model.fingerprint)
+                cached = self.cache.get(cache_key)
+                if cached is None:
+                    cached = match.classify()
+                    self.cache.put(cache_key, cached)
+                service_type, confidence, scores = cached
+                scores = dict(scores)
+            found_keywords = match.found_keywords()
+            
+            # Generar explicación
+            explanation = self._generate_explanation(service_type, found_keywords, confidence)
         
         return {
             'texto_original': text,
@@ -189,9 +801,68 @@ class CloudServiceClassifier:
             'confianza': confidence,
             'scores_completos': scores,
             'palabras_clave_encontradas': found_keywords,
+            'posiciones_palabras_clave': match.positions(),
             'explicacion': explanation
         }
     
+    def classify_segments(self, text: str, mode: str = 'paragraph', window_words: int = DEFAULT_WINDOW_WORDS,
+                          stride_words: int = DEFAULT_STRIDE_WORDS) -> Dict:
+        """
+        Clasifica un documento largo por segmentos (párrafos o ventanas de palabras) y completo
+        
+        Las palabras clave se buscan una sola vez en todo el documento; cada segmento se
+        puntúa con las apariciones que caen dentro de él (ver segments.SegmentScorer).
+        Siempre usa el modelo de palabras clave, sin caché.
+        
+        Args:
+            text (str): Documento a clasificar
+            mode (str): 'paragraph' (separados por líneas en blanco) o 'window' (ventanas de palabras)
+            window_words (int): Palabras por ventana en el modo 'window'
+            stride_words (int): Palabras que avanza cada ventana en el modo 'window'
+            
+        Returns:
+            Dict: 'documento' (clasificación del texto completo y segmentos por tipo) y
+            'segmentos' (inicio, fin, tipo_servicio, confianza y scores de cada uno). Las
+            posiciones se refieren al texto normalizado, como en match_text.
+        """
+        if mode not in SEGMENT_MODES:
+            raise ValueError(f"Modo de segmentación no soportado: {mode}")
+        
+        model = self.model
+        if self.stats is not None:
+            self.stats.count_documents()
+            text_lower = self._fold_text_with_stats(text)
+        else:
+            text_lower = fold_text(text)
+        
+        with measure(self.stats, 'busqueda'):
+            scorer = SegmentScorer(model, text_lower)
+        if mode == 'paragraph':
+            bounds = paragraph_bounds(text_lower)
+        else:
+            bounds = window_bounds(text_lower, window_words, stride_words)
+        
+        with measure(self.stats, 'puntuacion'):
+            segments = [
+                {'inicio': start, 'fin': end, 'tipo_servicio': service_type, 'confianza': confidence, 'scores': scores}
+                for (start, end), (service_type, confidence, scores) in zip(bounds, scorer.score_segments(bounds))
+            ]
+            if text_lower.strip():
+                service_type, confidence, scores = scorer.score_document()
+            else:
+                service_type, confidence, scores = "No clasificable", 0.0, {}
+            counts = Counter(segment['tipo_servicio'] for segment in segments)
+        
+        return {
+            'documento': {
+                'tipo_servicio': service_type,
+                'confianza': confidence,
+                'scores': scores,
+                'segmentos_por_tipo': dict(counts.most_common())
+            },
+            'segmentos': segments
+        }
+    
     def _generate_explanation(self, service_type: str, found_keywords: Dict, confidence: float) -> str:
         """Genera una explicación de la clasificación"""
         if service_type == "No clasificable":
@@ -212,32 +883,73 @@ class CloudServiceClassifier:
         
         return explanation
 
+# Clasificador de cada proceso del pool, recibido una sola vez al iniciar el proceso
+_worker_classifier: Optional[CloudServiceClassifier] = None
+
+def _init_batch_worker(classifier: CloudServiceClassifier, handle: Tuple[str, int, int]):
+    """Inicializa un proceso del pool con su copia del clasificador y los modelos del archivo compartido"""
+    global _worker_classifier
+    from shared_model import attach_worker_classifier
+    _worker_classifier = attach_worker_classifier(classifier, handle)
+
+def _classify_chunk_in_worker(texts: List[str],
+                              with_keywords: bool = False) -> Tuple[List[Tuple[str, float, Dict[str, float]]], Optional[RunStats]]:
+    """Clasifica un bloque de textos dentro de un proceso del pool; retorna (resultados, estadísticas del bloque)"""
+    if _worker_classifier.stats is None:
+        return _worker_classifier._classify_chunk(texts, with_keywords=with_keywords), None
+    _worker_classifier.stats = RunStats()
+    return _worker_classifier._classify_chunk(texts, with_keywords=with_keywords), _worker_classifier.stats
+
 def print_classification_result(text: str, classifier: CloudServiceClassifier, verbose: bool = False):
     """Imprime el resultado de la clasificación con formato"""
-    print(f"\n{'='*60}")
-    print(f"TEXTO: {text}")
-    print(f"{'='*60}")
-    
-    if verbose:
-        # Análisis detallado
-        analysis = classifier.get_detailed_analysis(text)
-        print(f"TIPO DE SERVICIO: {analysis['tipo_servicio']}")
-        print(f"CONFIANZA: {analysis['confianza']:.1%}")
-        print(f"EXPLICACIÓN: {analysis['explicacion']}")
-        
-        print(f"\nSCORES POR TIPO:")
-        for service, score in analysis['scores_completos'].items():
-            print(f"  {service}: {score}")
-        
-        print(f"\nPALABRAS CLAVE ENCONTRADAS:")
-        for service, keywords in analysis['palabras_clave_encontradas'].items():
-            if keywords:
-                print(f"  {service}: {', '.join([kw[0] for kw in keywords])}")
-    else:
-        # Clasificación simple
-        service_type, confidence, scores = classifier.classify_text(text)
-        print(f"TIPO DE SERVICIO: {service_type}")
-        print(f"CONFIANZA: {confidence:.1%}")
+    # La clasificación se mide en sus propias etapas; el resto del bloque es salida
+    with measure(classifier.stats, 'salida'):
+        print(f"\n{'='*60}")
+        print(f"TEXTO: {text}")
+        print(f"{'='*60}")
+        
+        if verbose:
+            # Análisis detallado
+            analysis = classifier.get_detailed_analysis(text)
+            print(f"TIPO DE SERVICIO: {analysis['tipo_servicio']}")
+            print(f"CONFIANZA: {analysis['confianza']:.1%}")
+            print(f"EXPLICACIÓN: {analysis['explicacion']}")
+            
+            print(f"\nSCORES POR TIPO:")
+            for service, score in analysis['scores_completos'].items():
+                print(f"  {service}: {score}")
+            
+            print(f"\nPALABRAS CLAVE ENCONTRADAS:")
+            for service, keywords in analysis['palabras_clave_encontradas'].items():
+                if keywords:
+                    print(f"  {service}: {', '.join([kw[0] for kw in keywords])}")
+        else:
+            # Clasificación simple
+            service_type, confidence, scores = classifier.classify_text(text)
+            print(f"TIPO DE SERVICIO: {service_type}")
+            print(f"CONFIANZA: {confidence:.1%}")
+
+def print_segments_result(text: str, classifier: CloudServiceClassifier, mode: str = 'paragraph',
+                          window_words: int = DEFAULT_WINDOW_WORDS, stride_words: int = DEFAULT_STRIDE_WORDS):
+    """Imprime la clasificación por segmentos de un documento y su resumen"""
+    analysis = classifier.classify_segments(text, mode, window_words, stride_words)
+    with measure(classifier.stats, 'salida'):
+        document = analysis['documento']
+        print(f"\n{'='*60}")
+        print(f"DOCUMENTO: {len(analysis['segmentos'])} segmentos ({mode})")
+        print(f"{'='*60}")
+        print(f"TIPO DE SERVICIO: {document['tipo_servicio']}")
+        print(f"CONFIANZA: {document['confianza']:.1%}")
+        print("SEGMENTOS POR TIPO: " + ', '.join(f"{service} ({count})"
+                                                  for service, count in document['segmentos_por_tipo'].items()))
+        
+        print(f"\nSEGMENTOS:")
+        for number, segment in enumerate(analysis['segmentos'], 1):
+            snippet = ' '.join(text[segment['inicio']:segment['fin']].split())
+            if len(snippet) > SEGMENT_SNIPPET_LENGTH:
+                snippet = snippet[:SEGMENT_SNIPPET_LENGTH - 3] + '...'
+            print(f"  {number:>3}. [{segment['inicio']}-{segment['fin']}] {segment['tipo_servicio']:<16}"
+                  f"{segment['confianza']:>6.1%}  {snippet}")
 
 def run_examples(classifier: CloudServiceClassifier, verbose: bool = False):
     """Ejecuta ejemplos predefinidos"""
@@ -302,17 +1014,564 @@ def read_file_content(file_path: str) -> str:
         print(f"Error al leer el archivo '{file_path}': {e}")
         sys.exit(1)
 
-def main():
-    """Función principal con soporte para argumentos de línea de comandos"""
+def load_model_file(model_path: str) -> CompiledKeywordModel:
+    """Carga un modelo compilado guardado con --save-model"""
+    try:
+        return CompiledKeywordModel.load(model_path)
+    except FileNotFoundError:
+        print(f"Error: El modelo '{model_path}' no fue encontrado.")
+        sys.exit(1)
+    except PermissionError:
+        print(f"Error: No tienes permisos para leer el modelo '{model_path}'.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error al cargar el modelo '{model_path}': {e}")
+        sys.exit(1)
+
+def load_linear_model_file(model_path: str):
+    """Carga un modelo lineal entrenado con el subcomando train"""
+    # Importación diferida: el motor lineal solo se carga si se pide
+    from linear_model import LinearModel
+    
+    try:
+        return LinearModel.load(model_path)
+    except FileNotFoundError:
+        print(f"Error: El modelo lineal '{model_path}' no fue encontrado.")
+        sys.exit(1)
+    except PermissionError:
+        print(f"Error: No tienes permisos para leer el modelo lineal '{model_path}'.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error al cargar el modelo lineal '{model_path}': {e}")
+        sys.exit(1)
+
+def load_keywords_dictionary(keywords_path: str) -> Tuple[Dict[str, Dict[str, float]], str]:
+    """Carga un diccionario de palabras clave JSON o YAML; retorna (diccionario, hash del contenido)"""
+    # Importación diferida: el diccionario externo (y PyYAML) solo se cargan si se piden
+    from keyword_dictionary import load_keywords_file
+    
+    try:
+        return load_keywords_file(keywords_path)
+    except FileNotFoundError:
+        print(f"Error: El diccionario '{keywords_path}' no fue encontrado.")
+        sys.exit(1)
+    except PermissionError:
+        print(f"Error: No tienes permisos para leer el diccionario '{keywords_path}'.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error al cargar el diccionario '{keywords_path}': {e}")
+        sys.exit(1)
+
+def read_batch_records(file_path: str) -> List[str]:
+    """Lee un archivo de lote: cada línea es un documento independiente"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return [line.rstrip('\n') for line in file]
+    except FileNotFoundError:
+        print(f"Error: El archivo '{file_path}' no fue encontrado.")
+        sys.exit(1)
+    except PermissionError:
+        print(f"Error: No tienes permisos para leer el archivo '{file_path}'.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Error al leer el archivo '{file_path}': {e}")
+        sys.exit(1)
+
+def write_results(results: Iterable[Tuple], classifier: CloudServiceClassifier, output_format: str = 'jsonl',
+                  include_scores: bool = True, include_keywords: bool = False, id_field: str = 'id'):
+    """
+    Escribe en stdout un registro compacto por resultado con el escritor del formato pedido
+    
+    Args:
+        results (Iterable[Tuple]): Pares (identificador, resultado de classify_text)
+        classifier (CloudServiceClassifier): Clasificador que produjo los resultados
+        output_format (str): Formato de salida: 'jsonl', 'csv' o 'tsv'
+        include_scores (bool): Incluir el score de cada tipo de servicio
+        include_keywords (bool): Incluir las palabras clave encontradas (los resultados deben traerlas)
+        id_field (str): Nombre del identificador de cada registro
+    """
+    try:
+        with create_writer(output_format, sys.stdout, classifier.service_types, id_field=id_field,
+                           include_scores=include_scores, include_keywords=include_keywords) as writer:
+            write = writer.write if classifier.stats is None else classifier.stats.timed_call(writer.write, 'salida')
+            for record_id, result in results:
+                write(record_id, *result)
+    except BrokenPipeError:
+        # El consumidor cerró la tubería (p. ej. `| head`): terminar sin error
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+def write_report(report, classifier: CloudServiceClassifier, report_format: str = 'text'):
+    """Escribe en stdout el reporte agregado de --report"""
+    with measure(classifier.stats, 'salida'):
+        report.write(report_format)
+
+def run_batch(file_path: str, classifier: CloudServiceClassifier, workers: Optional[int] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE, output_format: str = 'jsonl',
+              include_scores: bool = True, include_keywords: bool = False):
+    """Clasifica cada línea de un archivo y escribe un resultado compacto por documento en stdout"""
+    with measure(classifier.stats, 'lectura'):
+        records = read_batch_records(file_path)
+    results = classifier.classify_batch(records, workers=workers, chunk_size=chunk_size, with_keywords=include_keywords)
+    write_results(enumerate(results, 1), classifier, output_format, include_scores, include_keywords)
+
+def iter_stream_texts(stream: TextIO, input_format: str = 'text', text_field: str = 'text') -> Iterator[Tuple[int, str]]:
+    """
+    Lee documentos de un flujo de forma perezosa, una línea a la vez
+    
+    Args:
+        stream (TextIO): Flujo de entrada (normalmente stdin)
+        input_format (str): 'text' (una línea por documento) o 'jsonl' (un objeto JSON por línea)
+        text_field (str): Campo con el texto a clasificar en los registros JSONL
+        
+    Yields:
+        Tuple[int, str]: (número de línea, texto)
+    """
+    for line_number, line in enumerate(stream, 1):
+        line = line.rstrip('\n')
+        if input_format == 'text':
+            yield line_number, line
+            continue
+        
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"Advertencia: línea {line_number} no es JSON válido ({e}); se omite.", file=sys.stderr)
+            continue
+        text = record.get(text_field) if isinstance(record, dict) else None
+        if not isinstance(text, str):
+            print(f"Advertencia: línea {line_number} no tiene el campo de texto '{text_field}'; se omite.",
+                  file=sys.stderr)
+            continue
+        yield line_number, text
+
+def run_stream(classifier: CloudServiceClassifier, input_format: str = 'text', text_field: str = 'text',
+               output_format: str = 'jsonl', include_scores: bool = True, include_keywords: bool = False,
+               report_format: Optional[str] = None):
+    """
+    Clasifica stdin de forma incremental y escribe un resultado compacto por documento en stdout
+    
+    Con report_format ('text' o 'json') escribe en su lugar el reporte agregado al terminar la entrada.
+    """
+    stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8', errors='replace')
+    records = iter_stream_texts(stdin, input_format, text_field)
+    if classifier.stats is not None:
+        records = classifier.stats.timed(records, 'lectura')
+    if report_format:
+        report = CorpusReport(classifier.service_types, classifier.keywords)
+        for _, text in records:
+            report.add(*classifier.classify_text(text, with_keywords=True))
+        write_report(report, classifier, report_format)
+        return
+    results = ((line_number, classifier.classify_text(text, include_keywords)) for line_number, text in records)
+    write_results(results, classifier, output_format, include_scores, include_keywords)
+
+def run_follow(file_path: str, classifier: CloudServiceClassifier, state_path: Optional[str] = None,
+               poll_interval: Optional[float] = None, output_format: str = 'jsonl',
+               include_scores: bool = True, include_keywords: bool = False):
+    """
+    Sigue un archivo de log que crece y escribe un resultado por línea nueva en stdout
+    
+    El identificador de cada registro es la posición en bytes de la línea. La posición
+    se guarda en el archivo de estado después de escribir cada bloque de resultados, así
+    que al reiniciar se continúa sin reclasificar lo ya escrito. Termina con Ctrl+C.
+    """
+    # Importación diferida: el seguimiento de archivos solo se necesita con --follow
+    from follow import DEFAULT_POLL_INTERVAL, FileFollower
+    
+    follower = FileFollower(file_path, state_path)
+    read_lines = follower.read_lines
+    if classifier.stats is not None:
+        read_lines = classifier.stats.timed_call(follower.read_lines, 'lectura')
+    try:
+        with create_writer(output_format, sys.stdout, classifier.service_types, id_field='posicion',
+                           include_scores=include_scores, include_keywords=include_keywords) as writer:
+            writer.flush()
+            while True:
+                lines = read_lines()
+                if not lines:
+                    time.sleep(poll_interval or DEFAULT_POLL_INTERVAL)
+                    continue
+                # El mismo clasificador para toda la vida del proceso: un bloque por lectura
+                results = classifier.classify_batch([text for _, text in lines], workers=1,
+                                                    with_keywords=include_keywords)
+                with measure(classifier.stats, 'salida'):
+                    for (offset, _), result in zip(lines, results):
+                        writer.write(offset, *result)
+                    writer.flush()
+                follower.checkpoint()
+    except BrokenPipeError:
+        # El consumidor cerró la tubería: terminar sin error (la posición queda en el último bloque escrito)
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        follower.close()
+
+def run_corpus(file_path: str, classifier: CloudServiceClassifier, workers: Optional[int] = None,
+               range_size: Optional[int] = None, output_format: str = 'jsonl',
+               include_scores: bool = True, include_keywords: bool = False, report_format: Optional[str] = None):
+    """
+    Clasifica un corpus muy grande mapeado en memoria y escribe un resultado por línea en stdout
+    
+    Con report_format ('text' o 'json') escribe en su lugar el reporte agregado del corpus.
+    """
+    # Importación diferida: mmap y el pool de procesos solo se necesitan en modo corpus
+    from corpus import DEFAULT_RANGE_SIZE, classify_corpus, summarize_corpus
+    
+    try:
+        if report_format:
+            report = summarize_corpus(classifier, file_path, workers, range_size or DEFAULT_RANGE_SIZE)
+            write_report(report, classifier, report_format)
+            return
+        results = classify_corpus(classifier, file_path, workers, range_size or DEFAULT_RANGE_SIZE, include_keywords)
+        write_results(results, classifier, output_format, include_scores, include_keywords)
+    except FileNotFoundError:
+        print(f"Error: El archivo '{file_path}' no fue encontrado.")
+        sys.exit(1)
+    except PermissionError:
+        print(f"Error: No tienes permisos para leer el archivo '{file_path}'.")
+        sys.exit(1)
+
+def run_directory(root: str, classifier: CloudServiceClassifier, workers: Optional[int] = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE, read_threads: Optional[int] = None,
+                  pattern: str = '*', output_format: str = 'jsonl',
+                  include_scores: bool = True, include_keywords: bool = False, report_format: Optional[str] = None):
+    """
+    Clasifica cada archivo de un árbol de directorios y escribe un resultado por archivo en stdout
+    
+    Con report_format ('text' o 'json') escribe en su lugar el reporte agregado del árbol.
+    """
+    # Importación diferida: los pools de hilos y procesos solo se necesitan en modo directorio
+    from directory import DEFAULT_READ_THREADS, classify_directory, summarize_directory
+    
+    if not os.path.isdir(root):
+        print(f"Error: El directorio '{root}' no fue encontrado.")
+        sys.exit(1)
+    
+    if report_format:
+        report = summarize_directory(classifier, root, workers, chunk_size, read_threads or DEFAULT_READ_THREADS,
+                                     pattern)
+        write_report(report, classifier, report_format)
+        return
+    results = classify_directory(classifier, root, workers, chunk_size, read_threads or DEFAULT_READ_THREADS,
+                                 pattern, include_keywords)
+    write_results(results, classifier, output_format, include_scores, include_keywords, id_field='ruta')
+
+def report_profile(profiler, dump_path: str = ''):
+    """Imprime en stderr las funciones con más tiempo acumulado y, si se pide, guarda el volcado pstats"""
+    import pstats
+    
+    print(f"\n{'='*60}", file=sys.stderr)
+    print("PERFIL (cProfile, tiempo acumulado)", file=sys.stderr)
+    print(f"{'='*60}", file=sys.stderr)
+    pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+    if dump_path:
+        try:
+            profiler.dump_stats(dump_path)
+        except OSError as e:
+            print(f"Error al guardar el perfil en '{dump_path}': {e}", file=sys.stderr)
+            return
+        print(f"Perfil guardado en '{dump_path}' (ábrelo con python -m pstats o snakeviz).", file=sys.stderr)
+
+def read_labeled_csv(file_path: str, text_field: str = 'text', label_field: str = 'label') -> Tuple[List[str], List[str]]:
+    """Lee un CSV etiquetado con encabezado; retorna (textos, etiquetas) omitiendo filas sin etiqueta"""
+    import csv
+    
+    try:
+        with open(file_path, 'r', encoding='utf-8', newline='') as file:
+            reader = csv.DictReader(file)
+            missing = [field for field in (text_field, label_field) if field not in (reader.fieldnames or [])]
+            if missing:
+                print(f"Error: El archivo '{file_path}' no tiene las columnas {', '.join(missing)}.")
+                sys.exit(1)
+            rows = [(row[text_field] or '', row[label_field].strip()) for row in reader if (row[label_field] or '').strip()]
+    except FileNotFoundError:
+        print(f"Error: El archivo '{file_path}' no fue encontrado.")
+        sys.exit(1)
+    except PermissionError:
+        print(f"Error: No tienes permisos para leer el archivo '{file_path}'.")
+        sys.exit(1)
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        print(f"Error al leer el archivo '{file_path}': {e}")
+        sys.exit(1)
+    return [text for text, _ in rows], [label for _, label in rows]
+
+def split_labeled(texts: List[str], labels: List[str], test_split: float,
+                  seed: int) -> Tuple[List[str], List[str], List[str], List[str]]:
+    """
+    Partición reproducible de un corpus etiquetado en entrenamiento y evaluación
+    
+    Returns:
+        Tuple[List[str], List[str], List[str], List[str]]: (textos y etiquetas de entrenamiento,
+        textos y etiquetas de evaluación); sin documentos reservados, la evaluación usa los de entrenamiento
+    """
+    import random
+    
+    order = list(range(len(texts)))
+    random.Random(seed).shuffle(order)
+    test_size = int(len(order) * test_split)
+    test, train = order[:test_size], order[test_size:]
+    train_texts, train_labels = [texts[i] for i in train], [labels[i] for i in train]
+    if not test:
+        return train_texts, train_labels, train_texts, train_labels
+    return train_texts, train_labels, [texts[i] for i in test], [labels[i] for i in test]
+
+def run_train(argv: List[str]):
+    """
+    Subcomando train: entrena el motor lineal con un CSV etiquetado, compara su
+    exactitud y rendimiento con el motor de palabras clave y guarda el modelo
+    """
+    # Importación diferida: el motor lineal solo se carga si se pide
+    from linear_model import (DEFAULT_EPOCHS, DEFAULT_HASH_BITS, DEFAULT_LEARNING_RATE, DEFAULT_NGRAM,
+                              LinearModel, evaluate)
+    
+    parser = argparse.ArgumentParser(
+        prog=f'{os.path.basename(__file__)} train',
+        description='Entrena el motor lineal (n-gramas con hash) a partir de un CSV etiquetado'
+    )
+    parser.add_argument('data', metavar='CSV', help='CSV con encabezado, una columna de texto y una de etiqueta')
+    parser.add_argument('-o', '--output', required=True, metavar='PATH', help='Archivo donde guardar el modelo lineal')
+    parser.add_argument('--text-field', default='text', help="Columna con el texto (por defecto: 'text')")
+    parser.add_argument('--label-field', default='label', help="Columna con el tipo de servicio (por defecto: 'label')")
+    parser.add_argument('--hash-bits', type=int, default=DEFAULT_HASH_BITS,
+                        help=f'Bits del espacio de hash de los n-gramas (por defecto: {DEFAULT_HASH_BITS})')
+    parser.add_argument('--ngram', type=int, default=DEFAULT_NGRAM,
+                        help=f'Longitud máxima de los n-gramas de palabras (por defecto: {DEFAULT_NGRAM})')
+    parser.add_argument('--epochs', type=int, default=DEFAULT_EPOCHS,
+                        help=f'Pasadas sobre los datos de entrenamiento (por defecto: {DEFAULT_EPOCHS})')
+    parser.add_argument('--learning-rate', type=float, default=DEFAULT_LEARNING_RATE,
+                        help=f'Tasa de aprendizaje inicial (por defecto: {DEFAULT_LEARNING_RATE})')
+    parser.add_argument('--test-split', type=float, default=0.2,
+                        help='Fracción de los datos reservada para evaluar (por defecto: 0.2)')
+    parser.add_argument('--seed', type=int, default=42, help='Semilla del barajado (por defecto: 42)')
+    args = parser.parse_args(argv)
+    
+    if not 1 <= args.hash_bits <= 24:
+        parser.error('--hash-bits debe estar entre 1 y 24')
+    if args.ngram < 1 or args.epochs < 1:
+        parser.error('--ngram y --epochs deben ser al menos 1')
+    if not 0 <= args.test_split < 1:
+        parser.error('--test-split debe estar en [0, 1)')
+    
+    texts, labels = read_labeled_csv(args.data, args.text_field, args.label_field)
+    if not texts:
+        print(f"Error: El archivo '{args.data}' no tiene filas etiquetadas.")
+        sys.exit(1)
+    
+    # Partición reproducible entre entrenamiento y evaluación
+    train_texts, train_labels, test_texts, test_labels = split_labeled(texts, labels, args.test_split, args.seed)
+    
+    # Los tipos conocidos conservan el orden del diccionario integrado (columnas de salida estables)
+    label_set = set(train_labels)
+    classes = [label for label in DEFAULT_KEYWORDS if label in label_set] + sorted(label_set - set(DEFAULT_KEYWORDS))
+    model = LinearModel(classes, args.hash_bits, args.ngram)
+    start = time.perf_counter()
+    model.fit(train_texts, train_labels, args.epochs, args.learning_rate, args.seed)
+    training_time = time.perf_counter() - start
+    
+    keyword_classifier = CloudServiceClassifier()
+    engines = [
+        ('palabras clave', evaluate(lambda batch: keyword_classifier.classify_batch(batch, workers=1),
+                                    test_texts, test_labels)),
+        ('lineal', evaluate(lambda batch: [model.classify(text) for text in batch], test_texts, test_labels)),
+    ]
+    
+    try:
+        model.save(args.output)
+    except OSError as e:
+        print(f"Error al guardar el modelo lineal en '{args.output}': {e}")
+        sys.exit(1)
+    
+    print(f"Entrenamiento: {len(train_texts):,} documentos en {training_time:.2f} s ({', '.join(classes)})")
+    evaluation = (f"{len(test_texts):,} documentos reservados" if test_texts is not train_texts
+                  else "los mismos documentos de entrenamiento")
+    print(f"Evaluación sobre {evaluation}:")
+    print(f"  {'MOTOR':<16}{'EXACTITUD':>10}{'DOCS/SEG':>12}")
+    for name, (accuracy, docs_per_second) in engines:
+        print(f"  {name:<16}{accuracy:>10.1%}{docs_per_second:>12,.0f}")
+    print(f"Modelo lineal guardado en '{args.output}' ({os.path.getsize(args.output) / 1024:,.0f} KiB).")
+
+def run_tune(argv: List[str]):
+    """
+    Subcomando tune: ajusta los pesos del diccionario de palabras clave con un CSV
+    etiquetado y guarda el mejor diccionario en un archivo que acepta --keywords
+    """
+    # Importación diferida: NumPy y el ajuste solo se cargan si se piden
+    from numpy_engine import NUMPY_AVAILABLE, np
+
+    parser = argparse.ArgumentParser(
+        prog=f'{os.path.basename(__file__)} tune',
+        description='Ajusta los pesos del diccionario de palabras clave a partir de un CSV etiquetado'
+    )
+    parser.add_argument('data', metavar='CSV', help='CSV con encabezado, una columna de texto y una de etiqueta')
+    parser.add_argument('-o', '--output', required=True, metavar='PATH',
+                        help='Archivo JSON o YAML donde guardar el mejor diccionario (se usa con --keywords)')
+    parser.add_argument('-k', '--keywords', metavar='PATH',
+                        help='Diccionario inicial JSON o YAML (por defecto: el integrado)')
+    parser.add_argument('--text-field', default='text', help="Columna con el texto (por defecto: 'text')")
+    parser.add_argument('--label-field', default='label', help="Columna con el tipo de servicio (por defecto: 'label')")
+    parser.add_argument('--strategy', choices=('coordinate', 'random', 'grid'), default='coordinate',
+                        help='Búsqueda: coordinate (mejor cambio de un peso por ronda), random (variantes '
+                             'aleatorias) o grid (factores por tipo de servicio) (por defecto: coordinate)')
+    parser.add_argument('--rounds', type=int, default=None,
+                        help='Rondas máximas de --strategy coordinate (por defecto: 50)')
+    parser.add_argument('--samples', type=int, default=None,
+                        help='Configuraciones que prueba --strategy random (por defecto: 500)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Procesos que evalúan configuraciones (por defecto: uno por CPU)')
+    parser.add_argument('--test-split', type=float, default=0.2,
+                        help='Fracción de los datos reservada para evaluar (por defecto: 0.2)')
+    parser.add_argument('--seed', type=int, default=42, help='Semilla del barajado y de la búsqueda (por defecto: 42)')
+    parser.add_argument('--top', type=int, default=10, help='Configuraciones a listar (por defecto: 10)')
+    parser.add_argument('--results', metavar='PATH',
+                        help='CSV donde guardar la exactitud de cada configuración probada')
+    args = parser.parse_args(argv)
+
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers debe ser al menos 1')
+    if (args.rounds is not None and args.rounds < 1) or (args.samples is not None and args.samples < 1):
+        parser.error('--rounds y --samples deben ser al menos 1')
+    if args.rounds is not None and args.strategy != 'coordinate':
+        parser.error('--rounds solo se usa con --strategy coordinate')
+    if args.samples is not None and args.strategy != 'random':
+        parser.error('--samples solo se usa con --strategy random')
+    if args.top < 0:
+        parser.error('--top no puede ser negativo')
+    if not 0 <= args.test_split < 1:
+        parser.error('--test-split debe estar en [0, 1)')
+    if not NUMPY_AVAILABLE:
+        parser.error('tune requiere NumPy (pip install numpy)')
+    from keyword_dictionary import save_keywords_file
+    from tuning import DEFAULT_ROUNDS, DEFAULT_SAMPLES, HitMatrix, WeightTuner
+
+    keywords = load_keywords_dictionary(args.keywords)[0] if args.keywords else DEFAULT_KEYWORDS
+    texts, labels = read_labeled_csv(args.data, args.text_field, args.label_field)
+    if not texts:
+        print(f"Error: El archivo '{args.data}' no tiene filas etiquetadas.")
+        sys.exit(1)
+    train_texts, train_labels, test_texts, test_labels = split_labeled(texts, labels, args.test_split, args.seed)
+
+    # Las coincidencias se buscan una sola vez; la búsqueda solo multiplica matrices
+    start = time.perf_counter()
+    model = CompiledKeywordModel(keywords)
+    try:
+        matrix = HitMatrix(model, train_texts, train_labels)
+        test_matrix = HitMatrix(model, test_texts, test_labels) if test_texts is not train_texts else matrix
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    matrix_time = time.perf_counter() - start
+
+    print(f"Corpus: {len(texts):,} documentos; ajuste con {len(train_texts):,} "
+          f"({len(matrix.counts):,} filas únicas × {matrix.features.shape[1]} palabras clave, {matrix_time:.2f} s)")
+
+    def report_round(round_number: int, change: str, accuracy: float):
+        print(f"  ronda {round_number}: {change} -> {accuracy:.2%}")
+
+    workers = args.workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    with WeightTuner(matrix, workers) as tuner:
+        if args.strategy == 'grid':
+            tuner.grid()
+        elif args.strategy == 'random':
+            tuner.random_search(args.samples or DEFAULT_SAMPLES, args.seed)
+        else:
+            tuner.coordinate_ascent(args.rounds or DEFAULT_ROUNDS, report_round)
+    search_time = time.perf_counter() - start
+
+    best_keywords = matrix.keywords(tuner.best_weights)
+    initial_test, best_test = test_matrix.accuracy(np.array([matrix.initial_weights, tuner.best_weights])).tolist()
+    # Verificación: el diccionario guardado, compilado y clasificado como siempre, da la misma exactitud
+    results = CloudServiceClassifier(CompiledKeywordModel(best_keywords)).classify_batch(test_texts, workers=1)
+    verified = sum(1 for (predicted, _, _), label in zip(results, test_labels) if predicted == label) / len(test_labels)
+
+    try:
+        save_keywords_file(best_keywords, args.output)
+        if args.results:
+            import csv
+            with open(args.results, 'w', encoding='utf-8', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['configuracion', 'exactitud', 'descripcion'])
+                writer.writerows((index, f"{accuracy:.6f}", description)
+                                 for index, (description, accuracy) in enumerate(tuner.trials, 1))
+    except (OSError, ValueError) as e:
+        print(f"Error al guardar los resultados del ajuste: {e}")
+        sys.exit(1)
+
+    print(f"Búsqueda {args.strategy}: {tuner.evaluated:,} configuraciones en {search_time:.2f} s con "
+          f"{workers} proceso(s) ({tuner.evaluated / search_time:,.0f} configuraciones/s)")
+    if args.top:
+        print("\nMEJORES CONFIGURACIONES (exactitud de ajuste):")
+        for rank, (description, accuracy) in enumerate(tuner.top(args.top), 1):
+            description = description if len(description) <= 90 else description[:87] + '...'
+            print(f"  {rank:>3}. {accuracy:>7.2%}  {description}")
+
+    evaluation = (f"{len(test_texts):,} documentos reservados" if test_texts is not train_texts
+                  else "los mismos documentos de ajuste")
+    print(f"\n  {'EXACTITUD':<14}{'INICIAL':>10}{'MEJOR':>10}")
+    print(f"  {'ajuste':<14}{float(matrix.accuracy(matrix.initial_weights[None, :])[0]):>10.2%}"
+          f"{tuner.best_accuracy:>10.2%}")
+    print(f"  {'evaluación':<14}{initial_test:>10.2%}{best_test:>10.2%}  ({evaluation})")
+    print(f"Verificación con el clasificador: {verified:.2%} en evaluación "
+          f"({'coincide' if abs(verified - best_test) < 1e-9 else 'NO coincide'})")
+    print(f"Diccionario guardado en '{args.output}'; úsalo con --keywords {args.output}")
+
+def main(argv: Optional[List[str]] = None, classifier: Optional[CloudServiceClassifier] = None):
+    """
+    Función principal con soporte para argumentos de línea de comandos
+    
+    Args:
+        argv (Optional[List[str]]): Argumentos a procesar (por defecto, los de sys.argv)
+        classifier (Optional[CloudServiceClassifier]): Clasificador ya construido para reutilizar
+            entre invocaciones en el mismo proceso; se ignora si --model o --engine piden otro
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    # Subcomando de entrenamiento del motor lineal
+    if argv and argv[0] == 'train':
+        run_train(argv[1:])
+        return
+    
+    # Subcomando de ajuste de pesos del diccionario de palabras clave
+    if argv and argv[0] == 'tune':
+        run_tune(argv[1:])
+        return
     
     # Configurar argumentos de línea de comandos
+    # prog fijo: demo.py llama a main dentro de su proceso, donde sys.argv[0] es otro script
     parser = argparse.ArgumentParser(
+        prog=os.path.basename(__file__),
         description='Clasificador de Servicios en la Nube (IaaS, PaaS, SaaS, FaaS)',
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Ejemplos de uso:
   %(prog)s --text "Necesito servidores virtuales"
   %(prog)s --file input.txt
+  %(prog)s --file arquitectura.txt --segments
+  %(prog)s --file arquitectura.txt --segments window --window-words 60 --stride-words 30
+  %(prog)s --batch tickets.txt --workers 8 --chunk-size 512
+  %(prog)s --batch tickets.txt --engine numpy
+  %(prog)s --text "Despliegue serverles en kubernets" --fuzzy
+  %(prog)s --stream --fuzzy 2 < tickets.txt
+  %(prog)s train etiquetados.csv --output modelo_lineal.bin
+  %(prog)s --batch tickets.txt --engine linear --linear-model modelo_lineal.bin
+  %(prog)s tune etiquetados.csv --output palabras_clave.json --strategy coordinate --workers 4
+  %(prog)s --keywords palabras_clave.json --batch tickets.txt
+  %(prog)s --batch tickets.txt --format tsv --no-scores --found-keywords > resultados.tsv
+  %(prog)s --corpus exportacion.txt --workers 8 --format csv > resultados.csv
+  %(prog)s --dir documentos/ --pattern "*.txt" --read-threads 16 --format csv > resultados.csv
+  %(prog)s --corpus exportacion.txt --workers 8 --report
+  %(prog)s --dir documentos/ --report json > reporte.json
+  cat tickets.jsonl | %(prog)s --stream --input-format jsonl --text-field body --format csv
+  %(prog)s --follow /var/log/tickets.log --state tickets.posicion --poll-interval 0.5
+  %(prog)s --batch tickets.txt --cache resultados.sqlite --verbose
+  %(prog)s --save-model modelo.bin
+  %(prog)s --serve --port 8080 --socket /tmp/clasificador.sock --model modelo.bin
+  %(prog)s --model modelo.bin --text "Necesito servidores virtuales"
+  %(prog)s --serve --keywords palabras_clave.yaml --reload-interval 5
+  %(prog)s --keywords palabras_clave.json --save-model modelo.bin
+  %(prog)s --batch tickets.txt --stats --profile perfil.pstats
   %(prog)s --interactive --verbose
   %(prog)s --examples
   %(prog)s --text "Plataforma de desarrollo" --verbose
@@ -331,6 +1590,46 @@ Ejemplos de uso:
         type=str,
         help='Archivo de texto a clasificar'
     )
+    input_group.add_argument(
+        '-b', '--batch',
+        type=str,
+        metavar='FILE',
+        help='Archivo de lote a clasificar (un documento por línea)'
+    )
+    input_group.add_argument(
+        '--corpus',
+        type=str,
+        metavar='FILE',
+        help='Corpus muy grande a clasificar en paralelo mapeado en memoria (un documento por línea)'
+    )
+    input_group.add_argument(
+        '-d', '--dir',
+        type=str,
+        metavar='PATH',
+        help='Directorio a recorrer recursivamente, clasificando cada archivo como un documento'
+    )
+    input_group.add_argument(
+        '-s', '--stream',
+        action='store_true',
+        help='Clasificar stdin línea por línea y escribir resultados compactos en stdout'
+    )
+    input_group.add_argument(
+        '--follow',
+        type=str,
+        metavar='FILE',
+        help='Seguir un archivo de log que crece (como tail -f) y clasificar cada línea nueva'
+    )
+    input_group.add_argument(
+        '--save-model',
+        type=str,
+        metavar='PATH',
+        help='Compilar el modelo de palabras clave y guardarlo en un archivo binario'
+    )
+    input_group.add_argument(
+        '--serve',
+        action='store_true',
+        help='Ejecutar como servicio HTTP con /classify y /classify/batch'
+    )
     input_group.add_argument(
         '-i', '--interactive',
         action='store_true',
@@ -348,6 +1647,196 @@ Ejemplos de uso:
         action='store_true',
         help='Mostrar análisis detallado'
     )
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=None,
+        help='Procesos del modo lote o hilos del servicio (por defecto: uno por CPU)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f'Documentos por tarea en los modos lote y directorio (por defecto: {DEFAULT_CHUNK_SIZE})'
+    )
+    parser.add_argument(
+        '--range-size',
+        type=int,
+        default=None,
+        metavar='BYTES',
+        help='Bytes aproximados por tarea en el modo corpus (por defecto: 4 MiB)'
+    )
+    parser.add_argument(
+        '--read-threads',
+        type=int,
+        default=None,
+        help='Hilos que leen archivos en el modo directorio (por defecto: 8)'
+    )
+    parser.add_argument(
+        '--pattern',
+        type=str,
+        default='*',
+        metavar='GLOB',
+        help="Patrón que deben cumplir los nombres de archivo en el modo directorio (por defecto: '*')"
+    )
+    parser.add_argument(
+        '--input-format',
+        choices=['text', 'jsonl'],
+        default='text',
+        help='Formato de entrada del modo stream (por defecto: text)'
+    )
+    parser.add_argument(
+        '--text-field',
+        type=str,
+        default='text',
+        help="Campo con el texto en la entrada JSONL (por defecto: 'text')"
+    )
+    parser.add_argument(
+        '--state',
+        type=str,
+        metavar='PATH',
+        help='Archivo donde --follow guarda la posición ya procesada (por defecto: FILE.posicion)'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=None,
+        metavar='SECONDS',
+        help='Segundos entre revisiones del archivo de --follow cuando no hay líneas nuevas (por defecto: 1)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=OUTPUT_FORMATS,
+        default='jsonl',
+        help='Formato de salida de los modos lote, stream, corpus y directorio (por defecto: jsonl)'
+    )
+    parser.add_argument(
+        '--no-scores',
+        dest='include_scores',
+        action='store_false',
+        help='Omitir en la salida de --format el score de cada tipo de servicio'
+    )
+    parser.add_argument(
+        '--found-keywords',
+        action='store_true',
+        help='Incluir en la salida de --format las palabras clave encontradas en cada documento (sin caché)'
+    )
+    parser.add_argument(
+        '--report',
+        nargs='?',
+        const='text',
+        default=None,
+        choices=REPORT_FORMATS,
+        help='Con --corpus, --dir o --stream: escribir solo el reporte agregado (documentos por tipo, '
+             'histograma de confianza, palabras clave por tipo y no clasificables) en formato text o json'
+    )
+    parser.add_argument(
+        '--segments',
+        nargs='?',
+        const='paragraph',
+        default=None,
+        choices=SEGMENT_MODES,
+        help='Con --text o --file: clasificar cada párrafo (paragraph, por defecto) o ventana de palabras '
+             '(window) además del documento completo'
+    )
+    parser.add_argument(
+        '--window-words',
+        type=int,
+        default=DEFAULT_WINDOW_WORDS,
+        help=f'Palabras por ventana con --segments window (por defecto: {DEFAULT_WINDOW_WORDS})'
+    )
+    parser.add_argument(
+        '--stride-words',
+        type=int,
+        default=DEFAULT_STRIDE_WORDS,
+        help=f'Palabras que avanza cada ventana con --segments window (por defecto: {DEFAULT_STRIDE_WORDS})'
+    )
+    parser.add_argument(
+        '--fuzzy',
+        nargs='?',
+        type=int,
+        const=DEFAULT_FUZZY_DISTANCE,
+        default=None,
+        choices=range(1, MAX_FUZZY_DISTANCE + 1),
+        metavar='N',
+        help=f'Reconocer palabras clave escritas con hasta N errores de tipeo (1 o 2, por defecto: '
+             f'{DEFAULT_FUZZY_DISTANCE}); cuentan como coincidencias parciales'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='python',
+        help='Motor de puntuación (por defecto: python; numpy acelera el modo lote y requiere NumPy; '
+             'linear usa el modelo de --linear-model)'
+    )
+    parser.add_argument(
+        '--linear-model',
+        type=str,
+        metavar='PATH',
+        help='Modelo lineal entrenado con el subcomando train, para --engine linear'
+    )
+    parser.add_argument(
+        '-m', '--model',
+        type=str,
+        metavar='PATH',
+        help='Modelo compilado a cargar en lugar de compilar el diccionario integrado'
+    )
+    parser.add_argument(
+        '-k', '--keywords',
+        type=str,
+        metavar='PATH',
+        help='Diccionario de palabras clave JSON o YAML; con --serve, --stream y --follow se recarga al cambiar'
+    )
+    parser.add_argument(
+        '--reload-interval',
+        type=float,
+        default=2.0,
+        metavar='SECONDS',
+        help='Segundos entre revisiones del diccionario de --keywords; 0 desactiva la recarga (por defecto: 2)'
+    )
+    parser.add_argument(
+        '--cache',
+        type=str,
+        metavar='PATH',
+        help='Archivo SQLite para guardar resultados entre ejecuciones'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=DEFAULT_MEMORY_SIZE,
+        help=f'Entradas de la caché en memoria (por defecto: {DEFAULT_MEMORY_SIZE})'
+    )
+    parser.add_argument(
+        '--host',
+        type=str,
+        default='127.0.0.1',
+        help='Interfaz donde escucha el servicio (por defecto: 127.0.0.1)'
+    )
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8080,
+        help='Puerto TCP del servicio; 0 para escuchar solo en el socket Unix (por defecto: 8080)'
+    )
+    parser.add_argument(
+        '--socket',
+        type=str,
+        metavar='PATH',
+        help='Socket de dominio Unix donde escucha también el servicio'
+    )
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Reportar en stderr el tiempo por etapa, documentos/segundo y aciertos por palabra clave'
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='',
+        default=None,
+        metavar='PATH',
+        help='Perfilar la ejecución con cProfile (solo el proceso principal); con PATH guarda el volcado pstats'
+    )
     parser.add_argument(
         '--version',
         action='version',
@@ -355,25 +1844,144 @@ Ejemplos de uso:
     )
     
     # Parsear argumentos
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Si no se proporcionaron argumentos, mostrar ayuda
-    if len(sys.argv) == 1:
+    if not argv:
         parser.print_help()
         return
     
-    # Crear instancia del clasificador
-    classifier = CloudServiceClassifier()
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers debe ser al menos 1')
+    if args.chunk_size < 1:
+        parser.error('--chunk-size debe ser al menos 1')
+    if args.read_threads is not None and args.read_threads < 1:
+        parser.error('--read-threads debe ser al menos 1')
+    if args.range_size is not None and args.range_size < 1:
+        parser.error('--range-size debe ser al menos 1')
+    if args.model and args.keywords:
+        parser.error('--model y --keywords son excluyentes')
+    if args.poll_interval is not None and args.poll_interval <= 0:
+        parser.error('--poll-interval debe ser mayor que 0')
+    if (args.state or args.poll_interval is not None) and not args.follow:
+        parser.error('--state y --poll-interval solo se usan con --follow')
+    if args.reload_interval < 0:
+        parser.error('--reload-interval no puede ser negativo')
+    if args.corpus and args.cache:
+        parser.error('--cache no se admite con --corpus: los procesos leen el corpus directamente')
+    if args.dir and args.cache:
+        parser.error('--cache no se admite con --dir: los procesos clasifican los archivos sin pasar por la caché')
+    if args.report and not (args.corpus or args.dir or args.stream):
+        parser.error('--report requiere --corpus, --dir o --stream (para un archivo de lote, usa --corpus)')
+    if args.segments and not (args.text or args.file):
+        parser.error('--segments requiere --text o --file')
+    if args.segments and args.engine == 'linear':
+        parser.error('--segments no se admite con --engine linear: los segmentos se puntúan con las palabras clave')
+    if args.window_words < 1 or args.stride_words < 1:
+        parser.error('--window-words y --stride-words deben ser al menos 1')
+    if (args.engine == 'linear') != bool(args.linear_model):
+        parser.error('--engine linear y --linear-model deben usarse juntos')
+    if args.engine == 'linear' and args.cache:
+        parser.error('--cache no se admite con --engine linear: la caché guarda resultados de las palabras clave')
+    if args.engine == 'linear' and args.fuzzy:
+        parser.error('--fuzzy no se admite con --engine linear: la tolerancia a errores es de las palabras clave')
+    if args.engine == 'numpy':
+        # Importación diferida: NumPy solo se carga si se pide su motor
+        from numpy_engine import NUMPY_AVAILABLE
+        if not NUMPY_AVAILABLE:
+            parser.error('--engine numpy requiere NumPy (pip install numpy)')
+    
+    # Crear instancia del clasificador (o reutilizar la recibida)
+    keywords_digest = None
+    if (classifier is None or args.model or args.keywords or args.linear_model or args.fuzzy
+            or args.engine != classifier.engine):
+        model = None
+        if args.model:
+            model = load_model_file(args.model)
+            if args.fuzzy and args.fuzzy != model.matcher.fuzzy_distance:
+                # El modelo se guardó con otra tolerancia: se recompila su diccionario
+                model = CompiledKeywordModel(model.keywords, args.fuzzy)
+        elif args.keywords:
+            keywords, keywords_digest = load_keywords_dictionary(args.keywords)
+            model = CompiledKeywordModel(keywords, args.fuzzy or 0)
+        elif args.fuzzy:
+            model = CompiledKeywordModel(DEFAULT_KEYWORDS, args.fuzzy)
+        linear_model = load_linear_model_file(args.linear_model) if args.linear_model else None
+        classifier = CloudServiceClassifier(model, args.engine, linear_model)
+    if args.cache:
+        classifier.enable_cache(args.cache, args.cache_size)
+    
+    # Los modos residentes recompilan el modelo cuando cambia el diccionario
+    watcher = None
+    if args.keywords and args.reload_interval > 0 and (args.serve or args.stream or args.follow):
+        from keyword_dictionary import KeywordDictionaryWatcher
+        watcher = KeywordDictionaryWatcher(classifier, args.keywords, args.reload_interval,
+                                           keywords_digest, args.verbose)
+        watcher.start()
+    
+    if args.stats:
+        classifier.stats = RunStats()
+    profiler = None
+    if args.profile is not None:
+        # Importación diferida: cProfile solo se carga si se pide el perfil
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
     
     try:
-        if args.text:
+        if args.text and args.segments:
+            # Clasificar el texto por segmentos
+            print_segments_result(args.text, classifier, args.segments, args.window_words, args.stride_words)
+            
+        elif args.text:
             # Clasificar texto proporcionado
             print_classification_result(args.text, classifier, args.verbose)
             
         elif args.file:
             # Clasificar contenido de archivo
-            file_content = read_file_content(args.file)
-            print_classification_result(file_content, classifier, args.verbose)
+            with measure(classifier.stats, 'lectura'):
+                file_content = read_file_content(args.file)
+            if args.segments:
+                print_segments_result(file_content, classifier, args.segments, args.window_words, args.stride_words)
+            else:
+                print_classification_result(file_content, classifier, args.verbose)
+            
+        elif args.save_model:
+            # Guardar el modelo compilado para arranques posteriores
+            classifier.model.save(args.save_model)
+            print(f"Modelo compilado guardado en '{args.save_model}'.")
+            
+        elif args.batch:
+            # Clasificar cada línea del archivo como un documento
+            run_batch(args.batch, classifier, args.workers, args.chunk_size, args.format,
+                      args.include_scores, args.found_keywords)
+            
+        elif args.corpus:
+            # Clasificar un corpus grande por rangos de bytes en varios procesos
+            run_corpus(args.corpus, classifier, args.workers, args.range_size, args.format,
+                       args.include_scores, args.found_keywords, args.report)
+            
+        elif args.dir:
+            # Clasificar cada archivo de un árbol de directorios leyendo y clasificando en paralelo
+            run_directory(args.dir, classifier, args.workers, args.chunk_size, args.read_threads,
+                          args.pattern, args.format, args.include_scores, args.found_keywords, args.report)
+            
+        elif args.stream:
+            # Clasificar stdin de forma incremental
+            run_stream(classifier, args.input_format, args.text_field, args.format,
+                       args.include_scores, args.found_keywords, args.report)
+            
+        elif args.follow:
+            # Clasificar las líneas que se agregan a un archivo de log, reanudando donde se quedó
+            run_follow(args.follow, classifier, args.state, args.poll_interval, args.format,
+                       args.include_scores, args.found_keywords)
+            
+        elif args.serve:
+            # Importación diferida: http.server solo se necesita en modo servicio
+            from server import serve
+            
+            # Servicio residente con el clasificador ya compilado
+            serve(classifier, args.host, args.port, args.socket, args.workers, args.verbose)
             
         elif args.interactive:
             # Modo interactivo
@@ -393,6 +2001,21 @@ Ejemplos de uso:
     except Exception as e:
         print(f"\nError inesperado: {e}")
         sys.exit(1)
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        if profiler is not None:
+            profiler.disable()
+            report_profile(profiler, args.profile)
+        if classifier.stats is not None:
+            classifier.stats.report(classifier.model.matcher.keywords if classifier.engine != 'linear' else ())
+            classifier.stats = None
+        if args.cache:
+            if args.verbose:
+                stats = classifier.cache.stats()
+                print(f"\nCACHÉ: {stats['aciertos_memoria']} aciertos en memoria, "
+                      f"{stats['aciertos_disco']} aciertos en disco, {stats['fallos']} fallos", file=sys.stderr)
+            classifier.close_cache()
 
 if __name__ == "__main__":
     main()
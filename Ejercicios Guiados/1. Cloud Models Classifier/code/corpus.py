@@ -0,0 +1,148 @@
+"""
+Clasificación de corpus muy grandes mapeados en memoria
+Divide el archivo en rangos de bytes alineados a fin de línea; cada proceso mapea
+el mismo archivo y lee solo sus rangos, sin copiar el corpus completo a ningún proceso
+"""
+
+import mmap
+import os
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from corpus_report import CorpusReport
+from run_stats import measure
+from worker_pool import classify_in_worker, new_task_stats, run_in_pool, summarize_in_worker
+
+# Bytes aproximados de cada rango enviado a un proceso
+DEFAULT_RANGE_SIZE = 4 * 1024 * 1024
+
+
+def iter_record_ranges(mapping: mmap.mmap, range_size: int = DEFAULT_RANGE_SIZE) -> Iterator[Tuple[int, int]]:
+    """
+    Recorre el archivo mapeado en rangos [inicio, fin) que terminan siempre en un salto de línea
+
+    Solo se examinan los bytes cercanos a cada corte, así que dividir un archivo de
+    varios GB no requiere leerlo completo.
+    """
+    size = len(mapping)
+    start = 0
+    while start < size:
+        end = min(start + range_size, size)
+        if end < size:
+            # Extender el corte hasta el final de la línea en curso
+            newline = mapping.find(b'\n', end - 1)
+            end = size if newline == -1 else newline + 1
+        yield start, end
+        start = end
+
+
+def read_range_records(mapping: mmap.mmap, start: int, end: int) -> List[str]:
+    """Decodifica un rango del archivo mapeado en sus documentos (uno por línea)"""
+    # Un rango nunca corta un carácter UTF-8: el byte de salto de línea no aparece dentro de otro
+    text = mapping[start:end].decode('utf-8', errors='replace')
+    if text.endswith('\n'):
+        text = text[:-1]
+    return [line[:-1] if line.endswith('\r') else line for line in text.split('\n')]
+
+
+def classify_corpus(classifier, file_path: str, workers: Optional[int] = None, range_size: int = DEFAULT_RANGE_SIZE,
+                    with_keywords: bool = False) -> Iterator[Tuple[int, Tuple[str, float, Dict[str, float]]]]:
+    """
+    Clasifica cada línea de un archivo de corpus y entrega los resultados en orden
+
+    Args:
+        classifier (CloudServiceClassifier): Clasificador a usar (sin caché en los procesos)
+        file_path (str): Archivo de corpus, un documento por línea
+        workers (Optional[int]): Número de procesos (por defecto, uno por CPU)
+        range_size (int): Bytes aproximados de cada rango enviado a un proceso
+        with_keywords (bool): Agregar a cada resultado las palabras clave encontradas
+
+    Yields:
+        Tuple[int, Tuple[str, float, Dict[str, float]]]: (número de línea, resultado de classify_text)
+    """
+    workers = workers or os.cpu_count() or 1
+
+    with open(file_path, 'rb') as file:
+        # mmap no admite archivos vacíos
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            ranges = iter_record_ranges(mapping, range_size)
+            if workers == 1:
+                read = read_range_records
+                if classifier.stats is not None:
+                    read = classifier.stats.timed_call(read_range_records, 'lectura')
+                batches = (classifier.classify_batch(read(mapping, start, end), workers=1, with_keywords=with_keywords)
+                           for start, end in ranges)
+            else:
+                batches = (results for _, results in _classify_ranges_in_pool(
+                    classifier, file_path, ranges, workers, partial(_classify_range_in_worker, with_keywords=with_keywords)))
+
+            line_number = 0
+            for results in batches:
+                for result in results:
+                    line_number += 1
+                    yield line_number, result
+
+
+def summarize_corpus(classifier, file_path: str, workers: Optional[int] = None,
+                     range_size: int = DEFAULT_RANGE_SIZE) -> CorpusReport:
+    """
+    Clasifica un archivo de corpus y retorna solo su reporte agregado
+
+    Cada proceso resume sus rangos en un CorpusReport parcial; al proceso principal
+    vuelven esos parciales (de tamaño fijo), nunca los resultados por documento.
+
+    Args:
+        classifier (CloudServiceClassifier): Clasificador a usar (sin caché en los procesos)
+        file_path (str): Archivo de corpus, un documento por línea
+        workers (Optional[int]): Número de procesos (por defecto, uno por CPU)
+        range_size (int): Bytes aproximados de cada rango enviado a un proceso
+    """
+    workers = workers or os.cpu_count() or 1
+    report = CorpusReport(classifier.service_types, classifier.keywords)
+
+    with open(file_path, 'rb') as file:
+        # mmap no admite archivos vacíos
+        if os.fstat(file.fileno()).st_size == 0:
+            return report
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            ranges = iter_record_ranges(mapping, range_size)
+            if workers == 1:
+                read = read_range_records
+                if classifier.stats is not None:
+                    read = classifier.stats.timed_call(read_range_records, 'lectura')
+                for start, end in ranges:
+                    report.update(classifier.classify_batch(read(mapping, start, end), workers=1, with_keywords=True))
+            else:
+                for _, partial_report in _classify_ranges_in_pool(
+                        classifier, file_path, ranges, workers, partial(summarize_in_worker, _classify_range_in_worker)):
+                    report.merge(partial_report)
+    return report
+
+
+def _classify_ranges_in_pool(classifier, file_path: str, ranges: Iterator[Tuple[int, int]], workers: int,
+                             task) -> Iterator[Tuple[None, object]]:
+    """Reparte los rangos en el pool compartido; cada proceso mapea el corpus por su cuenta al iniciar"""
+    tasks = ((None, (start, end)) for start, end in ranges)
+    return run_in_pool(classifier, tasks, workers, task, setup=_map_corpus_in_worker, setup_args=(file_path,))
+
+
+# Mapeo del corpus de cada proceso del pool
+_worker_mapping: Optional[mmap.mmap] = None
+
+
+def _map_corpus_in_worker(file_path: str):
+    """Mapea el corpus en un proceso del pool"""
+    global _worker_mapping
+    with open(file_path, 'rb') as file:
+        # El mapeo sigue siendo válido tras cerrar el archivo; las páginas se comparten vía el sistema operativo
+        _worker_mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _classify_range_in_worker(start: int, end: int, with_keywords: bool = False):
+    """Clasifica los documentos de un rango del corpus dentro de un proceso del pool; retorna (resultados, estadísticas)"""
+    stats = new_task_stats()
+    with measure(stats, 'lectura'):
+        records = read_range_records(_worker_mapping, start, end)
+    return classify_in_worker(records, with_keywords, stats)
@@ -0,0 +1,135 @@
+"""
+Reporte agregado de un corpus del Clasificador de Servicios en la Nube (--report)
+Resume la clasificación de muchos documentos en contadores de tamaño fijo:
+documentos por tipo de servicio, histograma de confianza, palabras clave que más
+aportan a cada tipo y tasa de documentos no clasificables. Los reportes parciales
+de cada proceso se combinan con merge, así que ningún resultado por documento
+tiene que volver al proceso principal
+"""
+
+import json
+import sys
+from collections import Counter
+from typing import Dict, Iterable, List, TextIO, Tuple
+
+# Intervalos del histograma de confianza: [0.0, 0.1), [0.1, 0.2), ..., [0.9, 1.0]
+HISTOGRAM_BINS = 10
+
+# Palabras clave listadas por tipo de servicio, de más a menos documentos
+TOP_KEYWORDS_PER_TYPE = 10
+
+REPORT_FORMATS = ('text', 'json')
+
+UNCLASSIFIABLE = "No clasificable"
+
+
+class CorpusReport:
+    """
+    Acumulador de un reporte de corpus; su tamaño depende del diccionario, no del corpus
+    """
+
+    def __init__(self, service_types: Iterable[str], keywords: Dict[str, Dict[str, float]]):
+        """
+        Args:
+            service_types (Iterable[str]): Tipos de servicio, en el orden del reporte
+            keywords (Dict[str, Dict[str, float]]): Diccionario del modelo (tipo -> palabra clave -> peso),
+                para saber a qué tipo aporta cada palabra clave encontrada
+        """
+        self.service_types = list(service_types)
+        self.keywords = keywords
+        self.documents = 0
+        self.type_counts: Counter = Counter()
+        self.confidence_sums: Dict[str, float] = dict.fromkeys(self.service_types, 0.0)
+        self.histograms: Dict[str, List[int]] = {service: [0] * HISTOGRAM_BINS for service in self.service_types}
+        # Documentos en los que cada palabra clave aportó al tipo ganador
+        self.keyword_counts: Dict[str, Counter] = {service: Counter() for service in self.service_types}
+
+    def __getstate__(self):
+        # Los reportes parciales de los procesos viajan sin el diccionario: merge no lo usa
+        state = self.__dict__.copy()
+        state['keywords'] = {}
+        return state
+
+    def add(self, service_type: str, confidence: float, scores: Dict[str, float], keywords: List[str] = ()):
+        """Registra el resultado de un documento (con las palabras clave de with_keywords, si las hay)"""
+        self.documents += 1
+        self.type_counts[service_type] += 1
+        if service_type not in self.histograms:
+            return
+
+        self.confidence_sums[service_type] += confidence
+        self.histograms[service_type][min(int(confidence * HISTOGRAM_BINS), HISTOGRAM_BINS - 1)] += 1
+        type_keywords = self.keywords.get(service_type, {})
+        self.keyword_counts[service_type].update(keyword for keyword in keywords if keyword in type_keywords)
+
+    def update(self, results: Iterable[Tuple]):
+        """Registra los resultados de varios documentos"""
+        for result in results:
+            self.add(*result)
+
+    def merge(self, other: 'CorpusReport'):
+        """Incorpora un reporte parcial (p. ej. el de un rango clasificado en otro proceso)"""
+        self.documents += other.documents
+        self.type_counts.update(other.type_counts)
+        for service in self.service_types:
+            self.confidence_sums[service] += other.confidence_sums.get(service, 0.0)
+            if service in other.histograms:
+                self.histograms[service] = [mine + theirs for mine, theirs
+                                            in zip(self.histograms[service], other.histograms[service])]
+                self.keyword_counts[service].update(other.keyword_counts[service])
+
+    @property
+    def unclassifiable(self) -> int:
+        """Documentos sin ninguna palabra clave reconocida"""
+        return self.type_counts[UNCLASSIFIABLE]
+
+    def to_dict(self) -> Dict:
+        """Reporte como diccionario serializable a JSON"""
+        types = {}
+        for service in self.service_types:
+            count = self.type_counts[service]
+            types[service] = {
+                'documentos': count,
+                'proporcion': round(count / self.documents, 4) if self.documents else 0.0,
+                'confianza_media': round(self.confidence_sums[service] / count, 4) if count else 0.0,
+                'histograma_confianza': self.histograms[service],
+                'palabras_clave': self.keyword_counts[service].most_common(TOP_KEYWORDS_PER_TYPE)
+            }
+        return {
+            'documentos': self.documents,
+            'no_clasificables': self.unclassifiable,
+            'tasa_no_clasificables': round(self.unclassifiable / self.documents, 4) if self.documents else 0.0,
+            'tipos': types
+        }
+
+    def write(self, report_format: str = 'text', stream: TextIO = sys.stdout):
+        """Escribe el reporte en formato 'text' (tablas legibles) o 'json' (un objeto)"""
+        if report_format == 'json':
+            stream.write(json.dumps(self.to_dict(), ensure_ascii=False) + '\n')
+            return
+        if report_format != 'text':
+            raise ValueError(f"Formato de reporte no soportado: {report_format}")
+
+        data = self.to_dict()
+        print(f"{'='*60}", file=stream)
+        print("REPORTE DEL CORPUS", file=stream)
+        print(f"{'='*60}", file=stream)
+        print(f"Documentos:          {data['documentos']:,}", file=stream)
+        print(f"No clasificables:    {data['no_clasificables']:,} ({data['tasa_no_clasificables']:.1%})", file=stream)
+
+        print("\nDISTRIBUCIÓN POR TIPO DE SERVICIO:", file=stream)
+        for service, summary in data['tipos'].items():
+            print(f"  {service:<10}{summary['documentos']:>10,}{summary['proporcion']:>8.1%}"
+                  f"   confianza media {summary['confianza_media']:.2f}", file=stream)
+
+        print("\nHISTOGRAMA DE CONFIANZA (documentos):", file=stream)
+        print(f"  {'intervalo':<12}" + ''.join(f"{service:>10}" for service in self.service_types), file=stream)
+        for index in range(HISTOGRAM_BINS):
+            bounds = f"{index / HISTOGRAM_BINS:.1f}-{(index + 1) / HISTOGRAM_BINS:.1f}"
+            print(f"  {bounds:<12}" + ''.join(f"{self.histograms[service][index]:>10,}"
+                                             for service in self.service_types), file=stream)
+
+        print("\nPALABRAS CLAVE QUE MÁS APORTAN POR TIPO (documentos):", file=stream)
+        for service, summary in data['tipos'].items():
+            listed = ', '.join(f"{keyword} ({count:,})" for keyword, count in summary['palabras_clave'])
+            print(f"  {service:<10}{listed or '-'}", file=stream)
@@ -4,87 +4,132 @@ Script de demostración del Clasificador de Servicios en la Nube
 Muestra todas las funcionalidades disponibles
 """
 
+import argparse
+import contextlib
+import io
+import os
+import shlex
 import subprocess
 import sys
-import os
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CLASSIFIER_SCRIPT = os.path.join(SCRIPT_DIR, "cloud_models_classifier.py")
+
+
+def example_file(name):
+    """Ruta relativa a un archivo de ejemplo (están junto a la carpeta code)"""
+    return os.path.relpath(os.path.join(SCRIPT_DIR, "..", name))
+
+
+def run_in_process(args, classifier):
+    """Ejecuta el CLI dentro de este proceso reutilizando el clasificador; retorna (stdout, stderr)"""
+    from cloud_models_classifier import main as classifier_main
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            classifier_main(args, classifier)
+        except SystemExit:
+            # --help y --version terminan con SystemExit, igual que en la línea de comandos
+            pass
+    return stdout.getvalue(), stderr.getvalue()
+
 
-def run_command(command, description):
-    """Ejecuta un comando y muestra su descripción"""
+def run_subprocess(args):
+    """Ejecuta el CLI real en un proceso nuevo; retorna (stdout, stderr)"""
+    result = subprocess.run([sys.executable, CLASSIFIER_SCRIPT, *args], capture_output=True, text=True)
+    return result.stdout, result.stderr
+
+
+def run_command(args, description, classifier=None):
+    """Ejecuta un comando, muestra su descripción y retorna el tiempo empleado en segundos"""
     print(f"\n{'='*80}")
     print(f"DEMOSTRACIÓN: {description}")
     print(f"{'='*80}")
-    print(f"Comando: {command}")
+    print(f"Comando: python3 cloud_models_classifier.py {shlex.join(args)}")
     print(f"{'='*80}")
-    
+
+    start = time.perf_counter()
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        if result.stdout:
-            print(result.stdout)
-        if result.stderr:
-            print("ERROR:", result.stderr)
+        if classifier is None:
+            stdout, stderr = run_subprocess(args)
+        else:
+            stdout, stderr = run_in_process(args, classifier)
     except Exception as e:
         print(f"Error ejecutando comando: {e}")
+        return time.perf_counter() - start
+    elapsed = time.perf_counter() - start
+
+    if stdout:
+        print(stdout)
+    if stderr:
+        print("ERROR:", stderr)
+    print(f"Tiempo: {elapsed * 1000:.2f} ms")
+    return elapsed
+
 
 def main():
     """Función principal de demostración"""
-    
+    parser = argparse.ArgumentParser(description='Demostración del Clasificador de Servicios en la Nube')
+    parser.add_argument(
+        '--cli',
+        action='store_true',
+        help='Ejecutar cada paso con el CLI real en un proceso nuevo (como antes)'
+    )
+    options = parser.parse_args()
+
     print("🚀 DEMOSTRACIÓN COMPLETA DEL CLASIFICADOR DE SERVICIOS EN LA NUBE")
     print("=" * 80)
-    
-    # Verificar que estamos en el directorio correcto
-    if not os.path.exists("cloud_models_classifier.py"):
+
+    # Verificar que el clasificador está junto a este script
+    if not os.path.exists(CLASSIFIER_SCRIPT):
         print("❌ Error: No se encontró cloud_models_classifier.py")
-        print("   Asegúrate de ejecutar este script desde el directorio 'Cloud Models Classifier'")
+        print("   Asegúrate de que demo.py esté en el mismo directorio que el clasificador")
         sys.exit(1)
-    
-    # 1. Mostrar ayuda
-    run_command(
-        "python3 cloud_models_classifier.py --help",
-        "Mostrar ayuda y opciones disponibles"
-    )
-    
-    # 2. Clasificar texto directo (simple)
-    run_command(
-        'python3 cloud_models_classifier.py --text "Necesito servidores virtuales con almacenamiento"',
-        "Clasificar texto directo (modo simple)"
-    )
-    
-    # 3. Clasificar texto directo (verbose)
-    run_command(
-        'python3 cloud_models_classifier.py --text "Plataforma para desarrollo y deployment de aplicaciones" --verbose',
-        "Clasificar texto directo (modo verbose)"
-    )
-    
-    # 4. Clasificar archivo IaaS
-    run_command(
-        "python3 cloud_models_classifier.py --file ejemplo_iaas.txt --verbose",
-        "Clasificar archivo de ejemplo IaaS (modo verbose)"
-    )
-    
-    # 5. Clasificar archivo PaaS
-    run_command(
-        "python3 cloud_models_classifier.py --file ejemplo_paas.txt --verbose",
-        "Clasificar archivo de ejemplo PaaS (modo verbose)"
-    )
-    
-    # 6. Ejecutar ejemplos predefinidos
-    run_command(
-        "python3 cloud_models_classifier.py --examples",
-        "Ejecutar ejemplos predefinidos (modo simple)"
-    )
-    
-    # 7. Ejecutar ejemplos con análisis detallado
-    run_command(
-        "python3 cloud_models_classifier.py --examples --verbose",
-        "Ejecutar ejemplos predefinidos (modo verbose)"
-    )
-    
-    # 8. Mostrar versión
-    run_command(
-        "python3 cloud_models_classifier.py --version",
-        "Mostrar versión del programa"
-    )
-    
+
+    classifier = None
+    setup_time = 0.0
+    if not options.cli:
+        # Un solo clasificador compilado para todos los pasos
+        start = time.perf_counter()
+        sys.path.insert(0, SCRIPT_DIR)
+        from cloud_models_classifier import CloudServiceClassifier
+        classifier = CloudServiceClassifier()
+        setup_time = time.perf_counter() - start
+
+    steps = [
+        # 1. Mostrar ayuda
+        (["--help"], "Mostrar ayuda y opciones disponibles"),
+        # 2. Clasificar texto directo (simple)
+        (["--text", "Necesito servidores virtuales con almacenamiento"], "Clasificar texto directo (modo simple)"),
+        # 3. Clasificar texto directo (verbose)
+        (["--text", "Plataforma para desarrollo y deployment de aplicaciones", "--verbose"],
+         "Clasificar texto directo (modo verbose)"),
+        # 4. Clasificar archivo IaaS
+        (["--file", example_file("ejemplo_iaas.txt"), "--verbose"], "Clasificar archivo de ejemplo IaaS (modo verbose)"),
+        # 5. Clasificar archivo PaaS
+        (["--file", example_file("ejemplo_paas.txt"), "--verbose"], "Clasificar archivo de ejemplo PaaS (modo verbose)"),
+        # 6. Ejecutar ejemplos predefinidos
+        (["--examples"], "Ejecutar ejemplos predefinidos (modo simple)"),
+        # 7. Ejecutar ejemplos con análisis detallado
+        (["--examples", "--verbose"], "Ejecutar ejemplos predefinidos (modo verbose)"),
+        # 8. Mostrar versión
+        (["--version"], "Mostrar versión del programa"),
+    ]
+
+    timings = [(description, run_command(args, description, classifier)) for args, description in steps]
+
+    print(f"\n{'='*80}")
+    print("⏱️  TIEMPOS POR PASO " + ("(CLI en procesos nuevos)" if options.cli else "(en proceso)"))
+    print("=" * 80)
+    if not options.cli:
+        print(f"  {'Construcción del clasificador':<60}{setup_time * 1000:>10.2f} ms")
+    for description, elapsed in timings:
+        print(f"  {description:<60}{elapsed * 1000:>10.2f} ms")
+    total = setup_time + sum(elapsed for _, elapsed in timings)
+    print(f"  {'TOTAL':<60}{total * 1000:>10.2f} ms")
+
     print(f"\n{'='*80}")
     print("🎉 DEMOSTRACIÓN COMPLETADA")
     print("=" * 80)
@@ -94,6 +139,9 @@ def main():
     print("  python3 cloud_models_classifier.py --text 'Tu texto aquí' --verbose")
     print("\nPara clasificar un archivo:")
     print("  python3 cloud_models_classifier.py --file tu_archivo.txt --verbose")
+    print("\nPara repetir la demostración con el CLI real en procesos nuevos:")
+    print("  python3 demo.py --cli")
+
 
 if __name__ == "__main__":
     main()
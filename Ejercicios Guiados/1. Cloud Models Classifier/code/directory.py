@@ -0,0 +1,158 @@
+"""
+Clasificación recursiva de árboles de directorios
+Un pool de hilos lee los archivos (trabajo de E/S) mientras un pool de procesos
+clasifica los bloques ya leídos (trabajo de CPU); ambos tienen acotado el trabajo
+en curso, así que la memoria no depende del tamaño del árbol
+"""
+
+import os
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from corpus_report import CorpusReport
+from worker_pool import classify_in_worker, run_in_pool, summarize_in_worker
+
+# Hilos de lectura por defecto: la lectura espera al disco, no a la CPU
+DEFAULT_READ_THREADS = 8
+
+# Lecturas en curso por hilo: suficientes para no dejar ociosos a los hilos
+READS_IN_FLIGHT_PER_THREAD = 4
+
+
+def iter_document_paths(root: str, pattern: str = '*') -> Iterator[str]:
+    """Recorre el árbol en orden alfabético y entrega los archivos cuyo nombre coincide con `pattern`"""
+    def report_error(error: OSError):
+        print(f"Advertencia: no se pudo recorrer '{error.filename}' ({error.strerror}); se omite.", file=sys.stderr)
+
+    for directory, subdirectories, files in os.walk(root, onerror=report_error):
+        # os.walk respeta el orden de la lista: recorrer subdirectorios en orden alfabético
+        subdirectories.sort()
+        for name in sorted(files):
+            if fnmatch(name, pattern):
+                yield os.path.join(directory, name)
+
+
+def read_document(path: str) -> Optional[str]:
+    """
+    Lee un documento igual que read_file_content (UTF-8, sin espacios en los extremos)
+
+    Un archivo ilegible no detiene el recorrido: se avisa en stderr y se retorna None.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return file.read().strip()
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Advertencia: no se pudo leer '{path}' ({e}); se omite.", file=sys.stderr)
+        return None
+
+
+def iter_documents(paths: Iterator[str], read_threads: int = DEFAULT_READ_THREADS,
+                   read: Callable[[str], Optional[str]] = read_document) -> Iterator[Tuple[str, str]]:
+    """Lee los documentos en un pool de hilos y los entrega en el orden de `paths`"""
+    with ThreadPoolExecutor(max_workers=read_threads, thread_name_prefix='lectura') as executor:
+        pending = deque()
+
+        def next_document() -> Iterator[Tuple[str, str]]:
+            path, future = pending.popleft()
+            text = future.result()
+            if text is not None:
+                yield path, text
+
+        for path in paths:
+            pending.append((path, executor.submit(read, path)))
+            if len(pending) >= read_threads * READS_IN_FLIGHT_PER_THREAD:
+                yield from next_document()
+        while pending:
+            yield from next_document()
+
+
+def iter_chunks(documents: Iterator[Tuple[str, str]], chunk_size: int) -> Iterator[Tuple[List[str], List[str]]]:
+    """Agrupa los documentos en bloques (rutas, textos) de hasta `chunk_size` documentos"""
+    paths: List[str] = []
+    texts: List[str] = []
+    for path, text in documents:
+        paths.append(path)
+        texts.append(text)
+        if len(texts) >= chunk_size:
+            yield paths, texts
+            paths, texts = [], []
+    if texts:
+        yield paths, texts
+
+
+def classify_directory(classifier, root: str, workers: Optional[int] = None, chunk_size: int = 256,
+                       read_threads: int = DEFAULT_READ_THREADS, pattern: str = '*',
+                       with_keywords: bool = False) -> Iterator[Tuple[str, Tuple[str, float, Dict[str, float]]]]:
+    """
+    Clasifica cada archivo de un árbol de directorios y entrega los resultados en orden de recorrido
+
+    Args:
+        classifier (CloudServiceClassifier): Clasificador a usar (sin caché en los procesos)
+        root (str): Directorio raíz
+        workers (Optional[int]): Número de procesos de clasificación (por defecto, uno por CPU)
+        chunk_size (int): Documentos enviados a un proceso en cada tarea
+        read_threads (int): Hilos que leen archivos en paralelo
+        pattern (str): Patrón glob que debe cumplir el nombre de cada archivo
+        with_keywords (bool): Agregar a cada resultado las palabras clave encontradas
+
+    Yields:
+        Tuple[str, Tuple[str, float, Dict[str, float]]]: (ruta, resultado de classify_text)
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _iter_directory_chunks(classifier, root, chunk_size, read_threads, pattern)
+
+    if workers == 1:
+        batches = ((paths, classifier.classify_batch(texts, workers=1, with_keywords=with_keywords))
+                   for paths, texts in chunks)
+    else:
+        batches = _classify_chunks_in_pool(classifier, chunks, workers,
+                                           partial(classify_in_worker, with_keywords=with_keywords))
+
+    for paths, results in batches:
+        yield from zip(paths, results)
+
+
+def summarize_directory(classifier, root: str, workers: Optional[int] = None, chunk_size: int = 256,
+                        read_threads: int = DEFAULT_READ_THREADS, pattern: str = '*') -> CorpusReport:
+    """
+    Clasifica un árbol de directorios y retorna solo su reporte agregado
+
+    Cada proceso resume sus bloques en un CorpusReport parcial; al proceso principal
+    vuelven esos parciales, nunca los resultados por documento. Los argumentos son
+    los de classify_directory.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _iter_directory_chunks(classifier, root, chunk_size, read_threads, pattern)
+    report = CorpusReport(classifier.service_types, classifier.keywords)
+
+    if workers == 1:
+        for _, texts in chunks:
+            report.update(classifier.classify_batch(texts, workers=1, with_keywords=True))
+    else:
+        for _, partial_report in _classify_chunks_in_pool(classifier, chunks, workers,
+                                                          partial(summarize_in_worker, classify_in_worker)):
+            report.merge(partial_report)
+    return report
+
+
+def _iter_directory_chunks(classifier, root: str, chunk_size: int, read_threads: int,
+                           pattern: str) -> Iterator[Tuple[List[str], List[str]]]:
+    """Bloques (rutas, textos) del árbol, con la lectura medida si hay estadísticas activas"""
+    read = read_document
+    if classifier.stats is not None:
+        read = classifier.stats.timed_call(read_document, 'lectura')
+    return iter_chunks(iter_documents(iter_document_paths(root, pattern), read_threads, read), chunk_size)
+
+
+def _classify_chunks_in_pool(classifier, chunks: Iterator[Tuple[List[str], List[str]]], workers: int,
+                             task: Callable) -> Iterator[Tuple[List[str], object]]:
+    """
+    Reparte los bloques en el pool compartido y entrega en orden de recorrido las rutas
+    de cada bloque junto con lo que retorna `task(textos)`
+    """
+    # Los hilos solo leen los bloques que caben en la ventana del pool; el resto del árbol espera en disco
+    return run_in_pool(classifier, ((paths, (texts,)) for paths, texts in chunks), workers, task)
@@ -0,0 +1,158 @@
+"""
+Seguimiento de un archivo de log que crece (--follow), al estilo de tail -f
+Lee solo los bytes agregados desde la última lectura, entrega las líneas completas
+y guarda la posición ya procesada en un archivo de estado, de modo que al reiniciar
+se continúa donde se quedó. Detecta truncamientos y rotaciones del archivo
+"""
+
+import json
+import os
+import sys
+from typing import List, Optional, Tuple
+
+# Intervalo por defecto entre revisiones del archivo cuando no hay líneas nuevas
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Bytes leídos como máximo en cada lectura: acota la memoria al alcanzar un archivo grande
+READ_BLOCK_SIZE = 1024 * 1024
+
+# Sufijo del archivo de estado por defecto, junto al archivo seguido
+STATE_SUFFIX = '.posicion'
+
+
+class FileFollower:
+    """
+    Lector incremental de un archivo de líneas con posición persistente
+
+    read_lines entrega las líneas completas nuevas; checkpoint guarda la posición
+    de la última línea entregada. Llamar a checkpoint solo después de procesar las
+    líneas hace que un reinicio nunca se salte ninguna (a lo sumo repite el último
+    bloque si el proceso terminó entre ambos pasos).
+    """
+
+    def __init__(self, path: str, state_path: Optional[str] = None):
+        """
+        Args:
+            path (str): Archivo a seguir
+            state_path (Optional[str]): Archivo de estado (por defecto, `path` + '.posicion')
+        """
+        self.path = path
+        self.state_path = state_path or path + STATE_SUFFIX
+        self._file = None
+        self._identity: Optional[Tuple[int, int]] = None
+        # Posición del final de la última línea completa entregada
+        self.offset = 0
+        # Bytes leídos después de esa línea que aún no terminan en salto de línea
+        self._partial = b''
+        self._saved_offset: Optional[int] = None
+
+    def read_lines(self) -> List[Tuple[int, str]]:
+        """
+        Lee las líneas completas agregadas desde la última llamada
+
+        Returns:
+            List[Tuple[int, str]]: (posición en bytes del inicio de la línea, texto); vacía si no hay nada nuevo
+        """
+        if self._file is None and not self._open():
+            return []
+
+        data = self._file.read(READ_BLOCK_SIZE)
+        if data:
+            return self._split(data)
+
+        # Sin datos nuevos: revisar si el archivo se truncó o si otro ocupó su lugar
+        if os.fstat(self._file.fileno()).st_size < self.offset + len(self._partial):
+            print(f"Advertencia: '{self.path}' se truncó; se lee desde el inicio.", file=sys.stderr)
+            self._file.seek(0)
+            self.offset = 0
+            self._partial = b''
+            return []
+        if self._rotated():
+            # El archivo anterior ya no crecerá: su última línea sin salto de línea también cuenta
+            lines = self._split(b'\n') if self._partial else []
+            self._file.close()
+            self._file = None
+            self._open(resume=False)
+            return lines
+        return []
+
+    def checkpoint(self):
+        """Guarda la posición de la última línea entregada (escritura atómica)"""
+        if self._identity is None or self.offset == self._saved_offset:
+            return
+        device, inode = self._identity
+        state = {'archivo': os.path.abspath(self.path), 'dispositivo': device, 'inodo': inode,
+                 'posicion': self.offset}
+        temporary_path = self.state_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+        os.replace(temporary_path, self.state_path)
+        self._saved_offset = self.offset
+
+    def close(self):
+        """Cierra el archivo seguido; la posición guardada no cambia"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self, resume: bool = True) -> bool:
+        """Abre el archivo seguido; con `resume`, en la posición del archivo de estado si sigue siendo válida"""
+        try:
+            self._file = open(self.path, 'rb')
+        except FileNotFoundError:
+            # Aún no existe (o está en plena rotación): se reintenta en la próxima revisión
+            return False
+
+        status = os.fstat(self._file.fileno())
+        self._identity = (status.st_dev, status.st_ino)
+        self.offset = 0
+        self._partial = b''
+        # Sin reanudar, el próximo checkpoint debe registrar el archivo nuevo aunque la posición coincida
+        self._saved_offset = None
+        if resume:
+            self.offset = self._saved_offset = self._load_offset(status)
+        self._file.seek(self.offset)
+        return True
+
+    def _load_offset(self, status: os.stat_result) -> int:
+        """Posición guardada para este mismo archivo, o 0 si no aplica"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            print(f"Advertencia: no se pudo leer el estado '{self.state_path}' ({e}); se lee desde el inicio.",
+                  file=sys.stderr)
+            return 0
+
+        if (state.get('dispositivo'), state.get('inodo')) != (status.st_dev, status.st_ino):
+            print(f"Advertencia: '{self.path}' fue reemplazado desde la última ejecución; se lee desde el inicio.",
+                  file=sys.stderr)
+            return 0
+        offset = state.get('posicion', 0)
+        if not isinstance(offset, int) or offset > status.st_size:
+            print(f"Advertencia: '{self.path}' se truncó desde la última ejecución; se lee desde el inicio.",
+                  file=sys.stderr)
+            return 0
+        return offset
+
+    def _rotated(self) -> bool:
+        """Indica si la ruta seguida apunta ahora a otro archivo"""
+        try:
+            status = os.stat(self.path)
+        except FileNotFoundError:
+            # Renombrado y aún sin reemplazo: seguir esperando en el archivo actual
+            return False
+        return (status.st_dev, status.st_ino) != self._identity
+
+    def _split(self, data: bytes) -> List[Tuple[int, str]]:
+        """Separa en líneas completas los bytes leídos; el resto queda pendiente"""
+        buffer = self._partial + data
+        *lines, self._partial = buffer.split(b'\n')
+        records = []
+        for line in lines:
+            text = line[:-1] if line.endswith(b'\r') else line
+            records.append((self.offset, text.decode('utf-8', errors='replace')))
+            self.offset += len(line) + 1
+        return records
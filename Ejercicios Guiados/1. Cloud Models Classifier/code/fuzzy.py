@@ -0,0 +1,237 @@
+"""
+Coincidencia tolerante a errores de tipeo para el Clasificador de Servicios en la Nube (--fuzzy)
+Índice de borrados simétricos al estilo SymSpell sobre las palabras clave: cada una se
+guarda bajo todas las cadenas que resultan de borrarle hasta N caracteres, y cada palabra
+del texto se busca generando sus propios borrados, así que una consulta cuesta lo mismo
+sin importar cuántas palabras clave tenga el diccionario. Una palabra clave encontrada
+solo con errores cuenta como coincidencia parcial: nunca recibe el bonus de palabra completa.
+Con 2 errores solo se aceptan palabras de largo parecido al de la palabra clave: dos
+borrados convierten palabras comunes en palabras clave ('servir' en 'servidor'). Tampoco
+se corrigen palabras que difieren de la palabra clave en la primera letra ni solo en la
+última, que son otras palabras ('locker', 'fisco') o flexiones ('registra', 'pruebas',
+'built'), ni las palabras comunes de COMMON_WORDS ('tasting', 'subset')
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+MAX_FUZZY_DISTANCE = 2
+DEFAULT_FUZZY_DISTANCE = 1
+
+# Versión de las reglas de corrección; entra en la huella de la caché de resultados
+FUZZY_VERSION = '3'
+
+# Largo mínimo de una palabra clave para tolerarle 1 o 2 errores: en palabras cortas un
+# solo error ya convierte palabras comunes en palabras clave ('red', 'api', 'web')
+MIN_KEYWORD_LENGTH = {1: 5, 2: 8}
+
+# Diferencia máxima de largo entre la palabra del texto y la palabra clave al tolerar
+# 2 errores: así los 2 errores son sustituciones, transposiciones o un borrado más una
+# inserción, y no 2 letras de menos o de más
+MAX_LENGTH_DIFFERENCE = 1
+
+# Palabras comunes a un error de tipeo de alguna palabra clave por defecto que las reglas
+# anteriores no descartan: son palabras reales y nunca se corrigen
+COMMON_WORDS = frozenset(
+    "compito decker dicker lagging lambada legging lodging longing lugging stowage subset "
+    "tasting tenting texting tigger".split()
+)
+
+# Palabras del texto cuya corrección se recuerda antes de vaciar la memoria
+CORRECTION_CACHE_SIZE = 100_000
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def allowed_distance(keyword: str, max_distance: int = DEFAULT_FUZZY_DISTANCE) -> int:
+    """Errores que se toleran en una palabra clave según su largo; 0 si no admite errores"""
+    if not TOKEN_PATTERN.fullmatch(keyword):
+        # Las palabras clave de varias palabras o con símbolos ('sin servidor', 'ci/cd') solo coinciden exactas
+        return 0
+    return max((distance for distance in range(1, max_distance + 1)
+                if len(keyword) >= MIN_KEYWORD_LENGTH[distance]), default=0)
+
+
+def is_plausible_typo(token: str, keyword: str) -> bool:
+    """
+    Indica si la diferencia entre `token` y `keyword` puede ser un error de tipeo y no
+    otra palabra: comparten la primera letra y no difieren solo en la última
+    ('registra', 'correr' y 'pruebas' son flexiones de 'registro', 'correo' y 'prueba')
+    """
+    if token[0] != keyword[0]:
+        return False
+    return token[:-1] != keyword[:-1] and token != keyword[:-1] and token[:-1] != keyword
+
+
+def deletions(word: str, distance: int) -> Set[str]:
+    """La palabra y todas las cadenas que resultan de borrarle hasta `distance` caracteres"""
+    found = {word}
+    level = {word}
+    for _ in range(distance):
+        level = {item[:index] + item[index + 1:] for item in level for index in range(len(item))}
+        found |= level
+    return found
+
+
+def edit_distance(first: str, second: str, limit: int) -> int:
+    """
+    Distancia de edición entre dos palabras contando inserciones, borrados, sustituciones
+    y transposiciones de caracteres vecinos; si supera `limit` retorna limit + 1
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    before_previous: List[int] = []
+    previous = list(range(len(second) + 1))
+    for row in range(1, len(first) + 1):
+        current = [row] + [0] * len(second)
+        for column in range(1, len(second) + 1):
+            value = min(previous[column] + 1, current[column - 1] + 1,
+                        previous[column - 1] + (first[row - 1] != second[column - 1]))
+            if (row > 1 and column > 1 and first[row - 1] == second[column - 2]
+                    and first[row - 2] == second[column - 1]):
+                value = min(value, before_previous[column - 2] + 1)
+            current[column] = value
+        if min(current) > limit:
+            # Ninguna alineación puede volver a bajar del límite
+            return limit + 1
+        before_previous, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class FuzzyKeywordIndex:
+    """
+    Índice de borrados simétricos sobre las palabras clave de una sola palabra
+
+    Dos palabras a distancia de edición d comparten al menos una cadena obtenida borrando
+    hasta d caracteres de cada una. Los borrados de las palabras clave se precalculan al
+    compilar el modelo; una palabra del texto genera los suyos y solo se compara de verdad
+    con las palabras clave que comparten alguno. Las correcciones ya resueltas se recuerdan;
+    las palabras sin corrección, que son casi todas, se descartan con una sola diferencia
+    de conjuntos por texto.
+    """
+
+    def __init__(self, keywords: Iterable[str], max_distance: int = DEFAULT_FUZZY_DISTANCE):
+        """
+        Args:
+            keywords (Iterable[str]): Palabras clave ya normalizadas con fold_text
+            max_distance (int): Errores máximos tolerados (1 o 2)
+        """
+        if not 1 <= max_distance <= MAX_FUZZY_DISTANCE:
+            raise ValueError(f"La distancia de --fuzzy debe estar entre 1 y {MAX_FUZZY_DISTANCE}")
+        self.max_distance = max_distance
+        self.keywords = frozenset(keywords)
+
+        deletes: Dict[str, List[str]] = {}
+        for keyword in sorted(self.keywords):
+            distance = allowed_distance(keyword, max_distance)
+            if distance:
+                for deleted in deletions(keyword, distance):
+                    deletes.setdefault(deleted, []).append(keyword)
+        self._deletes = {deleted: tuple(candidates) for deleted, candidates in deletes.items()}
+        self._set_token_limits()
+
+    def to_state(self) -> Dict:
+        """Estado precalculado del índice, serializable con marshal"""
+        return {
+            'max_distance': self.max_distance,
+            'keywords': tuple(sorted(self.keywords)),
+            'deletes': self._deletes
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'FuzzyKeywordIndex':
+        """Reconstruye el índice sin volver a generar los borrados"""
+        index = cls.__new__(cls)
+        index.max_distance = state['max_distance']
+        index.keywords = frozenset(state['keywords'])
+        index._deletes = state['deletes']
+        index._set_token_limits()
+        return index
+
+    def _set_token_limits(self):
+        """Largos fuera de los cuales una palabra del texto no puede corregirse a ninguna palabra clave"""
+        eligible = [len(keyword) for keyword in self.keywords if allowed_distance(keyword, self.max_distance)]
+        max_difference = min(self.max_distance, MAX_LENGTH_DIFFERENCE)
+        self._min_token_length = min(MIN_KEYWORD_LENGTH[distance] - min(distance, MAX_LENGTH_DIFFERENCE)
+                                     for distance in range(1, self.max_distance + 1))
+        self._max_token_length = max(eligible, default=0) + max_difference
+        self._corrections: Dict[str, str] = {}
+        self._uncorrectable: Set[str] = set()
+
+    def correct(self, token: str) -> Optional[str]:
+        """
+        Palabra clave de la que `token` es una versión con errores de tipeo
+
+        Returns:
+            Optional[str]: La palabra clave más cercana dentro de su tolerancia (a igual
+            distancia, la primera en orden alfabético), o None si no hay ninguna
+        """
+        keyword = self._corrections.get(token)
+        if keyword is not None or token in self._uncorrectable:
+            return keyword
+        if len(self._corrections) + len(self._uncorrectable) >= CORRECTION_CACHE_SIZE:
+            self._corrections.clear()
+            self._uncorrectable.clear()
+        keyword = self._lookup(token)
+        if keyword is None:
+            self._uncorrectable.add(token)
+        else:
+            self._corrections[token] = keyword
+        return keyword
+
+    def _lookup(self, token: str) -> Optional[str]:
+        """Busca la corrección de `token` en el índice de borrados"""
+        if (not self._min_token_length <= len(token) <= self._max_token_length
+                or token in self.keywords or token in COMMON_WORDS):
+            return None
+
+        candidates: Set[str] = set()
+        for deleted in deletions(token, self.max_distance):
+            candidates.update(self._deletes.get(deleted, ()))
+
+        best, best_distance = None, self.max_distance + 1
+        for keyword in sorted(candidates):
+            if keyword in token:
+                # La búsqueda exacta ya la reporta como coincidencia parcial ('servidores')
+                continue
+            if abs(len(token) - len(keyword)) > MAX_LENGTH_DIFFERENCE or not is_plausible_typo(token, keyword):
+                continue
+            limit = allowed_distance(keyword, self.max_distance)
+            distance = edit_distance(token, keyword, limit)
+            if distance <= limit and distance < best_distance:
+                best, best_distance = keyword, distance
+        return best
+
+    def corrections_in(self, text_lower: str) -> Dict[str, str]:
+        """Palabras distintas del texto que se corrigen a alguna palabra clave (palabra -> palabra clave)"""
+        found = {}
+        for token in set(TOKEN_PATTERN.findall(text_lower)) - self._uncorrectable:
+            keyword = self.correct(token)
+            if keyword is not None:
+                found[token] = keyword
+        return found
+
+    def find(self, text_lower: str, hits: Dict[str, bool]):
+        """Agrega a las coincidencias de KeywordMatcher.find las palabras clave que solo aparecen con errores"""
+        for keyword in self.corrections_in(text_lower).values():
+            if keyword not in hits:
+                hits[keyword] = False
+
+    def find_spans(self, text_lower: str, spans: Dict[str, List]):
+        """
+        Agrega a las apariciones de KeywordMatcher.find_spans las de las palabras con errores
+
+        Se agregan aunque la palabra clave también aparezca exacta: como nunca son palabra
+        completa, el resultado de cualquier tramo del texto coincide con el de find.
+        """
+        found = self.corrections_in(text_lower)
+        if not found:
+            return
+        added = set()
+        for match in TOKEN_PATTERN.finditer(text_lower):
+            keyword = found.get(match.group())
+            if keyword is not None:
+                spans.setdefault(keyword, []).append((match.start(), match.end(), False))
+                added.add(keyword)
+        for keyword in added:
+            spans[keyword].sort()
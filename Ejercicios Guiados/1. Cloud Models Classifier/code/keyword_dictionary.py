@@ -0,0 +1,173 @@
+"""
+Diccionario de palabras clave externo del Clasificador de Servicios en la Nube
+Carga los pesos desde un archivo JSON o YAML y, en los procesos residentes, vigila
+el archivo para recompilar el modelo y reemplazarlo de forma atómica cuando cambia
+"""
+
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+from numbers import Real
+from typing import Dict, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:  # PyYAML es opcional: solo lo necesitan los diccionarios .yaml/.yml
+    yaml = None
+
+# Segundos entre revisiones del archivo del diccionario
+DEFAULT_RELOAD_INTERVAL = 2.0
+
+YAML_EXTENSIONS = ('.yaml', '.yml')
+
+
+def parse_keywords(data: bytes, path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Interpreta el contenido de un diccionario según la extensión del archivo
+
+    El formato es un objeto con un objeto por tipo de servicio que asocia cada
+    palabra clave a su peso (finito y no negativo), igual que DEFAULT_KEYWORDS.
+
+    Raises:
+        ValueError: Si el contenido no se puede leer o no tiene ese formato
+    """
+    if path.lower().endswith(YAML_EXTENSIONS):
+        if yaml is None:
+            raise ValueError("PyYAML no está instalado; instálalo con 'pip install pyyaml' o usa un diccionario JSON")
+        try:
+            keywords = yaml.safe_load(data)
+        except yaml.YAMLError as e:
+            raise ValueError(f"YAML inválido: {e}") from e
+    else:
+        try:
+            keywords = json.loads(data)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON inválido: {e}") from e
+
+    if not isinstance(keywords, dict) or not keywords:
+        raise ValueError("El diccionario debe ser un objeto con al menos un tipo de servicio")
+    for service_type, weights in keywords.items():
+        if not isinstance(weights, dict):
+            raise ValueError(f"Las palabras clave de '{service_type}' deben ser un objeto palabra: peso")
+        for keyword, weight in weights.items():
+            if not isinstance(keyword, str) or not keyword.strip():
+                raise ValueError(f"Palabra clave vacía o no textual en '{service_type}'")
+            if isinstance(weight, bool) or not isinstance(weight, Real):
+                raise ValueError(f"El peso de '{keyword}' en '{service_type}' debe ser un número")
+            # Con pesos negativos la suma de los máximos puede dar 0 y la confianza dividiría por cero
+            if not math.isfinite(weight) or weight < 0:
+                raise ValueError(f"El peso de '{keyword}' en '{service_type}' debe ser un número finito "
+                                 f"mayor o igual a 0 (se leyó {weight})")
+    return keywords
+
+
+def load_keywords_file(path: str) -> Tuple[Dict[str, Dict[str, float]], str]:
+    """
+    Lee un diccionario de palabras clave
+
+    Returns:
+        Tuple[Dict[str, Dict[str, float]], str]: (diccionario, hash SHA-256 del contenido)
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    return parse_keywords(data, path), hashlib.sha256(data).hexdigest()
+
+
+def save_keywords_file(keywords: Dict[str, Dict[str, float]], path: str):
+    """
+    Guarda un diccionario de palabras clave en JSON o YAML según la extensión, en el
+    formato que lee load_keywords_file
+
+    Raises:
+        ValueError: Si se pide YAML y PyYAML no está instalado
+    """
+    if path.lower().endswith(YAML_EXTENSIONS):
+        if yaml is None:
+            raise ValueError("PyYAML no está instalado; instálalo con 'pip install pyyaml' o usa un diccionario JSON")
+        data = yaml.safe_dump(keywords, allow_unicode=True, sort_keys=False)
+    else:
+        data = json.dumps(keywords, ensure_ascii=False, indent=2) + '\n'
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(data)
+
+
+class KeywordDictionaryWatcher:
+    """
+    Vigila el archivo del diccionario y recompila el modelo del clasificador cuando cambia
+
+    Cada revisión solo consulta la fecha de modificación y el tamaño; el archivo se lee
+    y se compara su hash únicamente cuando estos cambian, y se recompila solo si el
+    contenido es distinto. Un diccionario inválido se reporta y se conserva el anterior.
+    """
+
+    def __init__(self, classifier, path: str, interval: float = DEFAULT_RELOAD_INTERVAL,
+                 digest: Optional[str] = None, verbose: bool = False):
+        """
+        Args:
+            classifier (CloudServiceClassifier): Clasificador cuyo modelo se reemplaza
+            path (str): Archivo JSON o YAML del diccionario
+            interval (float): Segundos entre revisiones del archivo
+            digest (Optional[str]): Hash del contenido con el que ya se compiló el modelo vigente
+            verbose (bool): Avisar en stderr de cada recarga
+        """
+        self.classifier = classifier
+        self.path = path
+        self.interval = interval
+        self.verbose = verbose
+        self.reloads = 0
+
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._digest = digest
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        """Revisa el archivo una vez; retorna True si se puso en uso un modelo nuevo"""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        # Un archivo inválido o a medio escribir no se reintenta hasta que vuelva a cambiar
+        self._stamp = stamp
+        try:
+            keywords, digest = load_keywords_file(self.path)
+        except (OSError, ValueError) as e:
+            print(f"Advertencia: no se pudo recargar el diccionario '{self.path}' ({e}); "
+                  f"se mantiene el modelo anterior.", file=sys.stderr)
+            return False
+
+        if digest == self._digest:
+            return False
+        self.classifier.set_keywords(keywords)
+        self._digest = digest
+        self.reloads += 1
+        if self.verbose:
+            print(f"Diccionario '{self.path}' recargado (huella {self.classifier.keywords_fingerprint[:12]})",
+                  file=sys.stderr)
+        return True
+
+    def start(self):
+        """Revisa el archivo periódicamente en un hilo en segundo plano"""
+        self._thread = threading.Thread(target=self._run, name='recarga-diccionario', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Detiene la revisión periódica"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """Fecha de modificación y tamaño del archivo (None si no se puede consultar)"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
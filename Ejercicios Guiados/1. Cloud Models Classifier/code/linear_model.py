@@ -0,0 +1,215 @@
+"""
+Motor lineal del Clasificador de Servicios en la Nube
+Representa cada texto con n-gramas de palabras mapeados por hash a un vector de
+tamaño fijo y lo clasifica con una regresión logística multinomial entrenada a
+partir de un CSV etiquetado. Los pesos se guardan en arreglos compactos de float32,
+así que clasificar un texto es un producto punto disperso por clase
+"""
+
+import json
+import math
+import random
+import re
+import struct
+import time
+import zlib
+from array import array
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from normalization import NORMALIZATION_VERSION, fold_text
+
+# Bits del espacio de hash: 2**18 pesos por clase (1 MiB por clase en float32)
+DEFAULT_HASH_BITS = 18
+
+# Longitud máxima de los n-gramas de palabras (1 = solo palabras sueltas)
+DEFAULT_NGRAM = 2
+
+# Parámetros del descenso por gradiente estocástico
+DEFAULT_EPOCHS = 5
+DEFAULT_LEARNING_RATE = 0.5
+
+# Encabezado y versión del formato binario de los modelos lineales
+LINEAR_MAGIC = b'CMLM'
+LINEAR_FORMAT_VERSION = 1
+LINEAR_PREFIX_SIZE = len(LINEAR_MAGIC) + struct.calcsize('<HI')
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def extract_features(text_lower: str, mask: int, ngram: int = DEFAULT_NGRAM) -> List[int]:
+    """
+    Índices (sin repetir) de los n-gramas de un texto ya normalizado con fold_text
+
+    Se usa CRC-32 en lugar de hash() porque debe dar el mismo índice en todos los
+    procesos y ejecuciones (hash() de str cambia con cada intérprete).
+    """
+    tokens = TOKEN_PATTERN.findall(text_lower)
+    grams = list(tokens)
+    for size in range(2, ngram + 1):
+        grams += [' '.join(tokens[start:start + size]) for start in range(len(tokens) - size + 1)]
+    return list({zlib.crc32(gram.encode('utf-8')) & mask for gram in grams})
+
+
+def softmax(values: Sequence[float]) -> List[float]:
+    """Probabilidades a partir de los puntajes lineales de cada clase"""
+    top = max(values)
+    exps = [math.exp(value - top) for value in values]
+    total = sum(exps)
+    return [value / total for value in exps]
+
+
+class LinearModel:
+    """
+    Regresión logística multinomial sobre n-gramas con hash
+
+    Cada clase tiene un arreglo de 2**hash_bits pesos y un sesgo; el puntaje de una
+    clase es el sesgo más la suma de los pesos de los índices presentes en el texto.
+    """
+
+    def __init__(self, classes: Sequence[str], hash_bits: int = DEFAULT_HASH_BITS, ngram: int = DEFAULT_NGRAM,
+                 weights: Optional[List[array]] = None, bias: Optional[List[float]] = None):
+        """
+        Args:
+            classes (Sequence[str]): Etiquetas (tipos de servicio) que distingue el modelo
+            hash_bits (int): Bits del espacio de hash de los n-gramas
+            ngram (int): Longitud máxima de los n-gramas de palabras
+            weights (Optional[List[array]]): Pesos por clase; por defecto, ceros
+            bias (Optional[List[float]]): Sesgo por clase; por defecto, ceros
+        """
+        self.classes = list(classes)
+        self.hash_bits = hash_bits
+        self.ngram = ngram
+        self.mask = (1 << hash_bits) - 1
+        size = 1 << hash_bits
+        self.weights = weights if weights is not None else [array('f', bytes(4 * size)) for _ in self.classes]
+        self.bias = list(bias) if bias is not None else [0.0] * len(self.classes)
+
+    def features(self, text: str) -> List[int]:
+        """Índices de los n-gramas presentes en el texto"""
+        return extract_features(fold_text(text), self.mask, self.ngram)
+
+    def decision(self, features: List[int]) -> List[float]:
+        """Puntaje lineal de cada clase: producto punto disperso con los pesos"""
+        return [bias + sum(map(weights.__getitem__, features)) for weights, bias in zip(self.weights, self.bias)]
+
+    def classify(self, text: str) -> Tuple[str, float, Dict[str, float]]:
+        """
+        Clasifica un texto
+
+        Returns:
+            Tuple[str, float, Dict[str, float]]: (clase, probabilidad de la clase, probabilidad
+            de cada clase), con la misma forma que classify_text
+        """
+        if not text or not text.strip():
+            return "No clasificable", 0.0, {}
+        probabilities = softmax(self.decision(self.features(text)))
+        best = max(range(len(self.classes)), key=probabilities.__getitem__)
+        scores = {label: round(probability, 4) for label, probability in zip(self.classes, probabilities)}
+        return self.classes[best], probabilities[best], scores
+
+    def fit(self, texts: Sequence[str], labels: Sequence[str], epochs: int = DEFAULT_EPOCHS,
+            learning_rate: float = DEFAULT_LEARNING_RATE, seed: int = 42):
+        """
+        Entrena los pesos con descenso por gradiente estocástico sobre la log-verosimilitud
+
+        La tasa de aprendizaje decae con cada época; el orden de los ejemplos se
+        baraja con `seed` para que el entrenamiento sea reproducible.
+        """
+        class_index = {label: index for index, label in enumerate(self.classes)}
+        examples = [(self.features(text), class_index[label]) for text, label in zip(texts, labels)]
+        generator = random.Random(seed)
+
+        for epoch in range(epochs):
+            generator.shuffle(examples)
+            rate = learning_rate / (1 + epoch)
+            for features, target in examples:
+                probabilities = softmax(self.decision(features))
+                for index, probability in enumerate(probabilities):
+                    gradient = probability - (1.0 if index == target else 0.0)
+                    step = rate * gradient
+                    weights = self.weights[index]
+                    for feature in features:
+                        weights[feature] -= step
+                    self.bias[index] -= step
+
+    def to_bytes(self) -> bytes:
+        """Serializa el modelo: encabezado JSON seguido de los pesos float32 de cada clase"""
+        header = json.dumps({
+            'clases': self.classes,
+            'bits_hash': self.hash_bits,
+            'ngramas': self.ngram,
+            'sesgo': self.bias,
+            'normalizacion': NORMALIZATION_VERSION
+        }, ensure_ascii=False).encode('utf-8')
+        # Relleno con espacios (JSON válido): los pesos quedan alineados a 4 bytes para leerlos sin copiar
+        header += b' ' * (-(LINEAR_PREFIX_SIZE + len(header)) % 4)
+        return b''.join([LINEAR_MAGIC, struct.pack('<HI', LINEAR_FORMAT_VERSION, len(header)), header]
+                        + [weights.tobytes() for weights in self.weights])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'LinearModel':
+        """Reconstruye un modelo serializado con to_bytes (los pesos se copian a arreglos propios)"""
+        header, bodies = cls._parse(memoryview(data))
+        weights = []
+        for body in bodies:
+            class_weights = array('f')
+            class_weights.frombytes(body)
+            weights.append(class_weights)
+        return cls(header['clases'], header['bits_hash'], header['ngramas'], weights, header['sesgo'])
+
+    @classmethod
+    def from_buffer(cls, buffer: memoryview) -> 'LinearModel':
+        """
+        Reconstruye un modelo serializado con to_bytes leyendo los pesos directamente del buffer
+
+        Sirve para modelos publicados en memoria compartida: ningún proceso copia los
+        pesos. El modelo resultante es de solo lectura (no se puede volver a entrenar).
+        """
+        header, bodies = cls._parse(buffer.toreadonly())
+        weights = [body.cast('f') for body in bodies]
+        return cls(header['clases'], header['bits_hash'], header['ngramas'], weights, header['sesgo'])
+
+    @staticmethod
+    def _parse(data: memoryview) -> Tuple[Dict, List[memoryview]]:
+        """Valida un modelo serializado; retorna (encabezado, vista de los pesos de cada clase)"""
+        if bytes(data[:len(LINEAR_MAGIC)]) != LINEAR_MAGIC:
+            raise ValueError("El archivo no es un modelo lineal del clasificador")
+        version, header_size = struct.unpack('<HI', data[len(LINEAR_MAGIC):LINEAR_PREFIX_SIZE])
+        if version != LINEAR_FORMAT_VERSION:
+            raise ValueError(f"Versión de modelo lineal no soportada: {version}")
+        header = json.loads(bytes(data[LINEAR_PREFIX_SIZE:LINEAR_PREFIX_SIZE + header_size]).decode('utf-8'))
+        if header['normalizacion'] != NORMALIZATION_VERSION:
+            raise ValueError("El modelo lineal se entrenó con otra normalización de textos; vuelve a entrenarlo")
+
+        size = 4 << header['bits_hash']
+        body = data[LINEAR_PREFIX_SIZE + header_size:]
+        if len(body) != size * len(header['clases']):
+            raise ValueError("El modelo lineal está truncado o dañado")
+        return header, [body[size * index:size * (index + 1)] for index in range(len(header['clases']))]
+
+    def save(self, path: str):
+        """Guarda el modelo en un archivo binario"""
+        with open(path, 'wb') as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'LinearModel':
+        """Carga un modelo guardado con save"""
+        with open(path, 'rb') as file:
+            return cls.from_bytes(file.read())
+
+
+def evaluate(classify_batch: Callable[[List[str]], List[Tuple[str, float, Dict[str, float]]]],
+             texts: List[str], labels: List[str]) -> Tuple[float, float]:
+    """
+    Mide la exactitud y el rendimiento de una función de clasificación por lotes
+
+    Returns:
+        Tuple[float, float]: (exactitud, documentos por segundo)
+    """
+    start = time.perf_counter()
+    results = classify_batch(texts)
+    elapsed = time.perf_counter() - start
+    hits = sum(1 for (predicted, _, _), label in zip(results, labels) if predicted == label)
+    accuracy = hits / len(labels) if labels else 0.0
+    return accuracy, (len(texts) / elapsed if elapsed > 0 else 0.0)
@@ -0,0 +1,110 @@
+"""
+Normalización de textos del Clasificador de Servicios en la Nube
+Pliega mayúsculas y diacríticos ("Aplicación" -> "aplicacion") con tablas de traducción
+precalculadas al importar el módulo, sin consultar unicodedata carácter por carácter
+"""
+
+import codecs
+import threading
+import unicodedata
+from itertools import chain
+from typing import Dict, Optional
+
+# Identifica el plegado vigente; forma parte de la huella del modelo (y de la caché)
+NORMALIZATION_VERSION = 'minusculas-sin-diacriticos-1'
+
+# Bloques cuyos caracteres precompuestos se pliegan a su letra base:
+# Latin-1, Latin Extended-A/B, griego y Latin Extended Additional / griego extendido
+FOLDED_BLOCKS = ((0x00C0, 0x0250), (0x0370, 0x0400), (0x1E00, 0x2000))
+
+# Marcas diacríticas combinables (texto en forma NFD): se eliminan
+COMBINING_MARKS = (0x0300, 0x0370)
+
+
+def _base_char(char: str) -> str:
+    """Letra base de un carácter precompuesto, siguiendo su descomposición canónica"""
+    while True:
+        decomposition = unicodedata.decomposition(char)
+        if not decomposition or decomposition.startswith('<'):
+            return char
+        char = chr(int(decomposition.split()[0], 16))
+
+
+def build_fold_table() -> Dict[int, Optional[str]]:
+    """
+    Construye la tabla de plegado de diacríticos para str.translate
+
+    Las claves son caracteres ya en minúsculas; el texto se pasa a minúsculas antes
+    (o en la misma traducción, ver LATIN1_FOLD_TABLE).
+    """
+    table: Dict[int, Optional[str]] = {}
+    for first, last in FOLDED_BLOCKS:
+        for code_point in range(first, last):
+            char = chr(code_point)
+            if char.lower() != char:
+                continue
+            base = _base_char(char).lower()
+            if len(base) == 1 and base != char:
+                table[code_point] = base
+    for code_point in range(*COMBINING_MARKS):
+        table[code_point] = None
+    return table
+
+
+FOLD_TABLE = build_fold_table()
+
+# Minúsculas y plegado en una sola traducción de bytes para todo el rango Latin-1
+LATIN1_FOLD_TABLE = bytes(
+    ord(FOLD_TABLE.get(ord(chr(byte).lower()), chr(byte).lower())) for byte in range(256)
+)
+
+# Separadores candidatos para apartar los tramos fuera de Latin-1 (se usa uno ausente del texto)
+_SEPARATORS = tuple(chr(code_point) for code_point in range(32))
+
+# Estado del manejador de errores de codificación, por hilo (el servicio clasifica en paralelo)
+_wide_runs = threading.local()
+
+
+def _extract_wide_run(error: UnicodeEncodeError):
+    """Manejador de codificación: aparta un tramo fuera de Latin-1 y deja un separador en su lugar"""
+    _wide_runs.runs.append(error.object[error.start:error.end])
+    return _wide_runs.separator, error.end
+
+
+codecs.register_error('clasificador-tramos-anchos', _extract_wide_run)
+
+
+def fold_text(text: str) -> str:
+    """
+    Pasa el texto a minúsculas y elimina sus diacríticos
+
+    Los textos ASCII se resuelven con str.lower y los textos Latin-1 (casi todo el
+    español y el inglés) con una sola traducción de bytes. Con caracteres fuera de
+    Latin-1 (comillas tipográficas, emoji, griego...) solo esos tramos pasan por
+    str.translate, que es mucho más lento por carácter. Salvo en las marcas combinables
+    eliminadas, el resultado conserva la longitud del texto.
+
+    Args:
+        text (str): Texto a normalizar
+
+    Returns:
+        str: Texto normalizado, comparable con las palabras clave plegadas del modelo
+    """
+    if text.isascii():
+        return text.lower()
+    try:
+        return text.encode('latin-1').translate(LATIN1_FOLD_TABLE).decode('latin-1')
+    except UnicodeEncodeError:
+        pass
+
+    separator = next((char for char in _SEPARATORS if char not in text), None)
+    if separator is None:
+        return text.lower().translate(FOLD_TABLE)
+
+    # La codificación aparta cada tramo ancho; el resto se pliega con la traducción de bytes
+    _wide_runs.runs = runs = []
+    _wide_runs.separator = separator
+    encoded = text.encode('latin-1', 'clasificador-tramos-anchos')
+    segments = encoded.translate(LATIN1_FOLD_TABLE).decode('latin-1').split(separator)
+    folded_runs = separator.join(runs).lower().translate(FOLD_TABLE).split(separator)
+    return ''.join(chain.from_iterable(zip(segments, folded_runs))) + segments[-1]
@@ -0,0 +1,159 @@
+"""
+Motor de puntuación vectorizado (NumPy) del Clasificador de Servicios en la Nube
+Convierte un lote de textos en una matriz documento×palabra clave de coincidencias
+y obtiene los scores de los cuatro tipos de servicio con un solo producto de matrices
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from normalization import fold_text
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: solo lo necesita --engine numpy
+    np = None
+
+NUMPY_AVAILABLE = np is not None
+
+
+# Suma máxima que float64 representa sin redondear cuando todos los sumandos son múltiplos de 0.25
+EXACT_SUM_LIMIT = 2.0 ** 50
+
+
+class VectorizedScorer:
+    """
+    Puntúa lotes de textos con la misma regla que classify_text:
+    peso por cada palabra clave presente más 0.5 × peso si aparece como palabra completa
+
+    El producto de matrices suma en otro orden que classify_text, así que solo se usa
+    cuando el orden no cambia el resultado: pesos múltiplos de 0.5 (los del diccionario
+    por defecto y los de tune), cuyas sumas son exactas en float64. Con otros pesos
+    fraccionarios cada documento se puntúa con model.score sobre las mismas coincidencias.
+    """
+
+    def __init__(self, model):
+        """
+        Args:
+            model (CompiledKeywordModel): Modelo compilado cuyo diccionario y autómata se usan
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy no está instalado; instálalo con 'pip install numpy' o usa --engine python")
+
+        self.model = model
+        self.service_types = list(model.keywords)
+        self.vocabulary = list(model.matcher.keywords)
+        self.keyword_index = {keyword: index for index, keyword in enumerate(self.vocabulary)}
+
+        # Matriz palabra clave × tipo de servicio con los pesos del diccionario
+        self.weights = np.zeros((len(self.vocabulary), len(self.service_types)))
+        # Qué palabras clave pertenecen a cada tipo (aunque pesen 0) y cuáles tienen peso float:
+        # classify_text retorna un score int solo si suma pesos int sin bonus de palabra completa
+        self.membership = np.zeros(self.weights.shape, dtype=np.int64)
+        self.float_membership = np.zeros(self.weights.shape, dtype=np.int64)
+        for column, service_type in enumerate(self.service_types):
+            for keyword, weight in model.keywords[service_type].items():
+                row = self.keyword_index[keyword]
+                self.weights[row, column] = weight
+                self.membership[row, column] = 1
+                self.float_membership[row, column] = isinstance(weight, float)
+        self.exact = all(float(weight * 2).is_integer() for weights in model.keywords.values()
+                         for weight in weights.values()) and 1.5 * self.weights.sum() < EXACT_SUM_LIMIT
+
+    def hit_matrix(self, texts_lower: List[str],
+                   found: Optional[List[Dict[str, bool]]] = None) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Construye las matrices documento×palabra clave de presencia y de palabra completa
+        a partir de textos ya normalizados con fold_text (o de sus coincidencias en `found`)
+
+        Las coincidencias se recolectan como índices dispersos (fila, columna) y se
+        vuelcan de una sola vez en las matrices densas del lote
+        """
+        if found is None:
+            found = [self.model.matcher.find(text_lower) for text_lower in texts_lower]
+        rows: List[int] = []
+        columns: List[int] = []
+        bounded_flags: List[bool] = []
+        keyword_index = self.keyword_index
+        for row, text_hits in enumerate(found):
+            for keyword, bounded in text_hits.items():
+                rows.append(row)
+                columns.append(keyword_index[keyword])
+                bounded_flags.append(bounded)
+
+        shape = (len(texts_lower), len(self.vocabulary))
+        hits = np.zeros(shape, dtype=np.int8)
+        bounded = np.zeros(shape, dtype=np.int8)
+        hits[rows, columns] = 1
+        bounded[rows, columns] = bounded_flags
+        return hits, bounded
+
+    def score_matrix(self, hits: 'np.ndarray', bounded: 'np.ndarray') -> 'np.ndarray':
+        """Scores documento×tipo de servicio a partir de las matrices de coincidencias"""
+        return (hits + 0.5 * bounded) @ self.weights
+
+    def classify(self, texts: List[str], stats=None,
+                 with_keywords: bool = False) -> List[Tuple[str, float, Dict[str, float]]]:
+        """
+        Clasifica un lote de textos
+
+        Args:
+            texts (List[str]): Textos a clasificar
+            stats (Optional[RunStats]): Estadísticas donde sumar los tiempos y aciertos del lote
+            with_keywords (bool): Agregar a cada resultado las palabras clave encontradas (ordenadas)
+
+        Returns:
+            List[Tuple[str, float, Dict[str, float]]]: Mismos resultados (valores y tipos)
+            que classify_text para cada texto, en el orden de entrada
+        """
+        valid = [index for index, text in enumerate(texts) if text and text.strip()]
+        empty = ("No clasificable", 0.0, {}, []) if with_keywords else ("No clasificable", 0.0, {})
+        results: List[Tuple[str, float, Dict[str, float]]] = [empty] * len(texts)
+        if not valid:
+            return results
+
+        start = time.perf_counter()
+        texts_lower = [fold_text(texts[index]) for index in valid]
+        normalized_at = time.perf_counter()
+        found = [self.model.matcher.find(text_lower) for text_lower in texts_lower]
+        hits, bounded = self.hit_matrix(texts_lower, found)
+        matched_at = time.perf_counter()
+
+        if self.exact:
+            self._score_exact(hits, bounded, valid, results)
+        else:
+            for row, index in enumerate(valid):
+                results[index] = self.model.score(found[row])
+
+        for row, index in enumerate(valid):
+            if with_keywords:
+                results[index] += (sorted(self.vocabulary[column] for column in np.flatnonzero(hits[row])),)
+
+        if stats is not None:
+            stats.add('normalizacion', normalized_at - start)
+            stats.add('busqueda', matched_at - normalized_at)
+            stats.add('puntuacion', time.perf_counter() - matched_at)
+            stats.add_hit_counts(dict(zip(self.vocabulary, hits.sum(axis=0).tolist())))
+        return results
+
+    def _score_exact(self, hits: 'np.ndarray', bounded: 'np.ndarray', valid: List[int],
+                     results: List[Tuple[str, float, Dict[str, float]]]):
+        """Puntúa con el producto de matrices; los pesos múltiplos de 0.5 hacen la suma exacta"""
+        scores = self.score_matrix(hits, bounded)
+        # Mismo tipo que classify_text: float si suma algún peso float o algún bonus
+        is_float = ((bounded.astype(np.int64) @ self.membership) + (hits.astype(np.int64) @ self.float_membership)) > 0
+        best_columns = scores.argmax(axis=1)
+        total_possible = self.model.total_possible
+
+        for row, index in enumerate(valid):
+            row_scores = {
+                service_type: float(score) if as_float else int(score)
+                for service_type, score, as_float in zip(self.service_types, scores[row].tolist(), is_float[row].tolist())
+            }
+            best_column = best_columns[row]
+            best_score = row_scores[self.service_types[best_column]]
+            if best_score == 0:
+                results[index] = ("No clasificable", 0.0, row_scores)
+            else:
+                confidence = min(best_score / total_possible, 1.0)
+                results[index] = (self.service_types[best_column], confidence, row_scores)
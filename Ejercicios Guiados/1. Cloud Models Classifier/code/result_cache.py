@@ -0,0 +1,168 @@
+"""
+Caché de resultados del Clasificador de Servicios en la Nube
+Dos niveles: un LRU en memoria y, opcionalmente, una base SQLite que sobrevive
+entre ejecuciones. Las claves combinan el hash del texto normalizado con la huella
+del diccionario de palabras clave, así que cambiar el diccionario invalida todo
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Entradas que conserva el nivel en memoria
+DEFAULT_MEMORY_SIZE = 10_000
+
+# Escrituras acumuladas antes de confirmar la transacción en SQLite
+COMMIT_EVERY = 1000
+
+ClassificationResult = Tuple[str, float, Dict[str, float]]
+
+
+def keywords_fingerprint(keywords: Dict[str, Dict[str, float]], normalization: str = '',
+                         fuzzy_distance: int = 0, fuzzy_version: str = '') -> str:
+    """
+    Calcula una huella estable del diccionario de palabras clave, sus pesos, la normalización
+    de textos y la tolerancia a errores de tipeo con la versión de sus reglas (sin tolerancia,
+    la huella es la de siempre)
+    """
+    state = {'normalizacion': normalization, 'palabras_clave': keywords}
+    if fuzzy_distance:
+        state['errores_tolerados'] = fuzzy_distance
+        state['reglas_tolerancia'] = fuzzy_version
+    canonical = json.dumps(state, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ClassificationCache:
+    """
+    Caché de dos niveles para resultados de classify_text
+    """
+
+    def __init__(self, fingerprint: str, path: Optional[str] = None, memory_size: int = DEFAULT_MEMORY_SIZE):
+        """
+        Args:
+            fingerprint (str): Huella del diccionario de palabras clave vigente
+            path (Optional[str]): Archivo SQLite del nivel persistente (None = solo memoria)
+            memory_size (int): Entradas máximas del nivel en memoria
+        """
+        self.fingerprint = fingerprint
+        self.path = path
+        self.memory_size = memory_size
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._memory: 'OrderedDict[str, ClassificationResult]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending_writes = 0
+        self._connection = self._open_database(path) if path else None
+
+    def _open_database(self, path: str) -> 'sqlite3.Connection':
+        """Abre (o crea) la base persistente y descarta entradas de otro diccionario"""
+        # Importación diferida: solo se paga cuando se usa el nivel persistente
+        import sqlite3
+
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'key TEXT PRIMARY KEY, service_type TEXT, confidence REAL, scores TEXT)'
+        )
+        row = connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if row is None or row[0] != self.fingerprint:
+            # El diccionario cambió: ningún resultado guardado sigue siendo válido
+            self._reset_database(connection)
+        return connection
+
+    def _reset_database(self, connection: 'sqlite3.Connection'):
+        """Vacía los resultados guardados y registra la huella vigente"""
+        connection.execute('DELETE FROM results')
+        connection.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (self.fingerprint,))
+        connection.commit()
+        self._pending_writes = 0
+
+    def set_fingerprint(self, fingerprint: str):
+        """Cambia el diccionario vigente (p. ej. tras recargarlo) y descarta los resultados anteriores"""
+        with self._lock:
+            if fingerprint == self.fingerprint:
+                return
+            self.fingerprint = fingerprint
+            self._memory.clear()
+            if self._connection is not None:
+                self._reset_database(self._connection)
+
+    def make_key(self, text_lower: str, fingerprint: Optional[str] = None) -> str:
+        """
+        Clave de caché: hash del texto normalizado más la huella del diccionario
+
+        Args:
+            text_lower (str): Texto ya normalizado
+            fingerprint (Optional[str]): Huella del modelo que clasifica el texto (por defecto,
+                la vigente); así un resultado del modelo anterior nunca responde por el nuevo
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update((fingerprint or self.fingerprint).encode('ascii'))
+        digest.update(text_lower.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[ClassificationResult]:
+        """Busca un resultado primero en memoria y luego en disco"""
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return result
+
+            if self._connection is not None:
+                row = self._connection.execute(
+                    'SELECT service_type, confidence, scores FROM results WHERE key = ?', (key,)
+                ).fetchone()
+                if row is not None:
+                    result = (row[0], row[1], json.loads(row[2]))
+                    self._remember(key, result)
+                    self.disk_hits += 1
+                    return result
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: ClassificationResult):
+        """Guarda un resultado en ambos niveles"""
+        with self._lock:
+            self._remember(key, result)
+            if self._connection is not None:
+                service_type, confidence, scores = result
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                    (key, service_type, confidence, json.dumps(scores, separators=(',', ':')))
+                )
+                self._pending_writes += 1
+                if self._pending_writes >= COMMIT_EVERY:
+                    self._connection.commit()
+                    self._pending_writes = 0
+
+    def _remember(self, key: str, result: ClassificationResult):
+        """Inserta en el LRU en memoria desalojando la entrada menos usada"""
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de aciertos y fallos"""
+        return {
+            'aciertos_memoria': self.memory_hits,
+            'aciertos_disco': self.disk_hits,
+            'fallos': self.misses
+        }
+
+    def close(self):
+        """Confirma las escrituras pendientes y cierra la base persistente"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.commit()
+                self._connection.close()
+                self._connection = None
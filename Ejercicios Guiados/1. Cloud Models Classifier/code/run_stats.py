@@ -0,0 +1,143 @@
+"""
+Estadísticas de ejecución del Clasificador de Servicios en la Nube (--stats)
+Acumula el tiempo de cada etapa (lectura, normalización, búsqueda, puntuación y
+salida), los documentos procesados y los aciertos de cada palabra clave
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, Optional, TextIO
+
+STAGES = ('lectura', 'normalizacion', 'busqueda', 'puntuacion', 'salida')
+
+# Palabras clave listadas en el reporte, de más a menos aciertos
+TOP_KEYWORDS = 20
+
+
+class RunStats:
+    """
+    Contadores de una ejecución; solo existen si se pidió --stats, así que el camino
+    normal de clasificación no paga ninguna medición
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stage_seconds: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.documents = 0
+        # Documentos en los que aparece cada palabra clave
+        self.keyword_hits: Counter = Counter()
+        # Indica si hay tiempos medidos en otros procesos (se suman, no son tiempo de reloj)
+        self.from_workers = False
+
+        self._recorded = 0.0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Los procesos del pool devuelven sus contadores; el candado no viaja
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        """Suma tiempo a una etapa"""
+        with self._lock:
+            self.stage_seconds[stage] += seconds
+            self._recorded += seconds
+
+    def count_documents(self, count: int = 1):
+        """Suma documentos procesados"""
+        with self._lock:
+            self.documents += count
+
+    def add_hits(self, keywords: Iterable[str]):
+        """Registra las palabras clave presentes en un documento"""
+        # dict.fromkeys: si `keywords` es un dict de coincidencias, sus valores no son conteos
+        with self._lock:
+            self.keyword_hits.update(dict.fromkeys(keywords, 1))
+
+    def add_hit_counts(self, counts: Dict[str, int]):
+        """Registra aciertos ya agregados por palabra clave (p. ej. de un lote completo)"""
+        with self._lock:
+            self.keyword_hits.update(counts)
+
+    def merge(self, other: 'RunStats'):
+        """Incorpora los contadores de un proceso del pool"""
+        with self._lock:
+            for stage, seconds in other.stage_seconds.items():
+                self.stage_seconds[stage] += seconds
+            self.documents += other.documents
+            self.keyword_hits.update(other.keyword_hits)
+            self.from_workers = True
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mide un bloque como etapa `name`, descontando lo que otras etapas midieron dentro de él"""
+        start = time.perf_counter()
+        recorded = self._recorded
+        try:
+            yield
+        finally:
+            nested = self._recorded - recorded
+            self.add(name, time.perf_counter() - start - nested)
+
+    def timed(self, iterable: Iterable, name: str) -> Iterator:
+        """Recorre un iterable midiendo como etapa `name` el tiempo de obtener cada elemento"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(name, time.perf_counter() - start)
+                return
+            self.add(name, time.perf_counter() - start)
+            yield item
+
+    def timed_call(self, function: Callable, name: str) -> Callable:
+        """Envuelve una función para medir cada llamada como etapa `name`"""
+        def timed_function(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - start)
+        return timed_function
+
+    def report(self, keywords: Iterable[str] = (), stream: TextIO = sys.stderr):
+        """Imprime el resumen de la ejecución"""
+        elapsed = time.perf_counter() - self.started
+        measured = sum(self.stage_seconds.values())
+
+        print(f"\n{'='*60}", file=stream)
+        print("ESTADÍSTICAS DE LA EJECUCIÓN", file=stream)
+        print(f"{'='*60}", file=stream)
+        print(f"Documentos:          {self.documents:,}", file=stream)
+        print(f"Tiempo total:        {elapsed:.3f} s", file=stream)
+        if elapsed > 0:
+            print(f"Documentos/segundo:  {self.documents / elapsed:,.0f}", file=stream)
+
+        note = " (sumado entre procesos)" if self.from_workers else ""
+        print(f"\nTIEMPO POR ETAPA{note}:", file=stream)
+        for stage in STAGES:
+            seconds = self.stage_seconds[stage]
+            share = seconds / measured if measured else 0.0
+            print(f"  {stage:<15}{seconds:>10.4f} s{share:>8.1%}", file=stream)
+
+        print(f"\nPALABRAS CLAVE CON MÁS ACIERTOS (documentos):", file=stream)
+        for keyword, hits in self.keyword_hits.most_common(TOP_KEYWORDS):
+            print(f"  {keyword:<25}{hits:>10,}", file=stream)
+        missing = sorted(set(keywords) - set(self.keyword_hits))
+        if missing:
+            print(f"\nPalabras clave sin aciertos ({len(missing)}): {', '.join(missing)}", file=stream)
+
+
+def measure(stats: Optional[RunStats], name: str) -> ContextManager:
+    """Etapa medida si hay estadísticas activas; si no, un contexto vacío"""
+    return stats.stage(name) if stats is not None else nullcontext()
@@ -0,0 +1,147 @@
+"""
+Clasificación por segmentos de documentos largos
+Un documento de arquitectura puede mezclar secciones IaaS, PaaS y FaaS; aquí se
+clasifica cada párrafo o cada ventana de palabras por separado. Las palabras clave se
+buscan una sola vez en todo el documento y los segmentos se puntúan con un barrido
+lineal sobre las posiciones de esas apariciones, sin volver a recorrer su texto
+"""
+
+import math
+import re
+from typing import Dict, List, Tuple
+
+# Palabras por ventana y desplazamiento entre ventanas consecutivas del modo 'window'
+DEFAULT_WINDOW_WORDS = 80
+DEFAULT_STRIDE_WORDS = 40
+
+SEGMENT_MODES = ('paragraph', 'window')
+
+# Los párrafos se separan con al menos una línea en blanco
+PARAGRAPH_SEPARATOR = re.compile(r'\n[^\S\n]*\n\s*')
+
+
+def paragraph_bounds(text: str) -> List[Tuple[int, int]]:
+    """Rangos [inicio, fin) de los párrafos no vacíos, sin los espacios de sus extremos"""
+    bounds = []
+    start = 0
+    for separator in PARAGRAPH_SEPARATOR.finditer(text):
+        bounds.append((start, separator.start()))
+        start = separator.end()
+    bounds.append((start, len(text)))
+
+    stripped = []
+    for start, end in bounds:
+        paragraph = text[start:end]
+        if paragraph.strip():
+            start += len(paragraph) - len(paragraph.lstrip())
+            end -= len(paragraph) - len(paragraph.rstrip())
+            stripped.append((start, end))
+    return stripped
+
+
+def window_bounds(text: str, window_words: int = DEFAULT_WINDOW_WORDS,
+                  stride_words: int = DEFAULT_STRIDE_WORDS) -> List[Tuple[int, int]]:
+    """
+    Rangos [inicio, fin) de ventanas de `window_words` palabras que avanzan `stride_words`
+
+    Las ventanas empiezan y terminan en límites de palabra; la última llega siempre al
+    final del texto, así que ninguna palabra queda fuera. El texto se corta en bloques
+    de mcd(ventana, desplazamiento) palabras con una sola expresión regular, así que
+    no se recorre palabra por palabra en Python.
+    """
+    block_words = math.gcd(window_words, stride_words)
+    block_pattern = re.compile(r'\w+(?:\W+\w+){0,%d}' % (block_words - 1))
+    blocks = [match.span() for match in block_pattern.finditer(text)]
+    window_blocks = window_words // block_words
+    stride_blocks = stride_words // block_words
+
+    bounds = []
+    first = 0
+    while first < len(blocks):
+        last = min(first + window_blocks, len(blocks)) - 1
+        bounds.append((blocks[first][0], blocks[last][1]))
+        if last == len(blocks) - 1:
+            break
+        first += stride_blocks
+    return bounds
+
+
+class SegmentScorer:
+    """
+    Puntúa los segmentos de un texto a partir de una sola búsqueda de palabras clave
+
+    Los segmentos se recorren en orden con dos punteros sobre las apariciones: una
+    aparición entra cuando el segmento llega a su fin y sale cuando el segmento deja
+    atrás su inicio, así que cada una se procesa dos veces en total. Los conteos por
+    palabra clave mantienen el diccionario de coincidencias de la ventana actual, que
+    se puntúa con el mismo model.score de classify_text. En un documento largo muchos
+    segmentos repiten las mismas coincidencias, así que cada combinación se puntúa una vez.
+    """
+
+    def __init__(self, model, text_lower: str):
+        """
+        Args:
+            model (CompiledKeywordModel): Modelo con el que se puntúan los segmentos
+            text_lower (str): Documento completo ya normalizado con fold_text
+        """
+        self.model = model
+        spans = model.matcher.find_spans(text_lower)
+        # Apariciones (inicio, fin, palabra clave, es_palabra_completa) ordenadas por inicio
+        self._occurrences = sorted((start, end, keyword, bounded)
+                                   for keyword, occurrences in spans.items()
+                                   for start, end, bounded in occurrences)
+        self._by_end = sorted(range(len(self._occurrences)), key=lambda index: self._occurrences[index][1])
+        # Coincidencias del documento completo, como las de MatchResult.hits
+        self.hits = {keyword: any(bounded for _, _, bounded in occurrences)
+                     for keyword, occurrences in spans.items()}
+
+    def score_segments(self, bounds: List[Tuple[int, int]]) -> List[Tuple[str, float, Dict[str, float]]]:
+        """
+        Clasifica cada rango [inicio, fin); mismo resultado que classify_text sobre su texto
+
+        Los rangos deben venir ordenados con inicios y fines no decrecientes, como los
+        de paragraph_bounds y window_bounds. Una aparición cuenta si cabe entera en el rango.
+        """
+        occurrences = self._occurrences
+        active = [False] * len(occurrences)
+        counts: Dict[str, int] = {}
+        bounded_counts: Dict[str, int] = {}
+        hits: Dict[str, bool] = {}
+        scored: Dict[frozenset, Tuple[str, float, Dict[str, float]]] = {}
+
+        results = []
+        entered = left = 0
+        for segment_start, segment_end in bounds:
+            # Entran las apariciones que terminan dentro del rango (si no empezaron antes de él)
+            while entered < len(self._by_end) and occurrences[self._by_end[entered]][1] <= segment_end:
+                index = self._by_end[entered]
+                entered += 1
+                start, _, keyword, bounded = occurrences[index]
+                if start >= segment_start:
+                    active[index] = True
+                    counts[keyword] = counts.get(keyword, 0) + 1
+                    bounded_counts[keyword] = bounded_counts.get(keyword, 0) + bounded
+                    hits[keyword] = bounded_counts[keyword] > 0
+
+            # Salen las que empiezan antes del rango
+            while left < len(occurrences) and occurrences[left][0] < segment_start:
+                if active[left]:
+                    active[left] = False
+                    _, _, keyword, bounded = occurrences[left]
+                    counts[keyword] -= 1
+                    bounded_counts[keyword] -= bounded
+                    if counts[keyword]:
+                        hits[keyword] = bounded_counts[keyword] > 0
+                    else:
+                        del hits[keyword]
+                left += 1
+
+            key = frozenset(hits.items())
+            if key not in scored:
+                scored[key] = self.model.score(hits)
+            results.append(scored[key])
+        return results
+
+    def score_document(self) -> Tuple[str, float, Dict[str, float]]:
+        """Clasificación del documento completo con las mismas coincidencias"""
+        return self.model.score(self.hits)
@@ -0,0 +1,209 @@
+"""
+Servicio residente del Clasificador de Servicios en la Nube
+Mantiene un solo clasificador compilado en memoria y expone /classify y
+/classify/batch por HTTP y, opcionalmente, por un socket de dominio Unix
+"""
+
+import json
+import os
+import signal
+import socketserver
+import stat
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, Optional
+
+# Tamaño máximo del cuerpo de una petición
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+# Textos máximos por petición a /classify/batch
+MAX_BATCH_TEXTS = 10_000
+
+
+def _result_to_dict(result) -> Dict:
+    """Convierte la tupla de classify_text en un objeto JSON"""
+    service_type, confidence, scores = result
+    return {'tipo_servicio': service_type, 'confianza': confidence, 'scores': scores}
+
+
+class ClassifierRequestHandler(BaseHTTPRequestHandler):
+    """
+    Atiende las peticiones del servicio; el clasificador se comparte entre todos los hilos
+    """
+
+    server_version = 'CloudModelsClassifier/1.0'
+
+    def do_GET(self):
+        if self.path == '/health':
+            # La huella permite comprobar qué diccionario está en uso tras una recarga
+            self._send_json(200, {'estado': 'ok', 'modelo': self.server.classifier.keywords_fingerprint[:12]})
+        else:
+            self._send_json(404, {'error': f"Ruta no encontrada: {self.path}"})
+
+    def do_POST(self):
+        if self.path not in ('/classify', '/classify/batch'):
+            self._send_json(404, {'error': f"Ruta no encontrada: {self.path}"})
+            return
+
+        payload = self._read_json()
+        if payload is None:
+            return
+
+        classifier = self.server.classifier
+        if self.path == '/classify':
+            text = payload.get('text')
+            if not isinstance(text, str):
+                self._send_json(400, {'error': "El campo 'text' debe ser una cadena"})
+                return
+            if payload.get('verbose'):
+                self._send_json(200, classifier.get_detailed_analysis(text))
+            else:
+                self._send_json(200, _result_to_dict(classifier.classify_text(text)))
+            return
+
+        texts = payload.get('texts')
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            self._send_json(400, {'error': "El campo 'texts' debe ser una lista de cadenas"})
+            return
+        if len(texts) > MAX_BATCH_TEXTS:
+            self._send_json(413, {'error': f"Máximo {MAX_BATCH_TEXTS} textos por petición"})
+            return
+        # El lote se resuelve en este hilo: el pool del servidor ya reparte las peticiones
+        results = classifier.classify_batch(texts, workers=1)
+        self._send_json(200, {'resultados': [_result_to_dict(result) for result in results]})
+
+    def _read_json(self) -> Optional[Dict]:
+        """Lee y valida el cuerpo JSON; responde con error y retorna None si no es válido"""
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send_json(400, {'error': 'Content-Length inválido'})
+            return None
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {'error': f"El cuerpo supera {MAX_BODY_BYTES} bytes"})
+            return None
+
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            self._send_json(400, {'error': f"JSON inválido: {e}"})
+            return None
+        if not isinstance(payload, dict):
+            self._send_json(400, {'error': 'Se esperaba un objeto JSON'})
+            return None
+        return payload
+
+    def _send_json(self, status: int, body: Dict):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # En un socket Unix la dirección del cliente es una cadena vacía
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class PooledServerMixIn:
+    """Atiende las conexiones en un pool de hilos acotado en lugar de un hilo por conexión"""
+
+    def start_pool(self, classifier, workers: int, verbose: bool):
+        self.classifier = classifier
+        self.verbose = verbose
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='clasificador')
+
+    def process_request(self, request, client_address):
+        self._executor.submit(self._process_request_in_pool, request, client_address)
+
+    def _process_request_in_pool(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
+class PooledHTTPServer(PooledServerMixIn, HTTPServer):
+    """Servidor HTTP sobre TCP con pool de hilos"""
+
+
+class PooledUnixHTTPServer(PooledServerMixIn, socketserver.UnixStreamServer):
+    """Servidor HTTP sobre un socket de dominio Unix con pool de hilos"""
+
+
+def serve(classifier, host: str = '127.0.0.1', port: int = 8080, socket_path: Optional[str] = None,
+          workers: Optional[int] = None, verbose: bool = False):
+    """
+    Ejecuta el servicio hasta recibir Ctrl+C o SIGTERM
+
+    Args:
+        classifier (CloudServiceClassifier): Clasificador compartido por todas las peticiones
+        host (str): Interfaz TCP donde escuchar
+        port (int): Puerto TCP (0 desactiva HTTP por TCP)
+        socket_path (Optional[str]): Ruta de un socket Unix adicional
+        workers (Optional[int]): Hilos que atienden peticiones (por defecto, uno por CPU)
+        verbose (bool): Registrar cada petición en stderr
+    """
+    workers = workers or os.cpu_count() or 1
+    servers = []
+
+    if port:
+        http_server = PooledHTTPServer((host, port), ClassifierRequestHandler)
+        http_server.start_pool(classifier, workers, verbose)
+        servers.append(http_server)
+        print(f"Escuchando en http://{host}:{http_server.server_address[1]}", file=sys.stderr)
+
+    if socket_path:
+        # Solo se reemplaza un socket que quedó de otra ejecución, nunca un archivo cualquiera
+        if _is_socket(socket_path):
+            os.unlink(socket_path)
+        elif os.path.lexists(socket_path):
+            print(f"Error: La ruta '{socket_path}' ya existe y no es un socket Unix; no se reemplaza.", file=sys.stderr)
+            sys.exit(1)
+        unix_server = PooledUnixHTTPServer(socket_path, ClassifierRequestHandler)
+        unix_server.start_pool(classifier, workers, verbose)
+        servers.append(unix_server)
+        print(f"Escuchando en el socket Unix {socket_path}", file=sys.stderr)
+
+    if not servers:
+        raise ValueError("Se necesita un puerto TCP o un socket Unix para el servicio")
+
+    # SIGTERM (p. ej. de un supervisor de procesos) cierra el servicio igual que Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    threads = [threading.Thread(target=server.serve_forever, daemon=True) for server in servers]
+    for thread in threads:
+        thread.start()
+
+    try:
+        for thread in threads:
+            thread.join()
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+        if socket_path and _is_socket(socket_path):
+            os.unlink(socket_path)
+
+
+def _is_socket(path: str) -> bool:
+    """Indica si `path` existe y es un socket (sin seguir enlaces simbólicos)"""
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,98 @@
+"""
+Modelo compartido entre los procesos del pool del Clasificador de Servicios en la Nube
+El proceso principal serializa una sola vez el modelo de palabras clave compilado y los
+pesos del modelo lineal en un archivo temporal y cada proceso del pool lo mapea en solo
+lectura, igual que el corpus: las páginas las comparte el sistema operativo en lugar de
+que cada proceso reciba su propia copia
+"""
+
+import copy
+import mmap
+import os
+import tempfile
+from typing import Optional, Tuple
+
+from run_stats import RunStats
+
+# Directorio en memoria (tmpfs) para el archivo del modelo, si el sistema lo tiene
+SHARED_MEMORY_DIR = '/dev/shm'
+
+
+class SharedModel:
+    """
+    Archivo temporal con el modelo de palabras clave y los pesos del modelo lineal de un clasificador
+
+    El modelo de palabras clave se guarda en el formato de --save-model (el autómata ya
+    armado, serializado con marshal): cada proceso lo lee del mapeo y solo vuelve a
+    compilar la expresión regular. Los pesos del modelo lineal, si lo hay, van a
+    continuación y se leen directamente del mapeo sin copiarlos.
+    """
+
+    def __init__(self, model, linear_model=None):
+        """
+        Args:
+            model (CompiledKeywordModel): Modelo de palabras clave a publicar
+            linear_model (Optional[LinearModel]): Modelo lineal a publicar, si el motor lo usa
+        """
+        self.path: Optional[str] = None
+        model_data = model.to_bytes()
+        linear_data = linear_model.to_bytes() if linear_model is not None else b''
+
+        directory = SHARED_MEMORY_DIR if os.path.isdir(SHARED_MEMORY_DIR) else None
+        descriptor, self.path = tempfile.mkstemp(prefix='clasificador-modelo-', suffix='.bin', dir=directory)
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(model_data)
+            file.write(linear_data)
+        # Lo único que viaja a cada proceso: ruta del archivo y tamaño de cada modelo (0 si no hay modelo lineal)
+        self.handle: Tuple[str, int, int] = (self.path, len(model_data), len(linear_data))
+
+    def worker_classifier(self, classifier):
+        """
+        Copia liviana del clasificador para los procesos: sin los modelos publicados
+        (los reconstruye attach_worker_classifier), caché ni estadísticas acumuladas
+        """
+        worker_classifier = copy.copy(classifier)
+        worker_classifier.model = None
+        worker_classifier.linear_model = None
+        worker_classifier._vectorized_scorer = None
+        # La caché (y su conexión SQLite) se queda en este proceso
+        worker_classifier.cache = None
+        # Cada proceso devuelve las estadísticas de sus tareas en lugar de acumularlas
+        worker_classifier.stats = RunStats() if classifier.stats is not None else None
+        return worker_classifier
+
+    def close(self):
+        """Borra el archivo; los procesos que ya lo mapearon conservan su mapeo hasta terminar"""
+        if self.path is None:
+            return
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def attach_worker_classifier(worker_classifier, handle: Tuple[str, int, int]):
+    """
+    Completa en un proceso del pool la copia creada por SharedModel.worker_classifier
+
+    Returns:
+        CloudServiceClassifier: El mismo clasificador, con los modelos del archivo compartido
+    """
+    path, model_size, linear_size = handle
+    with open(path, 'rb') as file:
+        # El mapeo sigue siendo válido tras cerrar el archivo; las vistas de los pesos lo mantienen vivo
+        view = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    from cloud_models_classifier import CompiledKeywordModel
+    worker_classifier.model = CompiledKeywordModel.from_bytes(view[:model_size])
+    if linear_size:
+        # Importación diferida: el motor lineal solo se carga si se usa
+        from linear_model import LinearModel
+        worker_classifier.linear_model = LinearModel.from_buffer(view[model_size:model_size + linear_size])
+    return worker_classifier
@@ -0,0 +1,259 @@
+"""
+Ajuste de los pesos del diccionario de palabras clave (subcomando tune)
+Las coincidencias de un corpus etiquetado se buscan una sola vez y quedan en una matriz
+documento×palabra clave; cada configuración de pesos se evalúa con un producto de
+matrices, sin volver a recorrer los textos. Los lotes de configuraciones se reparten
+entre varios procesos, que reciben la matriz una sola vez al iniciar
+"""
+
+import itertools
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from normalization import fold_text
+from numpy_engine import NUMPY_AVAILABLE, VectorizedScorer, np
+
+# Pesos que puede tomar cada palabra clave: múltiplos de 0.5 entre 0 y 5. Con ellos todas las
+# sumas son exactas en punto flotante, así que la matriz y classify_text desempatan igual
+WEIGHT_VALUES = tuple(step * 0.5 for step in range(11))
+
+# Factores de la búsqueda en grilla, aplicados a todos los pesos de cada tipo de servicio
+TYPE_SCALES = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+MAX_GRID_CONFIGURATIONS = 100_000
+
+# Búsqueda aleatoria: configuraciones a probar y probabilidad de cambiar cada peso
+DEFAULT_SAMPLES = 500
+RANDOM_CHANGE_RATE = 0.2
+
+# Ascenso por coordenadas: rondas máximas (cada una aplica el mejor cambio de un solo peso)
+DEFAULT_ROUNDS = 50
+
+# Configuraciones por tarea enviada a cada proceso
+CONFIGURATIONS_PER_TASK = 128
+
+UNCLASSIFIABLE = "No clasificable"
+
+
+def round_weight(weight: float) -> float:
+    """Lleva un peso a la grilla de WEIGHT_VALUES"""
+    return min(max(round(weight * 2) / 2, WEIGHT_VALUES[0]), WEIGHT_VALUES[-1])
+
+
+class HitMatrix:
+    """
+    Coincidencias de un corpus etiquetado, listas para puntuar cualquier configuración de pesos
+
+    Los documentos con la misma fila de coincidencias y la misma etiqueta se guardan una
+    sola vez con su cantidad: en tickets cortos muchas filas se repiten.
+    """
+
+    def __init__(self, model, texts: Sequence[str], labels: Sequence[str]):
+        """
+        Args:
+            model (CompiledKeywordModel): Modelo con el diccionario inicial y el autómata de búsqueda
+            texts (Sequence[str]): Textos del corpus
+            labels (Sequence[str]): Tipo de servicio de cada texto (o "No clasificable")
+
+        Raises:
+            ValueError: Si alguna etiqueta no es un tipo de servicio del diccionario
+        """
+        scorer = VectorizedScorer(model)
+        self.service_types = scorer.service_types
+        # Cada parámetro es el peso de una palabra clave en un tipo de servicio
+        self.parameters: List[Tuple[str, str]] = [(keyword, service_type)
+                                                   for service_type in self.service_types
+                                                   for keyword in model.keywords[service_type]]
+        self.initial_weights = np.array([model.keywords[service_type][keyword]
+                                         for keyword, service_type in self.parameters], dtype=float)
+        # Fila (palabra clave) y columna (tipo de servicio) de cada parámetro en la matriz de pesos
+        self.keyword_rows = [scorer.keyword_index[keyword] for keyword, _ in self.parameters]
+        self.type_columns = [self.service_types.index(service_type) for _, service_type in self.parameters]
+        self._vocabulary_size = len(scorer.vocabulary)
+
+        type_index = {service_type: index for index, service_type in enumerate(self.service_types)}
+        type_index[UNCLASSIFIABLE] = len(self.service_types)
+        unknown = sorted(set(labels) - set(type_index))
+        if unknown:
+            raise ValueError(f"Etiquetas que no son tipos de servicio del diccionario: {', '.join(unknown)}")
+
+        hits, bounded = scorer.hit_matrix([fold_text(text) for text in texts])
+        rows = np.concatenate([hits + 0.5 * bounded, np.array([[type_index[label]] for label in labels])], axis=1)
+        unique_rows, self.counts = np.unique(rows, axis=0, return_counts=True)
+        self.features = np.ascontiguousarray(unique_rows[:, :-1])
+        self.targets = unique_rows[:, -1].astype(np.intp)
+        self.documents = len(texts)
+
+    def accuracy(self, configurations: 'np.ndarray') -> 'np.ndarray':
+        """
+        Exactitud de cada configuración (una fila de pesos por configuración, en el orden de `parameters`)
+
+        Un documento sin ningún score positivo se predice "No clasificable", y los empates
+        se resuelven a favor del primer tipo de servicio, igual que en classify_text.
+        """
+        count = len(configurations)
+        types = len(self.service_types)
+        # Pesos palabra clave × (tipo, configuración): un solo producto da los scores de todo el lote
+        weights = np.zeros((self._vocabulary_size, types, count))
+        weights[self.keyword_rows, self.type_columns, :] = configurations.T
+        scores = (self.features @ weights.reshape(self._vocabulary_size, types * count)).reshape(-1, types, count)
+
+        # Tipo ganador comparando un tipo a la vez (más rápido que argmax sobre un eje de 4);
+        # solo un score estrictamente mayor desplaza al anterior, así que gana el primero
+        best = scores[:, 0, :]
+        predicted = np.zeros(best.shape, dtype=np.intp)
+        for column in range(1, types):
+            better = scores[:, column, :] > best
+            predicted[better] = column
+            best = np.maximum(best, scores[:, column, :])
+        predicted[best <= 0] = types
+        return self.counts @ (predicted == self.targets[:, None]) / self.documents
+
+    def keywords(self, weights: 'np.ndarray') -> Dict[str, Dict[str, float]]:
+        """Diccionario de palabras clave con los pesos dados; las de peso 0 se omiten (no aportan)"""
+        keywords: Dict[str, Dict[str, float]] = {service_type: {} for service_type in self.service_types}
+        for (keyword, service_type), weight in zip(self.parameters, weights.tolist()):
+            if weight:
+                keywords[service_type][keyword] = int(weight) if weight.is_integer() else weight
+        return keywords
+
+    def describe(self, weights: 'np.ndarray') -> str:
+        """Cambios de una configuración respecto al diccionario inicial"""
+        changes = [f"{keyword}@{service_type} {before:g}→{after:g}"
+                   for (keyword, service_type), before, after
+                   in zip(self.parameters, self.initial_weights.tolist(), weights.tolist()) if before != after]
+        return ', '.join(changes) or 'diccionario inicial'
+
+
+# Matriz de cada proceso del pool, recibida una sola vez al iniciar el proceso
+_worker_matrix: Optional[HitMatrix] = None
+
+
+def _init_tuning_worker(matrix: HitMatrix):
+    """Inicializa un proceso del pool con la matriz de coincidencias"""
+    global _worker_matrix
+    _worker_matrix = matrix
+
+
+def _accuracy_in_worker(configurations: 'np.ndarray') -> 'np.ndarray':
+    """Evalúa un bloque de configuraciones dentro de un proceso del pool"""
+    return _worker_matrix.accuracy(configurations)
+
+
+class WeightTuner:
+    """
+    Búsqueda de pesos sobre una HitMatrix: en grilla, aleatoria o por ascenso por coordenadas
+
+    Cada estrategia arma lotes de configuraciones que se evalúan en paralelo. Se registra
+    la exactitud de todas las configuraciones probadas y se conserva la mejor; ante un
+    empate se queda la que se encontró primero (la inicial va siempre primero).
+    """
+
+    def __init__(self, matrix: HitMatrix, workers: int = 1):
+        """
+        Args:
+            matrix (HitMatrix): Coincidencias del corpus de ajuste
+            workers (int): Procesos que evalúan las configuraciones
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy no está instalado; instálalo con 'pip install numpy'")
+        self.matrix = matrix
+        self.workers = workers
+        self.evaluated = 0
+        # (descripción, exactitud) de cada configuración probada, en orden
+        self.trials: List[Tuple[str, float]] = []
+        self.best_weights = matrix.initial_weights.copy()
+        self.best_accuracy = -1.0
+        self._executor = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            # Importación diferida: multiprocessing encarece el arranque de cada invocación del CLI
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_tuning_worker,
+                                                 initargs=(self.matrix,))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def evaluate(self, configurations: 'np.ndarray', descriptions: Sequence[str]) -> 'np.ndarray':
+        """Exactitud de un lote de configuraciones; registra cada una y actualiza la mejor"""
+        chunks = [configurations[start:start + CONFIGURATIONS_PER_TASK]
+                  for start in range(0, len(configurations), CONFIGURATIONS_PER_TASK)]
+        if self._executor is None or len(chunks) == 1:
+            accuracies = np.concatenate([self.matrix.accuracy(chunk) for chunk in chunks])
+        else:
+            accuracies = np.concatenate(list(self._executor.map(_accuracy_in_worker, chunks)))
+
+        self.evaluated += len(configurations)
+        self.trials.extend(zip(descriptions, accuracies.tolist()))
+        best = int(accuracies.argmax())
+        if accuracies[best] > self.best_accuracy:
+            self.best_accuracy = float(accuracies[best])
+            self.best_weights = configurations[best].copy()
+        return accuracies
+
+    def grid(self):
+        """Prueba todas las combinaciones de TYPE_SCALES por tipo de servicio"""
+        types = len(self.matrix.service_types)
+        if len(TYPE_SCALES) ** types > MAX_GRID_CONFIGURATIONS:
+            raise ValueError(f"La grilla de {types} tipos de servicio supera {MAX_GRID_CONFIGURATIONS:,} configuraciones")
+        initial = self.matrix.initial_weights.tolist()
+        # La combinación de puros 1.0 (el diccionario inicial) va primero
+        combinations = sorted(itertools.product(TYPE_SCALES, repeat=types),
+                              key=lambda scales: any(scale != 1.0 for scale in scales))
+        configurations = np.array([[round_weight(weight * scales[column])
+                                    for weight, column in zip(initial, self.matrix.type_columns)]
+                                   for scales in combinations])
+        descriptions = [' '.join(f"{service_type}×{scale:g}" for service_type, scale
+                                 in zip(self.matrix.service_types, scales)) for scales in combinations]
+        self.evaluate(configurations, descriptions)
+
+    def random_search(self, samples: int = DEFAULT_SAMPLES, seed: int = 42):
+        """Prueba el diccionario inicial y `samples` variantes que cambian cada peso con RANDOM_CHANGE_RATE"""
+        generator = random.Random(seed)
+        initial = self.matrix.initial_weights.tolist()
+        configurations = [initial]
+        for _ in range(samples):
+            configurations.append([generator.choice(WEIGHT_VALUES) if generator.random() < RANDOM_CHANGE_RATE
+                                   else weight for weight in initial])
+        configurations = np.array(configurations)
+        self.evaluate(configurations, [self.matrix.describe(weights) for weights in configurations])
+
+    def coordinate_ascent(self, rounds: int = DEFAULT_ROUNDS, progress=None):
+        """
+        Ascenso por coordenadas: en cada ronda se evalúan en paralelo todos los cambios de
+        un solo peso a otro valor de WEIGHT_VALUES y se aplica el que más mejora; termina
+        cuando ningún cambio mejora o tras `rounds` rondas
+
+        Args:
+            rounds (int): Rondas máximas
+            progress (Optional[Callable[[int, str, float], None]]): Se llama tras cada ronda
+                con (ronda, cambio aplicado, exactitud)
+        """
+        current = self.matrix.initial_weights.copy()
+        current_accuracy = float(self.evaluate(current[None, :], ['diccionario inicial'])[0])
+        for round_number in range(1, rounds + 1):
+            moves = [(index, value) for index, weight in enumerate(current.tolist())
+                     for value in WEIGHT_VALUES if value != weight]
+            configurations = np.repeat(current[None, :], len(moves), axis=0)
+            configurations[np.arange(len(moves)), [index for index, _ in moves]] = [value for _, value in moves]
+            descriptions = [f"ronda {round_number}: {self.matrix.parameters[index][0]}@"
+                            f"{self.matrix.parameters[index][1]} {current[index]:g}→{value:g}"
+                            for index, value in moves]
+            accuracies = self.evaluate(configurations, descriptions)
+
+            best = int(accuracies.argmax())
+            if accuracies[best] <= current_accuracy:
+                break
+            current = configurations[best].copy()
+            current_accuracy = float(accuracies[best])
+            if progress is not None:
+                progress(round_number, descriptions[best].split(': ', 1)[1], current_accuracy)
+
+    def top(self, count: int = 10) -> List[Tuple[str, float]]:
+        """Las `count` configuraciones con mayor exactitud (a igual exactitud, la probada primero)"""
+        order = sorted(range(len(self.trials)), key=lambda index: (-self.trials[index][1], index))
+        return [self.trials[index] for index in order[:count]]
@@ -0,0 +1,90 @@
+"""
+Pool de procesos acotado de los modos --corpus y --dir
+Cada proceso recibe una sola vez su copia del clasificador (con los modelos del archivo
+compartido) y las tareas se envían solo a medida que se consumen
+sus resultados, así que la memoria no depende del tamaño de la entrada
+"""
+
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from corpus_report import CorpusReport
+from run_stats import RunStats
+
+# Tareas en curso por proceso: acota la memoria si la salida es más lenta que la clasificación
+IN_FLIGHT_PER_WORKER = 2
+
+
+def run_in_pool(classifier, tasks: Iterable[Tuple[object, Tuple]], workers: int, task: Callable,
+                setup: Optional[Callable] = None, setup_args: Tuple = ()) -> Iterator[Tuple[object, object]]:
+    """
+    Ejecuta `task(*argumentos)` en un pool de procesos por cada (etiqueta, argumentos) de
+    `tasks` y entrega (etiqueta, resultado) en el orden de entrada
+
+    `task` retorna (resultado, estadísticas de la tarea); las estadísticas se suman a las
+    del clasificador. `setup(*setup_args)` se ejecuta una vez en cada proceso después de
+    recibir el clasificador (por ejemplo, para mapear el corpus).
+    """
+    # Importación diferida, igual que en classify_batch
+    from concurrent.futures import ProcessPoolExecutor
+    from shared_model import SharedModel
+
+    # Los modelos se publican una vez en un archivo mapeado en memoria; cada proceso recibe solo su ubicación
+    with SharedModel(classifier.model, classifier.linear_model) as shared, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_pool_worker,
+                                initargs=(shared.worker_classifier(classifier), shared.handle,
+                                          setup, setup_args)) as executor:
+        # A diferencia de executor.map, se envían tareas solo a medida que se consumen resultados
+        pending = deque()
+        for label, args in tasks:
+            pending.append((label, executor.submit(task, *args)))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                yield _collect(classifier, *pending.popleft())
+        while pending:
+            yield _collect(classifier, *pending.popleft())
+
+
+def _collect(classifier, label, future) -> Tuple[object, object]:
+    """Espera el resultado de una tarea e incorpora sus estadísticas, si las hay"""
+    result, task_stats = future.result()
+    if task_stats is not None:
+        classifier.stats.merge(task_stats)
+    return label, result
+
+
+# Clasificador de cada proceso del pool
+_worker_classifier = None
+
+
+def _init_pool_worker(classifier, handle: Tuple[str, int, int], setup: Optional[Callable], setup_args: Tuple):
+    """Inicializa un proceso del pool con su copia del clasificador y los modelos del archivo compartido"""
+    global _worker_classifier
+    from shared_model import attach_worker_classifier
+    _worker_classifier = attach_worker_classifier(classifier, handle)
+    if setup is not None:
+        setup(*setup_args)
+
+
+def new_task_stats() -> Optional[RunStats]:
+    """Estadísticas propias de la tarea en curso, o None si no se miden"""
+    return RunStats() if _worker_classifier.stats is not None else None
+
+
+def classify_in_worker(texts: List[str], with_keywords: bool = False,
+                       stats: Optional[RunStats] = None) -> Tuple[List[Tuple[str, float, Dict[str, float]]], Optional[RunStats]]:
+    """
+    Clasifica un bloque de documentos dentro de un proceso del pool; retorna (resultados, estadísticas)
+
+    `stats` permite sumar a la tarea etapas previas medidas por quien la llama (como la lectura).
+    """
+    if _worker_classifier.stats is not None:
+        stats = _worker_classifier.stats = stats if stats is not None else RunStats()
+    return _worker_classifier.classify_batch(texts, workers=1, with_keywords=with_keywords), stats
+
+
+def summarize_in_worker(classify: Callable, *args) -> Tuple[CorpusReport, Optional[RunStats]]:
+    """Clasifica con `classify(*args)` dentro de un proceso del pool y lo resume; retorna (reporte parcial, estadísticas)"""
+    results, stats = classify(*args, with_keywords=True)
+    report = CorpusReport(_worker_classifier.service_types, _worker_classifier.keywords)
+    report.update(results)
+    return report, stats
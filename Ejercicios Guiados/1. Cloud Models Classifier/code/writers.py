@@ -0,0 +1,158 @@
+"""
+Escritores de resultados del Clasificador de Servicios en la Nube
+Serializan cada clasificación en una línea compacta (JSONL, CSV o TSV) y agrupan
+muchas líneas en una sola escritura para no pagar una llamada al sistema por documento
+"""
+
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, TextIO, Union
+
+# Registros acumulados antes de escribir al flujo de salida
+DEFAULT_FLUSH_EVERY = 1000
+
+OUTPUT_FORMATS = ('jsonl', 'csv', 'tsv')
+
+# Separador de las palabras clave encontradas en los formatos por columnas
+KEYWORD_SEPARATOR = ';'
+
+# Escapes de TSV: un valor nunca puede contener el tabulador ni el salto de línea literales
+TSV_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+class ResultWriter(ABC):
+    """
+    Escritor base con buffer: acumula líneas serializadas y las escribe por bloques
+    """
+
+    def __init__(self, stream: TextIO, service_types: List[str], flush_every: int = DEFAULT_FLUSH_EVERY,
+                 id_field: str = 'id', include_scores: bool = True, include_keywords: bool = False):
+        """
+        Args:
+            stream (TextIO): Flujo de salida
+            service_types (List[str]): Tipos de servicio, en el orden de las columnas de score
+            flush_every (int): Registros acumulados antes de cada escritura
+            id_field (str): Nombre del identificador de cada registro (número de línea o ruta)
+            include_scores (bool): Incluir el score de cada tipo de servicio
+            include_keywords (bool): Incluir las palabras clave encontradas en el documento
+        """
+        self.stream = stream
+        self.service_types = list(service_types)
+        self.flush_every = flush_every
+        self.id_field = id_field
+        self.include_scores = include_scores
+        self.include_keywords = include_keywords
+        self._pending: List[str] = []
+
+    def write(self, record_id: Union[int, str], service_type: str, confidence: float, scores: Dict[str, float],
+              keywords: Optional[List[str]] = None):
+        """Agrega el resultado de un documento al buffer"""
+        self._pending.append(self._format(record_id, service_type, confidence, scores, keywords))
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Escribe al flujo todas las líneas pendientes en una sola llamada"""
+        if self._pending:
+            self.stream.write(''.join(self._pending))
+            self._pending.clear()
+        self.stream.flush()
+
+    def close(self):
+        """Vacía el buffer; el flujo de salida queda abierto"""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @abstractmethod
+    def _format(self, record_id: Union[int, str], service_type: str, confidence: float, scores: Dict[str, float],
+                keywords: Optional[List[str]]) -> str:
+        """Serializa el resultado de un documento como una línea terminada en salto de línea"""
+
+
+class JsonlWriter(ResultWriter):
+    """Un objeto JSON por línea"""
+
+    def _format(self, record_id: Union[int, str], service_type: str, confidence: float, scores: Dict[str, float],
+                keywords: Optional[List[str]]) -> str:
+        record = {
+            self.id_field: record_id,
+            'tipo_servicio': service_type,
+            'confianza': round(confidence, 4)
+        }
+        if self.include_scores:
+            record['scores'] = scores
+        if self.include_keywords:
+            record['palabras_clave'] = keywords or []
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+class TabularWriter(ResultWriter):
+    """Base de los formatos por columnas: encabezado y una columna de score por tipo de servicio"""
+
+    def __init__(self, stream: TextIO, service_types: List[str], flush_every: int = DEFAULT_FLUSH_EVERY,
+                 id_field: str = 'id', include_scores: bool = True, include_keywords: bool = False):
+        super().__init__(stream, service_types, flush_every, id_field, include_scores, include_keywords)
+        columns = [self.id_field, 'tipo_servicio', 'confianza']
+        if self.include_scores:
+            columns += self.service_types
+        if self.include_keywords:
+            columns.append('palabras_clave')
+        self._pending.append(self._row(columns))
+
+    def _format(self, record_id: Union[int, str], service_type: str, confidence: float, scores: Dict[str, float],
+                keywords: Optional[List[str]]) -> str:
+        values = [record_id, service_type, f"{confidence:.4f}"]
+        if self.include_scores:
+            values += [scores.get(service, 0) for service in self.service_types]
+        if self.include_keywords:
+            values.append(KEYWORD_SEPARATOR.join(keywords or ()))
+        return self._row(values)
+
+    @abstractmethod
+    def _row(self, values: List) -> str:
+        """Serializa una fila de valores (el encabezado o un documento) en el formato del escritor"""
+
+
+class CsvWriter(TabularWriter):
+    """CSV con encabezado (comillas solo donde hacen falta)"""
+
+    def __init__(self, *args, **kwargs):
+        # El encabezado se serializa en el constructor base: el escritor csv debe existir antes
+        self._row_buffer = io.StringIO()
+        self._csv = csv.writer(self._row_buffer, lineterminator='\n')
+        super().__init__(*args, **kwargs)
+
+    def _row(self, values: List) -> str:
+        self._csv.writerow(values)
+        row = self._row_buffer.getvalue()
+        self._row_buffer.seek(0)
+        self._row_buffer.truncate()
+        return row
+
+
+class TsvWriter(TabularWriter):
+    """Valores separados por tabuladores, con tabuladores y saltos de línea escapados"""
+
+    def _row(self, values: List) -> str:
+        return '\t'.join(str(value).translate(TSV_ESCAPES) for value in values) + '\n'
+
+
+def create_writer(output_format: str, stream: TextIO, service_types: List[str],
+                  flush_every: int = DEFAULT_FLUSH_EVERY, id_field: str = 'id',
+                  include_scores: bool = True, include_keywords: bool = False) -> ResultWriter:
+    """Crea el escritor correspondiente al formato solicitado"""
+    writers = {
+        'jsonl': JsonlWriter,
+        'csv': CsvWriter,
+        'tsv': TsvWriter
+    }
+    if output_format not in writers:
+        raise ValueError(f"Formato de salida no soportado: {output_format}")
+    return writers[output_format](stream, service_types, flush_every, id_field, include_scores, include_keywords)
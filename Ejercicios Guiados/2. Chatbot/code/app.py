@@ -1,13 +1,83 @@
-from flask import Flask, render_template, request, jsonify, abort
+import json
+import os
+
+from flask import Flask, Response, render_template, request, jsonify, abort, stream_with_context
 import requests
+from requests.adapters import HTTPAdapter
 
 # Inicialización de la aplicación Flask
 flask_app = Flask(__name__)
 
 # Configuración base para Ollama
-OLLAMA_BASE_URL = "http://localhost:11434/api"
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434/api")
 DEFAULT_MODEL = "deepseek-coder"
 
+# Conexiones a Ollama que se mantienen abiertas: debe cubrir los hilos que atienden peticiones a la vez
+OLLAMA_POOL_SIZE = int(os.environ.get("OLLAMA_POOL_SIZE", "10"))
+
+# Segundos para abrir la conexión y para esperar cada respuesta (o cada fragmento en streaming)
+OLLAMA_TIMEOUT = (
+    float(os.environ.get("OLLAMA_CONNECT_TIMEOUT", "5")),
+    float(os.environ.get("OLLAMA_READ_TIMEOUT", "60"))
+)
+
+
+def create_ollama_session(pool_size=OLLAMA_POOL_SIZE):
+    """
+    Crea el cliente HTTP compartido para Ollama. La sesión reutiliza conexiones
+    keep-alive en lugar de abrir una conexión TCP por petición; el pool de urllib3
+    es seguro entre hilos y guarda hasta `pool_size` conexiones abiertas
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
+# Cliente compartido por todas las rutas
+ollama_session = create_ollama_session()
+
+
+def sse_event(data):
+    """Formatea un diccionario como evento Server-Sent Events"""
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def relay_stream(resp, extract_token, model):
+    """
+    Reenvía al navegador, como Server-Sent Events, los fragmentos NDJSON que Ollama
+    produce con "stream": true. Cada token se envía apenas llega, así que el primero
+    aparece tras el primer fragmento y no al terminar la generación completa
+    """
+    def events():
+        try:
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    yield sse_event({"error": f"Error en Ollama: {chunk['error']}"})
+                    return
+                token = extract_token(chunk)
+                if token:
+                    yield sse_event({"token": token})
+                if chunk.get("done"):
+                    break
+            yield sse_event({"done": True, "model": model})
+        except (requests.exceptions.RequestException, ValueError) as err:
+            # El código HTTP ya se envió: el error llega como un evento más
+            yield sse_event({"error": f"Se interrumpió la respuesta de Ollama: {err}"})
+        finally:
+            resp.close()
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
 @flask_app.route("/")
 def home():
@@ -21,7 +91,7 @@ def list_models():
     Devuelve los modelos disponibles desde Ollama
     """
     try:
-        resp = requests.get(f"{OLLAMA_BASE_URL}/tags", timeout=30)
+        resp = ollama_session.get(f"{OLLAMA_BASE_URL}/tags", timeout=OLLAMA_TIMEOUT)
         if resp.status_code != 200:
             abort(502, description="No se pudieron obtener los modelos de Ollama")
         models_info = resp.json().get("models", [])
@@ -36,11 +106,13 @@ def list_models():
 @flask_app.route("/generate", methods=["POST"])
 def generate_text():
     """
-    Usa el endpoint /generate de Ollama para obtener texto a partir de un prompt
+    Usa el endpoint /generate de Ollama para obtener texto a partir de un prompt.
+    Con "stream": true en el cuerpo, responde con Server-Sent Events token a token
     """
     payload = request.get_json(force=True)
     prompt = payload.get("prompt")
     model = payload.get("model", DEFAULT_MODEL)
+    stream = bool(payload.get("stream", False))
 
     if not prompt:
         abort(400, description="El campo 'prompt' está vacío")
@@ -48,16 +120,18 @@ def generate_text():
     request_data = {
         "model": model,
         "prompt": prompt,
-        "stream": False
+        "stream": stream
     }
 
     try:
-        resp = requests.post(
+        resp = ollama_session.post(
             f"{OLLAMA_BASE_URL}/generate",
             json=request_data,
-            headers={"Content-Type": "application/json"},
-            timeout=60
+            timeout=OLLAMA_TIMEOUT,
+            stream=stream
         )
+        if resp.status_code == 200 and stream:
+            return relay_stream(resp, lambda chunk: chunk.get("response", ""), model)
         if resp.status_code == 200:
             result = resp.json().get("response", "")
             return jsonify({"response": result, "model": model})
@@ -72,11 +146,13 @@ def generate_text():
 @flask_app.route("/chat", methods=["POST"])
 def chat_with_model():
     """
-    Usa el endpoint /chat de Ollama para mantener un estilo conversacional
+    Usa el endpoint /chat de Ollama para mantener un estilo conversacional.
+    Con "stream": true en el cuerpo, responde con Server-Sent Events token a token
     """
     payload = request.get_json(force=True)
     message = payload.get("message")
     model = payload.get("model", DEFAULT_MODEL)
+    stream = bool(payload.get("stream", False))
 
     if not message:
         abort(400, description="El campo 'message' está vacío")
@@ -84,16 +160,18 @@ def chat_with_model():
     chat_body = {
         "model": model,
         "messages": [{"role": "user", "content": message}],
-        "stream": False
+        "stream": stream
     }
 
     try:
-        resp = requests.post(
+        resp = ollama_session.post(
             f"{OLLAMA_BASE_URL}/chat",
             json=chat_body,
-            headers={"Content-Type": "application/json"},
-            timeout=60
+            timeout=OLLAMA_TIMEOUT,
+            stream=stream
         )
+        if resp.status_code == 200 and stream:
+            return relay_stream(resp, lambda chunk: chunk.get("message", {}).get("content", ""), model)
         if resp.status_code == 200:
             reply = resp.json().get("message", {}).get("content", "")
             return jsonify({"response": reply, "model": model})
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark del cliente HTTP de la aplicación de chat
+Lanza peticiones concurrentes a /tags de Ollama con llamadas sueltas a requests.get
+(una conexión TCP nueva por petición) y con la sesión compartida de app.py
+(conexiones keep-alive reutilizadas) y compara sus latencias
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from app import OLLAMA_BASE_URL, OLLAMA_TIMEOUT, create_ollama_session
+
+
+def measure(get, workers, requests_per_worker):
+    """Latencias en milisegundos de `workers` hilos que hacen `requests_per_worker` peticiones cada uno"""
+    def run_worker(_):
+        latencies = []
+        for _ in range(requests_per_worker):
+            start = time.perf_counter()
+            resp = get(f"{OLLAMA_BASE_URL}/tags", timeout=OLLAMA_TIMEOUT)
+            resp.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [latency for latencies in executor.map(run_worker, range(workers)) for latency in latencies]
+
+
+def print_row(name, latencies, elapsed):
+    """Imprime una fila de la tabla de resultados"""
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<22} {statistics.mean(latencies):>10.2f} {p95:>10.2f} {len(latencies) / elapsed:>12.0f}")
+
+
+def main():
+    """Función principal del benchmark"""
+    parser = argparse.ArgumentParser(
+        description='Compara requests.get sin sesión contra el cliente compartido con pool de conexiones'
+    )
+    parser.add_argument('-w', '--workers', type=int, default=8,
+                        help='Hilos que hacen peticiones a la vez (por defecto: 8)')
+    parser.add_argument('-n', '--requests', type=int, default=200,
+                        help='Peticiones por hilo (por defecto: 200)')
+    args = parser.parse_args()
+
+    try:
+        requests.get(f"{OLLAMA_BASE_URL}/tags", timeout=OLLAMA_TIMEOUT).raise_for_status()
+    except requests.exceptions.RequestException as err:
+        print(f"Error: no se pudo conectar a Ollama en {OLLAMA_BASE_URL}: {err}")
+        sys.exit(1)
+
+    print(f"{args.workers} hilos x {args.requests} peticiones a {OLLAMA_BASE_URL}/tags\n")
+    print(f"{'Cliente':<22} {'Media (ms)':>10} {'p95 (ms)':>10} {'Peticiones/s':>12}")
+
+    start = time.perf_counter()
+    latencies = measure(requests.get, args.workers, args.requests)
+    print_row("requests.get", latencies, time.perf_counter() - start)
+
+    session = create_ollama_session(pool_size=args.workers)
+    start = time.perf_counter()
+    latencies = measure(session.get, args.workers, args.requests)
+    print_row("sesión con pool", latencies, time.perf_counter() - start)
+    session.close()
+
+
+if __name__ == "__main__":
+    main()